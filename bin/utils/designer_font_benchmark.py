@@ -0,0 +1,84 @@
+# This file is part of Indico.
+# Copyright (C) 2002 - 2025 CERN
+#
+# Indico is free software; you can redistribute it and/or
+# modify it under the terms of the MIT License; see the
+# LICENSE file for more details.
+
+"""Benchmark fitting the text of badges into the designer items.
+
+This compares calculating the font size from a single width measurement
+with the previous implementation which measured the text again after
+reducing the font size by each 0.25pt step.
+"""
+
+import random
+
+import click
+from reportlab.lib.units import cm
+from reportlab.pdfbase.pdfmetrics import stringWidth
+
+from indico.core.db.sqlalchemy.util.management import DEFAULT_BADGE_DATA
+from indico.legacy.pdfinterface.base import setTTFonts
+from indico.modules.designer.pdf import FONT_STYLES, PIXELS_CM, _extract_font_size, fit_font_size
+from indico.util.benchmark import Benchmark
+
+
+WORDS = ('European', 'Organization', 'for', 'Nuclear', 'Research', 'Université', 'de', 'Genève', 'Institute',
+         'of', 'High', 'Energy', 'Physics', 'Max-Planck-Institut', 'für', 'Kernphysik', 'Laboratory', 'National')
+
+
+def _legacy_fit_font_size(content, font_size, font_name, width):
+    while font_size > 6 and width < stringWidth(content, font_name, font_size):
+        font_size -= 0.25
+    return font_size
+
+
+def _make_text(rnd, min_words, max_words):
+    return ' '.join(rnd.choices(WORDS, k=rnd.randint(min_words, max_words)))
+
+
+def _make_badges(rnd, count):
+    # the event data is the same on all badges and many participants share the same
+    # affiliation, position or country, but most names are different
+    pools = {
+        'event_title': [_make_text(rnd, 4, 10)],
+        'event_dates': ['10-14 March 2025'],
+        'affiliation': [_make_text(rnd, 2, 12) for __ in range(count // 20 or 1)],
+        'position': [_make_text(rnd, 1, 4) for __ in range(20)],
+        'country': [_make_text(rnd, 1, 3) for __ in range(50)],
+    }
+    items = [(item['type'], _extract_font_size(item['font_size']), FONT_STYLES[item['font_family']][int(item['bold'])],
+              item['width'] / PIXELS_CM * cm)
+             for item in DEFAULT_BADGE_DATA['items']]
+    return [[(rnd.choice(pools[type_]) if type_ in pools else _make_text(rnd, 2, 5), *item)
+             for type_, *item in items]
+            for __ in range(count)]
+
+
+def _run(label, fn, badges):
+    with Benchmark() as bench:
+        result = [[fn(*item) for item in badge] for badge in badges]
+    per_badge = float(bench) / len(badges) * 1e6
+    click.echo(f'{label:<12} {bench}s ({per_badge:.1f}us per badge)')
+    return result, float(bench)
+
+
+@click.command()
+@click.option('--badges', default=5000, show_default=True, help='Number of badges')
+@click.option('--seed', default=0, show_default=True, help='Seed for the random data')
+def main(badges, seed):
+    setTTFonts()
+    data = _make_badges(random.Random(seed), badges)
+    click.echo(f'{badges} badges with {len(data[0])} text items each')
+    legacy, legacy_time = _run('legacy', _legacy_fit_font_size, data)
+    new, new_time = _run('analytic', fit_font_size.__wrapped__, data)
+    assert legacy == new
+    cached, cached_time = _run('cached', fit_font_size, data)
+    assert legacy == cached
+    click.secho(f'{legacy_time / max(new_time, 1e-9):.1f}x faster ({legacy_time / max(cached_time, 1e-9):.1f}x '
+                f'with cache)', fg='green', bold=True)
+
+
+if __name__ == '__main__':
+    main()
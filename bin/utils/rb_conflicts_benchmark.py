@@ -0,0 +1,135 @@
+# This file is part of Indico.
+# Copyright (C) 2002 - 2025 CERN
+#
+# Indico is free software; you can redistribute it and/or
+# modify it under the terms of the MIT License; see the
+# LICENSE file for more details.
+
+"""Benchmark the room booking conflict checks on synthetic data.
+
+This compares the interval-indexed conflict checks with the previous
+implementation which compared every candidate with every occurrence.
+"""
+
+import random
+from dataclasses import dataclass, field
+from datetime import datetime, timedelta
+from itertools import combinations
+
+import click
+
+from indico.modules.rb.operations.bookings import get_room_candidates
+from indico.modules.rb.operations.conflicts import get_concurrent_pre_bookings, get_room_bookings_conflicts
+from indico.modules.rb.util import TempReservationConcurrentOccurrence, TempReservationOccurrence
+from indico.util.benchmark import Benchmark
+from indico.util.date_time import get_overlap, overlaps
+
+
+@dataclass(frozen=True)
+class _Reservation:
+    id: int
+    is_accepted: bool
+    room_id: int = 1
+
+
+@dataclass(frozen=True)
+class _Occurrence:
+    # mimics the parts of `ReservationOccurrence` used by the conflict checks
+    start_dt: datetime
+    end_dt: datetime
+    reservation: _Reservation | None = field(default=None, compare=False)
+
+    def overlaps(self, occurrence):
+        return overlaps((self.start_dt, self.end_dt), (occurrence.start_dt, occurrence.end_dt))
+
+    def get_overlap(self, occurrence):
+        return get_overlap((self.start_dt, self.end_dt), (occurrence.start_dt, occurrence.end_dt))
+
+
+def _legacy_bookings_conflicts(candidates, occurrences):
+    conflicts = set()
+    pre_conflicts = set()
+    conflicting_candidates = set()
+    for candidate in candidates:
+        for occurrence in occurrences:
+            if candidate.overlaps(occurrence):
+                overlap = candidate.get_overlap(occurrence)
+                obj = TempReservationOccurrence(*overlap, reservation=occurrence.reservation)
+                if occurrence.reservation.is_accepted:
+                    conflicting_candidates.add(candidate)
+                    conflicts.add(obj)
+                else:
+                    pre_conflicts.add(obj)
+    return conflicts, pre_conflicts, conflicting_candidates
+
+
+def _legacy_room_candidates(candidates, conflicts):
+    return [candidate for candidate in candidates
+            if not (any(candidate.overlaps(conflict) for conflict in conflicts))]
+
+
+def _legacy_concurrent_pre_bookings(pre_bookings):
+    concurrent_pre_bookings = []
+    for (x, y) in combinations(pre_bookings, 2):
+        if x.overlaps(y):
+            overlap = x.get_overlap(y)
+            obj = TempReservationConcurrentOccurrence(*overlap, reservations=[x.reservation, y.reservation])
+            concurrent_pre_bookings.append(obj)
+    return concurrent_pre_bookings
+
+
+def _make_data(rnd, days, bookings_per_day):
+    start = datetime(2025, 1, 6, 10, 0)
+    # a daily booking over the given number of days
+    candidates = [_Occurrence(start + timedelta(days=i), start + timedelta(days=i, hours=2)) for i in range(days)]
+    occurrences = []
+    for day in range(days):
+        for __ in range(bookings_per_day):
+            occ_start = start.replace(hour=0) + timedelta(days=day, minutes=rnd.randrange(0, 22 * 60, 15))
+            occ_end = occ_start + timedelta(minutes=rnd.choice((30, 60, 90, 120, 240)))
+            reservation = _Reservation(len(occurrences), is_accepted=rnd.random() < 0.8)
+            occurrences.append(_Occurrence(occ_start, occ_end, reservation))
+    return candidates, occurrences
+
+
+def _run(label, legacy, new):
+    with Benchmark() as legacy_bench:
+        legacy_result = legacy()
+    with Benchmark() as new_bench:
+        new_result = new()
+    click.echo(f'{label:<24} legacy: {legacy_bench}s  indexed: {new_bench}s  ', nl=False)
+    speedup = float(legacy_bench) / max(float(new_bench), 1e-9)
+    click.secho(f'({speedup:.1f}x)', fg='green' if speedup >= 1 else 'red', bold=True)
+    return legacy_result, new_result
+
+
+@click.command()
+@click.option('--rooms', default=200, show_default=True, help='Number of rooms')
+@click.option('--days', default=365, show_default=True, help='Number of days of the (daily) booking')
+@click.option('--bookings-per-day', default=4, show_default=True, help='Number of existing bookings per room and day')
+@click.option('--seed', default=0, show_default=True, help='Seed for the random data')
+def main(rooms, days, bookings_per_day, seed):
+    rnd = random.Random(seed)
+    data = [_make_data(rnd, days, bookings_per_day) for __ in range(rooms)]
+    click.echo(f'{rooms} rooms, {days} candidates and {days * bookings_per_day} existing occurrences per room')
+
+    legacy, new = _run('booking conflicts',
+                       lambda: [_legacy_bookings_conflicts(cands, occs) for cands, occs in data],
+                       lambda: [get_room_bookings_conflicts(cands, occs) for cands, occs in data])
+    assert legacy == new
+
+    conflicts = [(cands, room_conflicts) for (cands, __), (room_conflicts, __, __) in zip(data, new, strict=True)]
+    legacy, new = _run('room candidates',
+                       lambda: [_legacy_room_candidates(cands, confs) for cands, confs in conflicts],
+                       lambda: [get_room_candidates(cands, confs) for cands, confs in conflicts])
+    assert legacy == new
+
+    pre_bookings = [[occ for occ in occs if not occ.reservation.is_accepted] for __, occs in data]
+    legacy, new = _run('concurrent pre-bookings',
+                       lambda: [_legacy_concurrent_pre_bookings(pbs) for pbs in pre_bookings],
+                       lambda: [get_concurrent_pre_bookings(pbs) for pbs in pre_bookings])
+    assert legacy == new
+
+
+if __name__ == '__main__':
+    main()
@@ -12,7 +12,7 @@ from dateutil.relativedelta import relativedelta
 
 from indico.modules.rb.models.locations import Location
 from indico.modules.rb.models.rooms import Room
-from indico.modules.rb.statistics import calculate_rooms_occupancy
+from indico.modules.rb.statistics import calculate_each_room_occupancy
 from indico.util.string import natural_sort_key
 from indico.web.flask.app import make_app
 
@@ -27,10 +27,13 @@ def _main(location):
         query = query.join(Location).filter(Location.name.in_(location))
     rooms = sorted(query, key=lambda r: natural_sort_key(r.location_name + r.full_name))
 
+    month_occupancy = calculate_each_room_occupancy(rooms, past_month, yesterday)
+    year_occupancy = calculate_each_room_occupancy(rooms, past_year, yesterday)
+
     print('Month\tYear\tPublic?\tRoom')
     for room in rooms:
-        print('{:.2f}%\t{:.2f}%\t{}\t{}'.format(calculate_rooms_occupancy([room], past_month, yesterday) * 100,
-                                                calculate_rooms_occupancy([room], past_year, yesterday) * 100,
+        print('{:.2f}%\t{:.2f}%\t{}\t{}'.format(month_occupancy[room.id] * 100,
+                                                year_occupancy[room.id] * 100,
                                                 'Y' if room.is_public else 'N',
                                                 room.full_name))
 
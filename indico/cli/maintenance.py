@@ -6,6 +6,7 @@
 # LICENSE file for more details.
 
 import click
+from sqlalchemy.schema import CreateIndex
 
 from indico.cli.core import cli_group
 from indico.core.db import db
@@ -13,10 +14,16 @@ from indico.core.db.sqlalchemy.principals import PrincipalType
 from indico.core.db.sqlalchemy.util.models import get_simple_column_attrs
 from indico.modules.attachments import Attachment, AttachmentFolder
 from indico.modules.attachments.models.principals import AttachmentFolderPrincipal, AttachmentPrincipal
+from indico.modules.categories import Category
+from indico.modules.categories.models.effective_readers import CategoryEffectiveReader
+from indico.modules.categories.models.statistics import CategoryStatistics
+from indico.modules.events import Event
 from indico.modules.events.contributions import Contribution
 from indico.modules.events.contributions.models.principals import ContributionPrincipal
+from indico.modules.events.contributions.models.subcontributions import SubContribution
 from indico.modules.events.models.principals import EventPrincipal
 from indico.modules.events.models.roles import EventRole
+from indico.modules.events.notes.models.notes import EventNote
 from indico.modules.events.sessions import Session
 from indico.modules.events.sessions.models.principals import SessionPrincipal
 
@@ -101,3 +108,53 @@ def fix_event_role_acls():
                   default=True, abort=True)
     db.session.commit()
     click.secho('Success!', fg='green')
+
+
+@cli.command()
+def rebuild_category_effective_readers():
+    """Rebuild the category access index used by the search."""
+    CategoryEffectiveReader.refresh()
+    db.session.commit()
+    click.secho('Success!', fg='green')
+
+
+@cli.command()
+@click.option('--rebuild', is_flag=True, help='Rebuild existing indexes (e.g. if they are bloated)')
+def build_search_indexes(rebuild):
+    """Create or rebuild the fulltext indexes used by the search.
+
+    The indexes are built concurrently one after another, so this does
+    not lock the tables while it runs.
+    """
+    indexes = [index
+               for model in (Category, Event, Contribution, SubContribution, Attachment, EventNote)
+               for index in model.__table__.indexes
+               if index.name.endswith('_fts')]
+    # building indexes concurrently is not possible inside a transaction
+    with db.engine.connect().execution_options(isolation_level='AUTOCOMMIT') as conn:
+        for index in indexes:
+            table = index.table
+            name = f'{table.schema}.{index.name}'
+            valid = conn.execute(db.text('SELECT indisvalid FROM pg_index WHERE indexrelid = to_regclass(:name)'),
+                                 {'name': name}).scalar()
+            if valid is None:
+                click.echo(f'Creating {name}')
+                ddl = str(CreateIndex(index).compile(dialect=conn.dialect))
+                conn.execute(ddl.replace('CREATE INDEX', 'CREATE INDEX CONCURRENTLY', 1))
+            elif rebuild or not valid:
+                # an index may be invalid if building it concurrently failed
+                click.echo(f'Rebuilding {name}')
+                conn.execute(f'REINDEX INDEX CONCURRENTLY {name}')
+            else:
+                click.echo(f'Skipping {name} (already exists)')
+                continue
+            conn.execute(f'ANALYZE {table.schema}.{table.name}')
+    click.secho('Success!', fg='green')
+
+
+@cli.command()
+def rebuild_category_statistics():
+    """Rebuild the event, contribution and attachment counts of all categories."""
+    CategoryStatistics.refresh()
+    db.session.commit()
+    click.secho('Success!', fg='green')
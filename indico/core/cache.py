@@ -5,6 +5,12 @@
 # modify it under the terms of the MIT License; see the
 # LICENSE file for more details.
 
+import json
+import os
+import threading
+import time
+import uuid
+from collections import OrderedDict, defaultdict
 from datetime import timedelta
 
 from cachelib.serializers import RedisSerializer
@@ -42,30 +48,232 @@ class NoneWrappingRedisSerializer(RedisSerializer):
         return super().dumps(CachedNone.wrap(value), *args, **kwargs)
 
 
+class LocalCache:
+    """A size- and TTL-bounded in-process LRU cache.
+
+    Values are stored in their serialized form so each caller gets its
+    own copy of the cached object, just like when reading from Redis.
+
+    Hits and misses are counted per cache scope (the part of the key
+    before the first slash, see :class:`ScopedCache`).
+    """
+
+    def __init__(self, maxsize, ttl):
+        self.maxsize = maxsize
+        self.ttl = ttl
+        self.generation = 0
+        self._data = OrderedDict()
+        self._lock = threading.Lock()
+        self._stats = defaultdict(lambda: {'hits': 0, 'misses': 0})
+
+    @staticmethod
+    def _get_scope(key):
+        return key.partition('/')[0] if '/' in key else ''
+
+    def get_many(self, keys):
+        """Get the serialized values for all cached keys.
+
+        :return: a dict containing only the keys found in the cache
+        """
+        now = time.monotonic()
+        found = {}
+        with self._lock:
+            for key in keys:
+                entry = self._data.get(key)
+                if entry is not None and entry[0] <= now:
+                    del self._data[key]
+                    entry = None
+                if entry is None:
+                    self._stats[self._get_scope(key)]['misses'] += 1
+                    continue
+                self._data.move_to_end(key)
+                self._stats[self._get_scope(key)]['hits'] += 1
+                found[key] = entry[1]
+        return found
+
+    def set(self, key, value, generation, timeout=None):
+        """Store a serialized value in the cache.
+
+        :param generation: The value of :attr:`generation` from before the
+                           value was retrieved from Redis.  If anything has
+                           been invalidated in the meantime, the value is
+                           not cached since it may already be outdated.
+        :param timeout: The Redis timeout of the value; if it is shorter
+                        than the TTL of this cache, it is used instead.
+        """
+        ttl = self.ttl if not timeout or timeout < 0 else min(self.ttl, timeout)
+        with self._lock:
+            if generation != self.generation:
+                return
+            self._data[key] = (time.monotonic() + ttl, value)
+            self._data.move_to_end(key)
+            while len(self._data) > self.maxsize:
+                self._data.popitem(last=False)
+
+    def delete(self, keys):
+        with self._lock:
+            self.generation += 1
+            for key in keys:
+                self._data.pop(key, None)
+
+    def clear(self):
+        with self._lock:
+            self.generation += 1
+            self._data.clear()
+
+    def get_stats(self):
+        with self._lock:
+            return {scope: dict(stats) for scope, stats in self._stats.items()}
+
+    def __len__(self):
+        return len(self._data)
+
+
 class IndicoRedisCache(RedisCache):
     """
     This is similar to the original RedisCache from Flask-Caching, but it
     allows specifying a default value when retrieving cache data and
     distinguishing between a cached ``None`` value and a cache miss.
+
+    Optionally, an in-process :class:`LocalCache` is used in front of Redis.
+    Whenever a key is modified, all processes are notified using Redis
+    pub/sub so they can evict their local copies.  As long as the process
+    is not subscribed to these notifications, the local cache is bypassed.
     """
 
     serializer = NoneWrappingRedisSerializer()
 
+    def __init__(self, *args, local_size=0, local_ttl=10, **kwargs):
+        super().__init__(*args, **kwargs)
+        self.local_cache = LocalCache(local_size, local_ttl) if local_size else None
+        self._invalidation_channel = f'{self.key_prefix}local-cache-invalidation'
+        self._listener_lock = threading.Lock()
+        self._listener = None
+        self._listener_pid = None
+        self._origin = None
+
+    def _ensure_listener(self):
+        """Make sure this process is subscribed to invalidation messages.
+
+        :return: whether the local cache may be used
+        """
+        if self._listener_pid == os.getpid() and self._listener.is_alive():
+            return True
+        with self._listener_lock:
+            if self._listener_pid == os.getpid() and self._listener.is_alive():
+                return True
+            # we may have been forked or lost the connection, so anything
+            # in the local cache may have been invalidated in the meantime
+            self.local_cache.clear()
+            self._listener_pid = None
+            try:
+                pubsub = self._write_client.pubsub(ignore_subscribe_messages=True)
+                pubsub.subscribe(**{self._invalidation_channel: self._handle_invalidation})
+            except RedisError:
+                _logger.exception('Could not subscribe to local cache invalidations')
+                return False
+            self._origin = uuid.uuid4().hex
+            self._listener = pubsub.run_in_thread(sleep_time=1, daemon=True,
+                                                  exception_handler=self._handle_listener_error)
+            self._listener_pid = os.getpid()
+            return True
+
+    def _handle_listener_error(self, exc, pubsub, thread):
+        _logger.warning('Local cache invalidation listener failed: %s', exc)
+        thread.stop()
+        pubsub.close()
+        self.local_cache.clear()
+
+    def _handle_invalidation(self, message):
+        origin, keys = json.loads(message['data'])
+        if origin == self._origin:
+            return
+        if keys is None:
+            self.local_cache.clear()
+        else:
+            self.local_cache.delete(keys)
+
+    def _invalidate_local(self, keys):
+        if self.local_cache is None:
+            return
+        if keys is None:
+            self.local_cache.clear()
+        else:
+            self.local_cache.delete(keys)
+        self._write_client.publish(self._invalidation_channel, json.dumps([self._origin, keys]))
+
     def get(self, key, default=None):
-        return CachedNone.unwrap(super().get(key), default)
+        if self.local_cache is None:
+            return CachedNone.unwrap(super().get(key), default)
+        return self.get_many(key, default=default)[0]
 
     def get_many(self, *keys, default=None):
-        return [CachedNone.unwrap(val, default) for val in super().get_many(*keys)]
+        if self.local_cache is None or not self._ensure_listener():
+            return [CachedNone.unwrap(val, default) for val in super().get_many(*keys)]
+        dumps = self.local_cache.get_many(keys)
+        if missing := [key for key in keys if key not in dumps]:
+            generation = self.local_cache.generation
+            fetched = self._read_client.mget([self.key_prefix + key for key in missing])
+            for key, dump in zip(missing, fetched, strict=True):
+                if dump is not None:
+                    self.local_cache.set(key, dump, generation)
+                dumps[key] = dump
+        return [CachedNone.unwrap(self.serializer.loads(dumps[key]), default) for key in keys]
 
     def get_dict(self, *keys, default=None):
         return dict(zip(keys, self.get_many(*keys, default=default), strict=True))
 
+    def set(self, key, value, timeout=None):
+        rv = super().set(key, value, timeout=timeout)
+        self._invalidate_local([key])
+        return rv
+
+    def add(self, key, value, timeout=None):
+        if created := super().add(key, value, timeout=timeout):
+            self._invalidate_local([key])
+        return created
+
+    def set_many(self, mapping, timeout=None):
+        rv = super().set_many(mapping, timeout=timeout)
+        self._invalidate_local(list(mapping))
+        return rv
+
+    def delete(self, key):
+        rv = super().delete(key)
+        self._invalidate_local([key])
+        return rv
+
+    def delete_many(self, *keys):
+        rv = super().delete_many(*keys)
+        self._invalidate_local(list(keys))
+        return rv
+
+    def clear(self):
+        rv = super().clear()
+        self._invalidate_local(None)
+        return rv
+
+    def inc(self, key, delta=1):
+        rv = super().inc(key, delta)
+        self._invalidate_local([key])
+        return rv
+
+    def dec(self, key, delta=1):
+        rv = super().dec(key, delta)
+        self._invalidate_local([key])
+        return rv
+
+    def get_local_stats(self):
+        return self.local_cache.get_stats() if self.local_cache is not None else {}
+
     @classmethod
     def factory(cls, app, config, args, kwargs):
         key_prefix = config.get('CACHE_KEY_PREFIX')
         if key_prefix:
             kwargs['key_prefix'] = key_prefix
         kwargs['host'] = redis_from_url(config['CACHE_REDIS_URL'], socket_timeout=1)
+        kwargs['local_size'] = config.get('CACHE_LOCAL_SIZE', 0)
+        kwargs['local_ttl'] = config.get('CACHE_LOCAL_TTL', 10)
         return IndicoRedisCache(*args, **kwargs)
 
 
@@ -88,7 +296,7 @@ class ScopedCache:
     def add(self, key, value, timeout=None):
         if isinstance(timeout, timedelta):
             timeout = int(timeout.total_seconds())
-        self.cache.add(self._scoped(key), value, timeout=timeout)
+        return self.cache.add(self._scoped(key), value, timeout=timeout)
 
     def delete(self, key):
         self.cache.delete(self._scoped(key))
@@ -113,6 +321,10 @@ class ScopedCache:
         mapping = {self._scoped(key): value for key, value in mapping.items()}
         self.cache.set_many(mapping, timeout=timeout)
 
+    def get_local_stats(self):
+        """Get the hit/miss counters of the in-process cache for this scope."""
+        return self.cache.get_local_stats().get(self.scope, {'hits': 0, 'misses': 0})
+
     def __repr__(self):
         return f'<ScopedCache: {self.scope}>'
 
@@ -152,11 +364,12 @@ class IndicoCache(Cache):
         if isinstance(timeout, timedelta):
             timeout = int(timeout.total_seconds())
         try:
-            super().add(key, value, timeout=timeout)
+            return super().add(key, value, timeout=timeout)
         except RedisError:
             if config.DEBUG:
                 raise
             _logger.exception('add(%r) failed', key)
+            return False
 
     def delete(self, key):
         try:
@@ -212,6 +425,16 @@ class IndicoCache(Cache):
             _logger.exception('get_dict(%s) failed', logkeys)
             return dict.fromkeys(keys, default)
 
+    def get_local_stats(self):
+        """Get the per-scope hit/miss counters of the in-process cache.
+
+        The counters are specific to the current process and only
+        available if the in-process cache is enabled using the
+        :data:`LOCAL_CACHE_SIZE` setting.
+        """
+        get_local_stats = getattr(self.cache, 'get_local_stats', None)
+        return get_local_stats() if get_local_stats is not None else {}
+
 
 def make_scoped_cache(scope):
     """Create a new scoped cache.
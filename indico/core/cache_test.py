@@ -5,11 +5,13 @@
 # modify it under the terms of the MIT License; see the
 # LICENSE file for more details.
 
+import time
 from datetime import timedelta
 
 import pytest
+from redis import from_url as redis_from_url
 
-from indico.core.cache import cache, make_scoped_cache
+from indico.core.cache import IndicoRedisCache, LocalCache, cache, make_scoped_cache
 
 
 def test_cache_none_default():
@@ -69,3 +71,75 @@ def test_expiry(scoped, timeout):
     cache_obj.add('b', 2, timeout=timeout)
     cache_obj.set_many({'c': 3}, timeout=timeout)
     assert cache_obj.get_many('a', 'b', 'c') == [1, 2, 3]
+
+
+def test_local_cache_lru():
+    local = LocalCache(2, 60)
+    local.set('a/1', b'1', local.generation)
+    local.set('a/2', b'2', local.generation)
+    assert local.get_many(['a/1']) == {'a/1': b'1'}
+    local.set('b/3', b'3', local.generation)
+    # a/2 was the least recently used entry
+    assert local.get_many(['a/1', 'a/2', 'b/3']) == {'a/1': b'1', 'b/3': b'3'}
+    assert local.get_stats() == {'a': {'hits': 2, 'misses': 1}, 'b': {'hits': 1, 'misses': 0}}
+
+
+def test_local_cache_expiry(mocker):
+    monotonic = mocker.patch('indico.core.cache.time.monotonic', return_value=100)
+    local = LocalCache(10, 60)
+    local.set('a', b'1', local.generation)
+    local.set('b', b'2', local.generation, timeout=5)
+    assert local.get_many(['a', 'b']) == {'a': b'1', 'b': b'2'}
+    monotonic.return_value = 110
+    assert local.get_many(['a', 'b']) == {'a': b'1'}
+    monotonic.return_value = 160
+    assert local.get_many(['a', 'b']) == {}
+    assert len(local) == 0
+
+
+def test_local_cache_invalidation_race():
+    local = LocalCache(10, 60)
+    generation = local.generation
+    # something got invalidated while we were fetching the value from redis
+    local.delete(['b'])
+    local.set('a', b'1', generation)
+    assert local.get_many(['a']) == {}
+    local.set('a', b'1', local.generation)
+    assert local.get_many(['a']) == {'a': b'1'}
+    local.clear()
+    assert local.get_many(['a']) == {}
+
+
+def test_two_tier_cache(app):
+    def _make_cache():
+        client = redis_from_url(app.config['CACHE_REDIS_URL'])
+        return IndicoRedisCache(host=client, key_prefix='twotier_', local_size=100, local_ttl=60)
+
+    def _wait_for(predicate):
+        for __ in range(50):
+            if predicate():
+                return True
+            time.sleep(0.02)
+        return False
+
+    worker1 = _make_cache()
+    worker2 = _make_cache()
+    worker1.set('test/foo', 'bar')
+    worker1.set('test/none', None)
+    assert worker1.get('test/foo') == 'bar'
+    assert worker2.get('test/foo') == 'bar'
+    assert worker2.get('test/none', 'default') is None
+    assert worker2.get('test/missing', 'default') == 'default'
+    assert worker2.get_many('test/foo', 'test/none') == ['bar', None]
+    assert worker2.get_local_stats() == {'test': {'hits': 2, 'misses': 3}}
+    # mutating the returned value must not affect the locally cached one
+    worker1.set('test/list', [1])
+    worker2.get('test/list').append(2)
+    assert worker2.get('test/list') == [1]
+
+    worker1.set('test/foo', 'changed')
+    assert _wait_for(lambda: worker2.get('test/foo') == 'changed')
+    worker1.delete('test/foo')
+    assert _wait_for(lambda: worker2.get('test/foo', 'gone') == 'gone')
+    worker1.clear()
+    assert _wait_for(lambda: worker2.get('test/list') is None)
@@ -62,8 +62,13 @@ DEFAULTS = {
     'HELP_URL': 'https://learn.getindico.io',
     'FAILED_LOGIN_RATE_LIMIT': '5 per 15 minutes; 10 per day',
     'FAVICON_URL': None,
+    'HTTP_API_RESPONSE_CACHE': False,
     'IDENTITY_PROVIDERS': {},
+    'INTERNAL_SEARCH_RANKING': False,
+    'LATEX_MAX_CONCURRENT_JOBS': 2,
     'LATEX_RATE_LIMIT': '2 per 3 seconds',
+    'LOCAL_CACHE_SIZE': 0,
+    'LOCAL_CACHE_TTL': 10,
     'LOCAL_IDENTITIES': True,
     'LOCAL_USERNAMES': True,
     'LOCAL_MODERATION': False,
@@ -7,8 +7,8 @@
 
 import itertools
 
-from flask import has_request_context, session
-from sqlalchemy import inspect
+from flask import current_app, g, has_request_context, session
+from sqlalchemy import inspect, orm
 from sqlalchemy.event import listens_for
 from sqlalchemy.ext.declarative import declared_attr
 from sqlalchemy.ext.hybrid import hybrid_property
@@ -27,6 +27,46 @@ from indico.util.user import iter_acl
 from indico.web.util import jsonify_template
 
 
+def _get_access_cache():
+    """Get the request-scoped cache for access checks.
+
+    Returns ``None`` if there is no cache (outside a request or during
+    tests).
+    """
+    if not has_request_context() or current_app.config['TESTING'] or current_app.config.get('REPL'):
+        return None
+    try:
+        return g.access_cache
+    except AttributeError:
+        g.access_cache = cache = {}
+        return cache
+
+
+def clear_access_cache():
+    """Clear the request-scoped cache for access checks.
+
+    This needs to be called whenever something that affects access
+    checks is changed, unless it is done through the ACL-related
+    methods of the protection mixins (which trigger the `acl` signals)
+    or written to the database (which triggers a flush).
+    """
+    if has_request_context():
+        g.pop('access_cache', None)
+
+
+@signals.acl.entry_changed.connect
+@signals.acl.protection_changed.connect
+def _clear_access_cache_on_acl_change(sender, **kwargs):
+    clear_access_cache()
+
+
+@listens_for(orm.Session, 'after_flush')
+def _clear_access_cache_on_flush(sess, flush_context):
+    # any database change (e.g. a new registration or group membership)
+    # may affect access, so we do not trust cached decisions afterwards
+    clear_access_cache()
+
+
 class ProtectionMode(RichIntEnum):
     __titles__ = [_('Public'), _('Inheriting'), _('Protected')]
     public = 0
@@ -181,7 +221,6 @@ class ProtectionMixin:
     def is_user_admin(user):
         return user.is_admin
 
-    @memoize_request
     def can_access(self, user, allow_admin=True):
         """Check if the user can access the object.
 
@@ -192,6 +231,30 @@ class ProtectionMixin:
         if self.disable_protection_mode:
             raise NotImplementedError
 
+        # the result is cached during the request since checking an object
+        # usually involves checking its whole parent chain, e.g. the same
+        # categories for every contribution in a timetable
+        cache = _get_access_cache()
+        cache_key = None
+        if cache is not None and (user is None or user.id is not None):
+            identity_key = inspect(self).identity_key
+            if identity_key is not None:
+                cache_key = (identity_key, user.id if user else None, allow_admin)
+        if cache_key is not None:
+            try:
+                rv = cache[cache_key]
+            except KeyError:
+                pass
+            else:
+                if g.get('request_stats_initialized'):
+                    g.access_cache_hits += 1
+                return rv
+        rv = self._can_access(user, allow_admin=allow_admin)
+        if cache_key is not None:
+            cache[cache_key] = rv
+        return rv
+
+    def _can_access(self, user, allow_admin):
         override = self._check_can_access_override(user, allow_admin=allow_admin)
         if override is not None:
             return override
@@ -292,6 +355,7 @@ class ProtectionMixin:
         assert self.allow_access_key
         session.setdefault('access_keys', {})[self._access_key_session_key] = access_key
         session.modified = True
+        clear_access_cache()
 
     @property
     def _access_key_session_key(self):
@@ -5,6 +5,8 @@
 # modify it under the terms of the MIT License; see the
 # LICENSE file for more details.
 
+from functools import reduce
+
 from sqlalchemy.ext.declarative import declared_attr
 
 from indico.core.db import db
@@ -38,6 +40,28 @@ def fts_matches(column, search_string, *, exact=False):
     return crit
 
 
+def fts_rank(columns, search_string):
+    """Get the relevance of fts-indexed columns for a search string.
+
+    To be used in a SQLAlchemy `order_by` call, usually together with
+    :func:`fts_matches` for the same columns.
+
+    :param columns: A column or a list of columns; if there are multiple
+                    columns, matches in earlier ones are weighted higher
+    :param search_string: A string to search for
+    """
+    if not isinstance(columns, (list, tuple)):
+        columns = [columns]
+    vectors = [db.func.to_tsvector('simple', column) for column in columns]
+    if len(vectors) > 1:
+        vectors = [db.func.setweight(vector, weight) for vector, weight in zip(vectors, 'ABCD', strict=False)]
+    vector = reduce(lambda a, b: a.op('||')(b), vectors)
+    query = db.func.to_tsquery('simple', preprocess_ts_string(search_string))
+    # normalize the rank by the document length so long notes/descriptions
+    # do not always end up on top just because they contain more words
+    return db.func.ts_rank(vector, query, 1, type_=db.REAL)
+
+
 class SearchableTitleMixin:
     """Mixin to add a fulltext-searchable title column."""
 
@@ -7,8 +7,10 @@
 
 import re
 
-from sqlalchemy import func, inspect, over
-from sqlalchemy.sql import update
+from sqlalchemy import and_, cast, func, inspect, literal, or_, over, tuple_
+from sqlalchemy.sql import operators, update
+from sqlalchemy.sql.elements import UnaryExpression
+from sqlalchemy.sql.sqltypes import Float
 
 
 TS_REGEX = re.compile(r'([@<>!()&|:\'\\])')
@@ -56,6 +58,19 @@ def escape_like(value):
             .replace('_', escape_char + '_'))     # same for _ wildcards
 
 
+def fnmatch_to_like(pattern):
+    """Convert a shell-style wildcard pattern to a LIKE pattern.
+
+    Only the ``*`` and ``?`` wildcards are supported.
+
+    :return: The LIKE pattern or ``None`` if the pattern contains
+             wildcards which cannot be expressed using LIKE.
+    """
+    if '[' in pattern:
+        return None
+    return escape_like(pattern).replace('*', '%').replace('?', '_')
+
+
 def preprocess_ts_string(text, prefix=True):
     atoms = [TS_REGEX.sub(r'\\\1', atom.strip()) for atom in text.split()]
     return ' & '.join(f'{atom}:*' if prefix else atom for atom in atoms)
@@ -137,7 +152,41 @@ def get_related_object(obj, relationship, criteria):
     return cls.query.with_parent(obj, relationship).filter_by(**criteria).first()
 
 
-def get_n_matching(query, n, predicate, *, prefetch_factor=5, preload_bulk=None, offset=0):
+def _get_keyset_columns(order_by):
+    """Get the columns and sort directions from ORDER BY expressions."""
+    columns = []
+    for expr in order_by:
+        if isinstance(expr, UnaryExpression) and expr.modifier in (operators.asc_op, operators.desc_op):
+            columns.append((expr.element, expr.modifier == operators.desc_op))
+        else:
+            columns.append((expr, False))
+    return columns
+
+
+def _get_keyset_value(column, value):
+    """Get a SQL value that compares exactly with the column it was loaded from."""
+    value = literal(value, column.type)
+    # a `real` loaded into a Python float is not equal to it unless cast back
+    return cast(value, column.type) if isinstance(column.type, Float) else value
+
+
+def _get_keyset_filter(columns, values):
+    """Get a filter for rows following the given keyset values."""
+    values = [_get_keyset_value(col, value) for (col, __), value in zip(columns, values, strict=True)]
+    if len({desc for __, desc in columns}) == 1:
+        # a row value comparison can use an index on the columns
+        lhs = tuple_(*(col for col, __ in columns))
+        rhs = tuple_(*values)
+        return (lhs < rhs) if columns[0][1] else (lhs > rhs)
+    criteria = []
+    for i, ((col, desc), value) in enumerate(zip(columns, values, strict=True)):
+        equal = [c == v for (c, __), v in zip(columns[:i], values[:i], strict=True)]
+        criteria.append(and_(*equal, (col < value) if desc else (col > value)))
+    return or_(*criteria)
+
+
+def get_n_matching(query, n, predicate, *, prefetch_factor=5, preload_bulk=None, offset=0, order_by=None,
+                   prefilter=None):
     """Get N objects from a query that satisfy a condition.
 
     This queries for ``n * 5`` objects initially and then loads
@@ -152,27 +201,57 @@ def get_n_matching(query, n, predicate, *, prefetch_factor=5, preload_bulk=None,
                          to allow for bulk-preloading of data needed in the
                          predicate function
     :param offset: The initial query offset
+    :param order_by: The expressions to order the query by.  If specified,
+                     the query is ordered by them and more objects are loaded
+                     by filtering on the values of the last object instead
+                     of using an increasing offset.  The expressions cannot
+                     be NULL and need to uniquely identify each object.
+    :param prefilter: A SQL criterion that is true for objects known to
+                      satisfy the predicate.  The predicate is only called
+                      (and `preload_bulk` only receives) the objects for
+                      which it is false.
     """
+    columns = []
+    if order_by is not None:
+        keyset_columns = _get_keyset_columns(order_by)
+        query = query.order_by(None).order_by(*order_by)
+        columns += [col for col, __ in keyset_columns]
+    if prefilter is not None:
+        columns.append(prefilter)
+    if columns:
+        query = query.add_columns(*columns)
+
     _offset = offset
+    last_values = None
 
     def _get():
         nonlocal _offset
         limit = n * prefetch_factor
-        rv = query.offset(_offset).limit(limit).all()
+        if last_values is None:
+            rv = query.offset(_offset).limit(limit).all()
+        else:
+            rv = query.filter(_get_keyset_filter(keyset_columns, last_values)).limit(limit).all()
         _offset += limit
         return rv
 
     results = []
     while len(results) < n:
-        objects = _get()
-        if not objects:
+        rows = _get()
+        if not rows:
             break
 
-        if preload_bulk:
-            preload_bulk(objects)
+        if not columns:
+            objects = [(obj, False) for obj in rows]
+        else:
+            objects = [(row[0], prefilter is not None and row[-1]) for row in rows]
+            if order_by is not None:
+                last_values = tuple(rows[-1][1:len(keyset_columns) + 1])
+
+        if preload_bulk and (residual := [obj for obj, matched in objects if not matched]):
+            preload_bulk(residual)
 
-        for obj in objects:
-            if not predicate(obj):
+        for obj, matched in objects:
+            if not matched and not predicate(obj):
                 continue
             results.append(obj)
             if len(results) == n:
@@ -0,0 +1,49 @@
+# This file is part of Indico.
+# Copyright (C) 2002 - 2025 CERN
+#
+# Indico is free software; you can redistribute it and/or
+# modify it under the terms of the MIT License; see the
+# LICENSE file for more details.
+
+import pytest
+
+from indico.core.db.sqlalchemy.util.queries import fnmatch_to_like, get_n_matching
+from indico.modules.categories import Category
+
+
+@pytest.mark.parametrize(('pattern', 'expected'), (
+    ('foo', 'foo'),
+    ('foo*', 'foo%'),
+    ('*foo?bar*', '%foo_bar%'),
+    ('100%_*', r'100\%\_%'),
+    (r'a\b', r'a\\b'),
+    ('[ab]*', None),
+))
+def test_fnmatch_to_like(pattern, expected):
+    assert fnmatch_to_like(pattern) == expected
+
+
+@pytest.mark.parametrize('order_by', (None, 'id', 'mixed'))
+@pytest.mark.parametrize('prefilter', (False, True))
+def test_get_n_matching(db, create_category, order_by, prefilter):
+    cats = [create_category(id_, title=f'cat {id_ % 3}') for id_ in range(1, 21)]
+    order_by = {None: None,
+                'id': (Category.id,),
+                'mixed': (Category.title.desc(), Category.id)}[order_by]
+    checked = []
+
+    def _predicate(cat):
+        checked.append(cat.id)
+        return cat.id % 2 == 0
+
+    query = Category.query.filter(Category.id.in_(cat.id for cat in cats))
+    if order_by is None:
+        query = query.order_by(Category.id)
+    res = get_n_matching(query, 6, _predicate, prefetch_factor=1, order_by=order_by,
+                         prefilter=(Category.id % 5 == 0) if prefilter else None)
+    expected = sorted(cats, key=lambda c: (c.title, -c.id) if order_by and len(order_by) == 2 else c.id,
+                      reverse=bool(order_by and len(order_by) == 2))
+    expected = [c for c in expected if c.id % 2 == 0 or (prefilter and c.id % 5 == 0)][:6]
+    assert res == expected
+    if prefilter:
+        assert not any(cat_id % 5 == 0 for cat_id in checked)
@@ -8,6 +8,7 @@
 import os
 import pickle
 import tempfile
+import time
 from datetime import date
 from email.utils import formataddr, make_msgid, parseaddr
 from fnmatch import fnmatch
@@ -32,6 +33,8 @@ from indico.vendor.django_mail.message import EmailMultiAlternatives
 logger = Logger.get('emails')
 MAX_TRIES = 10
 DELAYS = [30, 60, 120, 300, 600, 1800, 3600, 3600, 7200]
+#: The maximum number of emails sent by a single `send_emails` task
+BATCH_SIZE = 100
 
 
 @celery.task(name='send_email', bind=True, max_retries=None)
@@ -67,6 +70,38 @@ def send_email_task(task, email, log_entry=None):
             db.session.commit()
 
 
+@celery.task(name='send_emails')
+def send_emails_task(emails):
+    """Send a batch of emails using a single SMTP connection.
+
+    Emails which could not be sent are retried individually using the
+    `send_email` task, i.e. with the same delays, and they are stored
+    on disk if they still cannot be sent after the last attempt.
+
+    :param emails: A list of ``(email, log_entry_id)`` tuples
+    """
+    from indico.modules.logs import EventLogEntry
+    start = time.perf_counter()
+    log_entry_ids = {log_entry_id for __, log_entry_id in emails if log_entry_id is not None}
+    log_entries = ({e.id: e for e in EventLogEntry.query.filter(EventLogEntry.id.in_(log_entry_ids))}
+                   if log_entry_ids else {})
+    emails = [(email, log_entries.get(log_entry_id)) for email, log_entry_id in emails]
+    failed = do_send_emails(emails)
+    delay = DELAYS[0] if not config.DEBUG else 1
+    for email, log_entry, exc in failed:
+        logger.warning('Could not send email "%s" (attempt 1/%d); retry in %ds [%s]',
+                       truncate(email['subject'], 100), MAX_TRIES, delay, exc)
+        # the failed attempt counts as the first one of the individual task
+        send_email_task.apply_async((email, log_entry), countdown=delay, retries=1)
+    # commit the log entry state changes
+    db.session.commit()
+    duration = time.perf_counter() - start
+    sent = len(emails) - len(failed)
+    logger.info('Sent %d/%d emails in %.2fs (%.1f emails/s)', sent, len(emails), duration,
+                (sent / duration) if duration else 0)
+    return {'sent': sent, 'failed': len(failed), 'duration': duration}
+
+
 def get_actual_sender_address(sender_address: str, reply_address: set[str]) -> tuple[str, set]:
     site_title = core_settings.get('site_title')
     if not sender_address:
@@ -90,7 +125,7 @@ def get_actual_sender_address(sender_address: str, reply_address: set[str]) -> t
     return from_address, reply_address
 
 
-def do_send_email(email, log_entry=None, _from_task=False):
+def do_send_email(email, log_entry=None, _from_task=False, *, connection=None):
     """Send an email.
 
     This function should not be called directly unless your
@@ -106,24 +141,68 @@ def do_send_email(email, log_entry=None, _from_task=False):
                       to indicate that the email has been sent.
     :param _from_task: Indicates that this function is called from
                        the celery task responsible for sending emails.
+    :param connection: An email backend connection to use instead of
+                       opening a new connection just for this email.
     """
-    with get_connection() as conn:
-        msg = EmailMultiAlternatives(subject=email['subject'], body=email['body'], from_email=email['from'],
-                                     to=email['to'], cc=email['cc'], bcc=email['bcc'], reply_to=email['reply_to'],
-                                     attachments=email['attachments'], alternatives=email.get('alternatives'),
-                                     connection=conn)
-        if not msg.to:
-            msg.extra_headers['To'] = 'Undisclosed-recipients:;'
-        if email['html']:
-            msg.content_subtype = 'html'
-        msg.extra_headers['message-id'] = make_msgid(domain=urlsplit(config.BASE_URL).hostname)
-        msg.send()
+    if connection is not None:
+        _make_message(email, connection).send()
+    else:
+        with get_connection() as conn:
+            _make_message(email, conn).send()
     if not _from_task:
         logger.info('Sent email "%s"', truncate(email['subject'], 100))
     if log_entry:
         update_email_log_state(log_entry)
 
 
+def _make_message(email, connection):
+    msg = EmailMultiAlternatives(subject=email['subject'], body=email['body'], from_email=email['from'],
+                                 to=email['to'], cc=email['cc'], bcc=email['bcc'], reply_to=email['reply_to'],
+                                 attachments=email['attachments'], alternatives=email.get('alternatives'),
+                                 connection=connection)
+    if not msg.to:
+        msg.extra_headers['To'] = 'Undisclosed-recipients:;'
+    if email['html']:
+        msg.content_subtype = 'html'
+    msg.extra_headers['message-id'] = make_msgid(domain=urlsplit(config.BASE_URL).hostname)
+    return msg
+
+
+def do_send_emails(emails):
+    """Send multiple emails using a single connection.
+
+    Like :func:`do_send_email`, this does not do any retrying; but
+    failing to send an email does not prevent the other ones from
+    being sent.
+
+    :param emails: A list of ``(email, log_entry)`` tuples
+    :return: A list of ``(email, log_entry, exception)`` tuples for
+             the emails that could not be sent.
+    """
+    failed = []
+    conn = get_connection()
+    try:
+        for i, (email, log_entry) in enumerate(emails):
+            try:
+                # this does nothing if the connection is already open
+                conn.open()
+            except Exception as exc:
+                # no point in trying the other emails if we cannot connect
+                failed += [(email, log_entry, exc) for email, log_entry in emails[i:]]
+                break
+            try:
+                do_send_email(email, log_entry, _from_task=True, connection=conn)
+            except Exception as exc:
+                failed.append((email, log_entry, exc))
+                # the connection may be in a bad state, so we reconnect for the next email
+                conn.close()
+            else:
+                logger.info('Sent email "%s"', truncate(email['subject'], 100))
+    finally:
+        conn.close()
+    return failed
+
+
 def update_email_log_state(log_entry, failed=False):
     if failed:
         log_entry.data['state'] = 'failed'
@@ -5,9 +5,12 @@
 # modify it under the terms of the MIT License; see the
 # LICENSE file for more details.
 
+from smtplib import SMTPRecipientsRefused
+
 import pytest
 
-from indico.core.emails import get_actual_sender_address
+from indico.core.emails import do_send_emails, get_actual_sender_address
+from indico.core.notifications import make_email
 from indico.modules.core.settings import core_settings
 
 
@@ -60,3 +63,30 @@ def test_smtp_sender_config_notset(mocker, sender_email, result):
     core_settings.set('site_title', 'Indico')
     assert get_actual_sender_address(sender_email, set()) == result
     assert get_actual_sender_address(sender_email, {'reply@whatever.com'}) == (result[0], {'reply@whatever.com'})
+
+
+@pytest.mark.usefixtures('db', 'request_context')
+def test_do_send_emails(mocker):
+    def _send_messages(messages):
+        if 'fail@example.com' in messages[0].to:
+            raise SMTPRecipientsRefused({})
+        return 1
+
+    conn = mocker.patch('indico.core.emails.get_connection').return_value
+    conn.send_messages.side_effect = _send_messages
+    emails = [make_email(f'{name}@example.com', subject=name, body='test') for name in ('foo', 'fail', 'bar')]
+    failed = do_send_emails([(email, None) for email in emails])
+    assert [(email['subject'], type(exc)) for email, __, exc in failed] == [('fail', SMTPRecipientsRefused)]
+    assert conn.send_messages.call_count == 3
+    # the connection is reopened after a failure
+    assert conn.close.call_count == 2
+
+
+@pytest.mark.usefixtures('db', 'request_context')
+def test_do_send_emails_connection_failed(mocker):
+    conn = mocker.patch('indico.core.emails.get_connection').return_value
+    conn.open.side_effect = OSError('Connection refused')
+    emails = [make_email(f'{name}@example.com', subject=name, body='test') for name in ('foo', 'bar')]
+    failed = do_send_emails([(email, None) for email in emails])
+    assert [email['subject'] for email, __, __ in failed] == ['foo', 'bar']
+    assert not conn.send_messages.called
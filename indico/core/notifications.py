@@ -6,7 +6,6 @@
 # LICENSE file for more details.
 
 import re
-import time
 from email.mime.base import MIMEBase
 from functools import wraps
 from types import GeneratorType
@@ -53,14 +52,17 @@ def send_email(email, event=None, module=None, user=None, log_metadata=None, log
     :param log_metadata: A metadata dictionary to be saved in the event's log
     """
     from indico.core.emails import do_send_email, send_email_task
-    fn = send_email_task.delay if config.SMTP_USE_CELERY else do_send_email
+
     # we log the email immediately (as pending).  if we don't commit,
     # the log message will simply be thrown away later
     log_entry = _log_email(email, event, module, user, log_metadata, log_summary)
     if 'email_queue' in g:
-        g.email_queue.append((fn, email, log_entry))
+        # queued emails are sent in batches when flushing the queue
+        g.email_queue.append((email, log_entry))
+    elif config.SMTP_USE_CELERY:
+        send_email_task.delay(email, log_entry)
     else:
-        fn(email, log_entry)
+        do_send_email(email, log_entry)
 
 
 def _log_email(email, event, module, user, meta=None, summary=None):
@@ -102,31 +104,43 @@ def flush_email_queue():
     doing a commit/rollback of any other changes that might have
     been pending.
     """
-    from indico.core.emails import store_failed_email, update_email_log_state
+    from indico.core.emails import BATCH_SIZE, do_send_emails, send_emails_task
     queue = g.get('email_queue', [])
     if not queue:
         return
     logger.debug('Sending %d queued emails', len(queue))
-    for fn, email, log_entry in queue:
-        try:
-            fn(email, log_entry)
-        except Exception:
-            # Flushing the email queue happens after a commit.
-            # If anything goes wrong here we keep going and just log
-            # it to avoid losing (more) emails in case celery is not
-            # used for email sending or there is a temporary issue
-            # with celery.
-            if log_entry:
-                update_email_log_state(log_entry, failed=True)
-            path = store_failed_email(email, log_entry)
-            logger.exception('Flushing queued email "%s" failed; stored data in %s',
-                             truncate(email['subject'], 100), path)
-            # Wait for a short moment in case it's a very temporary issue
-            time.sleep(0.25)
+    # emails are sent in batches using a single SMTP connection per batch
+    # instead of connecting to the mail server for every single email
+    if config.SMTP_USE_CELERY:
+        for i in range(0, len(queue), BATCH_SIZE):
+            batch = queue[i:i + BATCH_SIZE]
+            try:
+                # log entries inside the list are not converted automatically when passing them to celery
+                send_emails_task.delay([(email, log_entry.id if log_entry else None) for email, log_entry in batch])
+            except Exception as exc:
+                for email, log_entry in batch:
+                    _handle_failed_queued_email(email, log_entry, exc)
+    else:
+        for email, log_entry, exc in do_send_emails(queue):
+            _handle_failed_queued_email(email, log_entry, exc)
     del queue[:]
     db.session.commit()
 
 
+def _handle_failed_queued_email(email, log_entry, exc):
+    # Flushing the email queue happens after a commit.
+    # If anything goes wrong here we keep going and just log
+    # it to avoid losing (more) emails in case celery is not
+    # used for email sending or there is a temporary issue
+    # with celery.
+    from indico.core.emails import store_failed_email, update_email_log_state
+    if log_entry:
+        update_email_log_state(log_entry, failed=True)
+    path = store_failed_email(email, log_entry)
+    logger.error('Flushing queued email "%s" failed; stored data in %s',
+                 truncate(email['subject'], 100), path, exc_info=exc)
+
+
 @make_interceptable
 def make_email(to_list=None, cc_list=None, bcc_list=None, *, sender_address=None, reply_address=None, attachments=None,
                subject=None, body=None, template=None, html=False, alternatives=None):
@@ -12,7 +12,7 @@ from operator import attrgetter
 from flask import g, has_request_context
 
 from indico.core.settings.models.settings import Setting, SettingPrincipal
-from indico.core.settings.util import get_all_settings, get_setting, get_setting_acl
+from indico.core.settings.util import get_all_settings, get_setting, get_setting_acl, invalidate_shared_settings
 
 
 class ACLProxyBase:
@@ -44,19 +44,28 @@ class SettingsProxyBase:
                  separate table
     :param converters: a dict specifying how to convert the values of
                        certain settings from/to JSON-compatible types
+    :param shared_cache: whether to cache the settings across requests
+                         in Redis (and the in-process cache if enabled).
+                         Whenever the settings are modified through the
+                         proxy, all processes stop using the cached
+                         ones.  If omitted, :attr:`default_shared_cache`
+                         is used.
     """
 
     acl_proxy_class = None
     default_sentinel = object()
     allow_cache_outside_request = False
+    #: Whether the shared cache is used unless specified otherwise
+    default_shared_cache = False
 
-    def __init__(self, module, defaults=None, strict=True, acls=None, converters=None):
+    def __init__(self, module, defaults=None, strict=True, acls=None, converters=None, shared_cache=None):
         self.module = module
         self.defaults = defaults or {}
         self.strict = strict
         self.acl_names = set(acls or ())
         self.acls = self.acl_proxy_class(self) if self.acl_proxy_class else None
         self.converters = converters or {}
+        self.shared_cache = self.default_shared_cache if shared_cache is None else shared_cache
         self._bound_args = None
         if strict and not defaults and not acls:
             raise ValueError('cannot use strict mode with no defaults')
@@ -85,7 +94,7 @@ class SettingsProxyBase:
                      function call.
         """
         self_type = type(self)
-        bound = self_type(self.module, self.defaults, self.strict, self.acl_names, self.converters)
+        bound = self_type(self.module, self.defaults, self.strict, self.acl_names, self.converters, self.shared_cache)
         bound._bound_args = args
 
         for name in dir(self_type):
@@ -96,7 +105,11 @@ class SettingsProxyBase:
             setattr(bound, name, func)
         if bound.acl_proxy_class is not None:
             for name in dir(bound.acl_proxy_class):
-                if name[0] == '_' or name == 'merge_users' or not callable(getattr(bound.acl_proxy_class, name)):
+                if (
+                    name[0] == '_' or
+                    name in ('merge_users', 'contains_user_bulk', 'preload_bulk') or
+                    not callable(getattr(bound.acl_proxy_class, name))
+                ):
                     continue
                 func = getattr(bound.acls, name)
                 func = update_wrapper(partial(func, *args), func)
@@ -133,9 +146,11 @@ class SettingsProxyBase:
             if acl_names:
                 acl_func(acl_names)
 
-    def _flush_cache(self):
+    def _flush_cache(self, **kwargs):
         if has_request_context():
             g.get('settings_cache', {}).clear()
+        if self.shared_cache:
+            invalidate_shared_settings(self, **kwargs)
 
     def _convert_from_python(self, name, value):
         if value is None:
@@ -220,9 +235,14 @@ class ACLProxy(ACLProxyBase):
 
 
 class SettingsProxy(SettingsProxyBase):
-    """Proxy class to access settings for a certain module."""
+    """Proxy class to access settings for a certain module.
+
+    Since global settings are read very often but rarely change, they
+    are kept in the shared cache by default.
+    """
 
     acl_proxy_class = ACLProxy
+    default_shared_cache = True
 
     def get_all(self, no_defaults=False):
         """Retrieve all settings, including ACLs.
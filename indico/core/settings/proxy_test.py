@@ -12,6 +12,7 @@ import pytz
 
 from indico.core.settings import PrefixSettingsProxy, SettingsProxy
 from indico.core.settings.converters import DatetimeConverter, EnumConverter, TimedeltaConverter
+from indico.core.settings.util import _invalidate_shared_settings_after_commit
 from indico.modules.events.settings import EventSettingsProxy
 from indico.modules.users import User
 from indico.util.enum import IndicoIntEnum
@@ -235,3 +236,80 @@ def test_bound_settings(dummy_event, dummy_user):
     assert bound.acls.get('acl') == {dummy_user}
     assert bound.get('e') == TestEnum.bar
     assert isinstance(bound.get('e'), TestEnum)
+
+
+@pytest.mark.usefixtures('db')
+def test_proxy_shared_cache(count_queries):
+    proxy = SettingsProxy('test', {'hello': 'world', 'foo': None})
+    assert proxy.shared_cache
+    proxy.set('foo', 'bar')
+    with count_queries() as cnt:
+        # modified in the current transaction, so the shared cache is not used
+        assert proxy.get('foo') == 'bar'
+        assert proxy.get('foo') == 'bar'
+    assert cnt() == 2
+    # this is triggered on commit, which is not possible in tests
+    _invalidate_shared_settings_after_commit(None)
+    assert proxy.get('foo') == 'bar'
+    with count_queries() as cnt:
+        assert proxy.get('foo') == 'bar'
+        assert proxy.get('hello') == 'world'
+    assert cnt() == 0
+    proxy.set('foo', 'baz')
+    assert proxy.get('foo') == 'baz'
+
+
+@pytest.mark.usefixtures('db')
+def test_proxy_shared_cache_scoped(dummy_event, create_event, count_queries):
+    assert not EventSettingsProxy('test', {'foo': None}).shared_cache
+    proxy = EventSettingsProxy('test', {'foo': None}, shared_cache=True)
+    other_event = create_event()
+    proxy.set(dummy_event, 'foo', 'bar')
+    proxy.set(other_event, 'foo', 'baz')
+    _invalidate_shared_settings_after_commit(None)
+    assert proxy.get(dummy_event, 'foo') == 'bar'
+    assert proxy.get(other_event, 'foo') == 'baz'
+    bound = proxy.bind(dummy_event)
+    assert bound.shared_cache
+    with count_queries() as cnt:
+        assert bound.get('foo') == 'bar'
+    assert cnt() == 0
+    proxy.set(other_event, 'foo', 'test')
+    _invalidate_shared_settings_after_commit(None)
+    with count_queries() as cnt:
+        # only the settings of the modified event are loaded again
+        assert proxy.get(dummy_event, 'foo') == 'bar'
+        assert proxy.get(other_event, 'foo') == 'test'
+    assert cnt() == 1
+
+
+@pytest.mark.usefixtures('db', 'request_context')  # use req ctx so the cache is active
+def test_acls_bulk(dummy_event, create_event, dummy_user, create_user, count_queries):
+    other_user = create_user(123)
+    events = [dummy_event, create_event(), create_event()]
+    proxy = EventSettingsProxy('foo', {'reg': None}, acls={'acl', 'other'})
+    proxy.acls.set(events[0], 'acl', {dummy_user})
+    proxy.acls.set(events[1], 'acl', {other_user})
+    proxy.acls.set(events[2], 'other', {dummy_user})
+    with count_queries() as cnt:
+        assert proxy.acls.contains_user_bulk(events, 'acl', dummy_user) == {
+            events[0].id: True,
+            events[1].id: False,
+            events[2].id: False,
+        }
+    assert cnt() == 1
+    with count_queries() as cnt:
+        assert proxy.acls.get(events[1], 'acl') == {other_user}
+        assert proxy.acls.contains_user_bulk([e.id for e in events], 'acl', other_user) == {
+            events[0].id: False,
+            events[1].id: True,
+            events[2].id: False,
+        }
+    assert cnt() == 0
+    proxy.acls.preload_bulk(events)
+    with count_queries() as cnt:
+        assert proxy.acls.get(events[0], 'other') == set()
+        assert proxy.acls.get(events[2], 'other') == {dummy_user}
+    assert cnt() == 0
+    with pytest.raises(ValueError):
+        proxy.acls.contains_user_bulk(events, 'reg', dummy_user)
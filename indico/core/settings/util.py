@@ -5,19 +5,82 @@
 # modify it under the terms of the MIT License; see the
 # LICENSE file for more details.
 
+import uuid
 from copy import copy
 from operator import attrgetter
 
+from indico.core import signals
+from indico.core.cache import make_scoped_cache
+from indico.core.db import db
+
+
+#: How long settings are kept in the shared cache
+SHARED_SETTINGS_CACHE_TTL = 3600
 
 _not_in_db = object()
 
+shared_settings_cache = make_scoped_cache('settings')
+
 
 def _get_cache_key(proxy, name, kwargs):
     return type(proxy), proxy.module, name, frozenset(kwargs.items())
 
 
+def _get_shared_cache_scope(proxy, kwargs):
+    # the scope kwargs may contain objects (e.g. ``user``) instead of their ids
+    scope = sorted((f'{k}_id', v.id) if hasattr(v, 'id') else (k, v) for k, v in kwargs.items())
+    return ':'.join([type(proxy).__name__, proxy.module, *(f'{k}={v}' for k, v in scope)])
+
+
+def _get_shared_cache_key(proxy, kwargs):
+    scope = _get_shared_cache_scope(proxy, kwargs)
+    if scope in db.session.info.get('shared_settings_invalidate', ()):
+        # the settings have been modified in the current transaction, so
+        # they must neither be taken from nor written to the shared cache
+        return None
+    version = shared_settings_cache.get(f'version:{scope}', '')
+    return f'{scope}:{version}'
+
+
+def invalidate_shared_settings(proxy, **kwargs):
+    """Discard the settings of a proxy from the shared cache.
+
+    This changes the version of the settings so all processes stop
+    using the cached ones.  The version is changed once more after the
+    current transaction has been committed, since a concurrent request
+    may have cached the old settings in the meantime.
+
+    :param proxy: The settings proxy whose settings changed
+    :param kwargs: The arguments identifying the object the settings
+                   belong to, e.g. ``event_id``
+    """
+    scope = _get_shared_cache_scope(proxy, kwargs)
+    _invalidate_shared_settings(scope)
+    db.session.info.setdefault('shared_settings_invalidate', set()).add(scope)
+
+
+def _invalidate_shared_settings(scope):
+    shared_settings_cache.set(f'version:{scope}', uuid.uuid4().hex)
+
+
+@signals.core.after_commit.connect
+def _invalidate_shared_settings_after_commit(sender, **kwargs):
+    for scope in db.session.info.pop('shared_settings_invalidate', ()):
+        _invalidate_shared_settings(scope)
+
+
+def _get_all_settings(cls, proxy, **kwargs):
+    if not proxy.shared_cache or (shared_key := _get_shared_cache_key(proxy, kwargs)) is None:
+        return cls.get_all(proxy.module, **kwargs)
+    settings = shared_settings_cache.get(shared_key)
+    if settings is None:
+        settings = cls.get_all(proxy.module, **kwargs)
+        shared_settings_cache.set(shared_key, settings, timeout=SHARED_SETTINGS_CACHE_TTL)
+    return settings
+
+
 def _preload_settings(cls, proxy, cache, **kwargs):
-    settings = cls.get_all(proxy.module, **kwargs)
+    settings = _get_all_settings(cls, proxy, **kwargs)
     for name, value in settings.items():
         cache_key = _get_cache_key(proxy, name, kwargs)
         cache[cache_key] = value
@@ -49,10 +112,54 @@ def preload_settings_bulk(proxy, filter_col, filter_values):
             cache.setdefault(cache_key, _not_in_db)
 
 
+def preload_acl_settings_bulk(proxy, filter_col, filter_values, names=None):
+    """Preload ACL settings in bulk for a given ACL proxy.
+
+    This is the ACL counterpart of :func:`preload_settings_bulk`; the
+    principals of the ACLs of many objects are loaded in a single query.
+    ACLs which are already cached are not loaded again.
+
+    :param proxy: The ACL proxy of a scoped settings proxy
+    :param filter_col: The column of the principal settings model
+                       containing the object id, e.g.
+                       ``EventSettingPrincipal.event_id``
+    :param filter_values: The ids of the objects
+    :param names: The names of the ACL settings to load; all ACL
+                  settings of the proxy if omitted
+    :return: A dict mapping each ACL setting name to a dict mapping
+             the object ids to their ACLs
+    """
+    names = proxy.proxy.acl_names if names is None else set(names)
+    cache = proxy._cache
+    kwargs_key = filter_col.key
+    rv = {name: {} for name in names}
+    missing = set()
+    for name in names:
+        for id_ in filter_values:
+            try:
+                rv[name][id_] = cache[_get_cache_key(proxy, name, {kwargs_key: id_})]
+            except KeyError:
+                missing.add((name, id_))
+                rv[name][id_] = set()
+    if not missing:
+        return rv
+    principal_cls = filter_col.class_
+    query = principal_cls.query.filter(principal_cls.module == proxy.module,
+                                       principal_cls.name.in_({name for name, __ in missing}),
+                                       filter_col.in_({id_ for __, id_ in missing}))
+    get_kwargs_val = attrgetter(kwargs_key)
+    for entry in query:
+        if (entry.name, (id_ := get_kwargs_val(entry))) in missing:
+            rv[entry.name][id_].add(entry.principal)
+    for name, id_ in missing:
+        cache[_get_cache_key(proxy, name, {kwargs_key: id_})] = rv[name][id_]
+    return rv
+
+
 def get_all_settings(cls, acl_cls, proxy, no_defaults, **kwargs):
     """Helper function for SettingsProxy.get_all."""
     if no_defaults:
-        rv = cls.get_all(proxy.module, **kwargs)
+        rv = dict(_get_all_settings(cls, proxy, **kwargs))
         if acl_cls and proxy.acl_names:
             rv.update(acl_cls.get_all_acls(proxy.module, **kwargs))
         return {k: proxy._convert_to_python(k, v) for k, v in rv.items()}
@@ -60,7 +167,7 @@ def get_all_settings(cls, acl_cls, proxy, no_defaults, **kwargs):
     if acl_cls and proxy.acl_names:
         settings.update({name: set() for name in proxy.acl_names})
     settings.update({k: proxy._convert_to_python(k, v)
-                     for k, v in cls.get_all(proxy.module, **kwargs).items()
+                     for k, v in _get_all_settings(cls, proxy, **kwargs).items()
                      if not proxy.strict or k in proxy.defaults})
     if acl_cls and proxy.acl_names:
         settings.update(acl_cls.get_all_acls(proxy.module, **kwargs))
@@ -7,9 +7,13 @@
 
 import codecs
 import functools
+import hashlib
 import os
+import shutil
 import subprocess
 import tempfile
+import uuid
+from dataclasses import dataclass
 from importlib.resources import as_file
 from importlib.resources import files as res_files
 from io import BytesIO
@@ -18,7 +22,7 @@ from pathlib import Path
 from zipfile import ZipFile
 
 import markdown
-from flask import session
+from flask import redirect, session
 from flask.helpers import get_root_path
 from jinja2 import Environment, FileSystemLoader, StrictUndefined
 from jinja2.ext import Extension
@@ -30,6 +34,7 @@ from werkzeug.local import LocalProxy
 
 from indico.core.cache import make_scoped_cache
 from indico.core.config import config
+from indico.core.db import db
 from indico.core.limiter import make_rate_limiter
 from indico.core.logger import Logger
 from indico.legacy.pdfinterface.base import escape
@@ -43,12 +48,25 @@ from indico.util.date_time import format_date, format_human_timedelta, format_ti
 from indico.util.fs import chmod_umask
 from indico.util.i18n import _, ngettext
 from indico.util.string import render_markdown
+from indico.web.flask.util import url_for
 
 
 #: A rate limiter for PDF generation endpoints that are available publicly without logging in
 latex_rate_limiter = LocalProxy(functools.cache(lambda: make_rate_limiter('latex', config.LATEX_RATE_LIMIT)))
 cache = make_scoped_cache('latex-pdfs')
 
+#: How long a PDF generated in the background is reused unless it is
+#: persistent. This must be less than a day since unclaimed files are
+#: deleted after that time.
+LATEX_PDF_CACHE_TTL = 6 * 3600
+#: How long a request waits for a PDF to be generated in the background
+#: before showing a page which reloads until it is ready
+LATEX_PDF_WAIT_TIMEOUT = 10
+#: How long the generation of a PDF in the background may take
+LATEX_PDF_TASK_TIMEOUT = 3600
+
+latex_pdf_cache = make_scoped_cache('latex-pdf-files')
+
 
 def generate_cached_pdf(fn, key, obj=None) -> BytesIO:
     """Generate a PDF from LaTeX with caching and rate limiting.
@@ -84,6 +102,166 @@ def generate_cached_pdf(fn, key, obj=None) -> BytesIO:
     return BytesIO(data)
 
 
+@dataclass(frozen=True)
+class LatexSource:
+    """The rendered LaTeX source of a PDF.
+
+    :param template_name: The name of the main ``.tex`` file without
+                          extension
+    :param has_toc: Whether the document contains a table of contents
+    :param files: A dict mapping the paths of the main ``.tex`` file and
+                  all files it references (e.g. images) to their content
+    """
+
+    template_name: str
+    has_toc: bool
+    files: dict[str, bytes]
+
+    @property
+    def key(self):
+        """A hash identifying the PDF generated from this source."""
+        checksum = hashlib.sha256(f'{self.template_name}:{self.has_toc}'.encode())
+        for name, data in sorted(self.files.items()):
+            checksum.update(name.encode())
+            checksum.update(hashlib.sha256(data).digest())
+        return checksum.hexdigest()
+
+
+def store_latex_source(source, event):
+    """Store the LaTeX source of a PDF so it can be compiled in the background.
+
+    This avoids sending the whole source, which may contain lots of images,
+    to the task queue.
+
+    :param source: A :class:`LatexSource`
+    :param event: The event the PDF belongs to
+    :return: An unclaimed :class:`~indico.modules.files.models.files.File`
+    """
+    from indico.modules.files.models.files import File
+    buf = BytesIO()
+    with ZipFile(buf, 'w', allowZip64=True) as zip_handler:
+        for name, data in source.files.items():
+            zip_handler.writestr(name, data)
+    buf.seek(0)
+    f = File(filename=f'{source.template_name}.zip', content_type='application/zip',
+             meta={'event_id': event.id, 'latex_template_name': source.template_name, 'latex_has_toc': source.has_toc})
+    f.save(('event', event.id, 'latex'), buf)
+    db.session.add(f)
+    db.session.flush()
+    return f
+
+
+def load_latex_source(file):
+    """Load a LaTeX source stored using :func:`store_latex_source`.
+
+    :return: A :class:`LatexSource`
+    """
+    with file.open() as fd, ZipFile(fd) as zip_handler:
+        files = {name: zip_handler.read(name) for name in zip_handler.namelist()}
+    return LatexSource(file.meta['latex_template_name'], file.meta['latex_has_toc'], files)
+
+
+def compile_latex_source(source):
+    """Compile the LaTeX source of a PDF.
+
+    :param source: A :class:`LatexSource`
+    :return: The PDF data as bytes
+    """
+    if not config.LATEX_ENABLED:
+        raise RuntimeError('LaTeX is not enabled')
+    source_dir = tempfile.mkdtemp(prefix='indico-texgen-', dir=config.TEMP_DIR)
+    chmod_umask(source_dir, execute=True)
+    for name, data in source.files.items():
+        path = os.path.join(source_dir, name)
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        Path(path).write_bytes(data)
+    with as_file(res_files('indico_fonts')) as font_dir:
+        os.symlink(font_dir, os.path.join(source_dir, 'fonts'))
+    latex = LatexRunner(source_dir, has_toc=source.has_toc)
+    target_filename = latex.compile(os.path.join(source_dir, source.template_name + '.tex'),
+                                    os.path.join(source_dir, source.template_name + '.pdf'))
+    data = Path(target_filename).read_bytes()
+    # only delete the files on success, otherwise they are needed to find out what went wrong
+    shutil.rmtree(source_dir, ignore_errors=True)
+    return data
+
+
+def get_cached_latex_pdf(key, *, persistent=False):
+    """Get a PDF previously generated from a LaTeX source with the given hash.
+
+    :param persistent: Whether to look for a persistent PDF in case the
+                       cache does not know about it
+    :return: A :class:`~indico.modules.files.models.files.File` or `None`
+    """
+    from indico.modules.files.models.files import File
+    if (file_id := latex_pdf_cache.get(key)) is not None and (file := File.get(file_id)) is not None:
+        return file
+    if not persistent:
+        return None
+    file = File.query.filter(File.claimed, File.meta.contains({'latex_key': key})).first()
+    if file is not None:
+        latex_pdf_cache.set(key, file.id, timeout=0)
+    return file
+
+
+def release_latex_pdf(key):
+    """Stop reusing a persistent PDF generated from a LaTeX source.
+
+    The stored file is not deleted right away since it may still be
+    downloading, but it is unclaimed so the periodic cleanup of unclaimed
+    files deletes it.
+
+    :param key: The hash of the LaTeX source
+    """
+    from indico.modules.files.models.files import File
+    latex_pdf_cache.delete(key)
+    for file in File.query.filter(File.claimed, File.meta.contains({'latex_key': key})):
+        file.claimed = False
+
+
+def is_latex_pdf_task_known(task_id):
+    """Check whether a task generating a LaTeX PDF was started recently.
+
+    Celery reports tasks it does not know about as pending, so this is
+    needed to tell a task which has not started yet (e.g. because all
+    job slots are taken) from one that never existed or expired.
+    """
+    return latex_pdf_cache.get(f'task-id-{task_id}') is not None
+
+
+def send_latex_pdf(source, filename, event, *, persistent=False):
+    """Send a PDF generated from LaTeX, compiling it in the background if needed.
+
+    The generated PDF is stored and reused for everyone requesting a PDF
+    with the same LaTeX source. Compiling it happens in a Celery task,
+    and requests for the same PDF arriving in the meantime wait for the
+    task that is already running. The user is redirected to a page which
+    waits for the PDF and reloads itself until it can be downloaded.
+
+    :param source: A :class:`LatexSource`
+    :param filename: The name of the PDF file
+    :param event: The event the PDF belongs to
+    :param persistent: Whether the PDF should be kept until it is released
+                       using :func:`release_latex_pdf` instead of only
+                       being reused for :data:`LATEX_PDF_CACHE_TTL`
+    """
+    from indico.modules.events.tasks import generate_latex_pdf
+    key = source.key
+    if (file := get_cached_latex_pdf(key, persistent=persistent)) is not None:
+        return file.storage.send_file(file.storage_file_id, file.content_type, filename)
+    task_key = f'task-{key}'
+    task_id = str(uuid.uuid4())
+    if latex_pdf_cache.add(task_key, task_id, timeout=LATEX_PDF_TASK_TIMEOUT):
+        latex_pdf_cache.set(f'task-id-{task_id}', key, timeout=LATEX_PDF_TASK_TIMEOUT)
+        source_file = store_latex_source(source, event)
+        db.session.commit()
+        generate_latex_pdf.apply_async((source_file, key, filename, event), {'persistent': persistent},
+                                       task_id=task_id)
+    else:
+        task_id = latex_pdf_cache.get(task_key)
+    return redirect(url_for('events.latex_pdf_status', event, task_id=task_id))
+
+
 class PDFLaTeXBase:
     _table_of_contents = False
     LATEX_TEMPLATE = None
@@ -109,6 +287,32 @@ class PDFLaTeXBase:
         filename = latex.run(self.LATEX_TEMPLATE, **self._args)
         return Path(filename).read_bytes() if as_bytes else filename
 
+    def prepare_source(self):
+        """Render the LaTeX source of the PDF without compiling it.
+
+        Files referenced by the LaTeX source (such as images) are renamed
+        based on their content, so the same content always results in the
+        same source.
+
+        :return: A :class:`LatexSource`
+        """
+        latex = LatexRunner(self.source_dir, has_toc=self._table_of_contents)
+        source_filename, __ = latex.prepare(self.LATEX_TEMPLATE, **self._args)
+        source = Path(source_filename).read_text(encoding='utf-8')
+        files = {}
+        for dirpath, _dirnames, filenames in os.walk(self.source_dir):
+            for f in filenames:
+                file_path = os.path.join(dirpath, f)
+                if file_path == source_filename or f.startswith('.') or f.endswith(('.py', '.pyc', '.pyo')):
+                    continue
+                data = Path(file_path).read_bytes()
+                name = os.path.relpath(file_path, self.source_dir)
+                new_name = hashlib.sha256(data).hexdigest()[:16] + os.path.splitext(f)[1]
+                source = source.replace(name, new_name)
+                files[new_name] = data
+        files[self.LATEX_TEMPLATE + '.tex'] = source.encode()
+        return LatexSource(self.LATEX_TEMPLATE, self._table_of_contents, files)
+
     def generate_source_archive(self):
         latex = LatexRunner(self.source_dir, has_toc=self._table_of_contents)
         latex.prepare(self.LATEX_TEMPLATE, **self._args)
@@ -251,6 +455,9 @@ class LatexRunner:
         if not config.LATEX_ENABLED:
             raise RuntimeError('LaTeX is not enabled')
         source_filename, target_filename = self.prepare(template_name, **kwargs)
+        return self.compile(source_filename, target_filename)
+
+    def compile(self, source_filename, target_filename):
         log_filename = os.path.join(self.source_dir, 'output.log')
         log_file = open(log_filename, 'a+')  # noqa: SIM115
         try:
@@ -0,0 +1,78 @@
+"""Add category effective readers
+
+Revision ID: a6703f7753f1
+Revises: 932389d22b1f
+Create Date: 2025-10-20 12:00:00.000000
+"""
+
+from enum import Enum
+
+import sqlalchemy as sa
+from alembic import op
+
+from indico.core.db.sqlalchemy import PyIntEnum
+
+
+# revision identifiers, used by Alembic.
+revision = 'a6703f7753f1'
+down_revision = '932389d22b1f'
+branch_labels = None
+depends_on = None
+
+
+class _PrincipalType(int, Enum):
+    user = 1
+    local_group = 2
+    multipass_group = 3
+    email = 4
+    network = 5
+    event_role = 6
+    category_role = 7
+    registration_form = 8
+
+
+def upgrade():
+    op.create_table(
+        'effective_readers',
+        sa.Column('id', sa.Integer(), nullable=False),
+        sa.Column('category_id', sa.Integer(), nullable=False, index=True),
+        sa.Column('type', PyIntEnum(_PrincipalType), nullable=False),
+        sa.Column('user_id', sa.Integer(), nullable=True, index=True),
+        sa.Column('local_group_id', sa.Integer(), nullable=True, index=True),
+        sa.Column('is_manager', sa.Boolean(), nullable=False),
+        sa.ForeignKeyConstraint(['category_id'], ['categories.categories.id']),
+        sa.PrimaryKeyConstraint('id'),
+        schema='categories'
+    )
+    op.create_index(None, 'effective_readers', ['category_id', 'type', 'user_id', 'local_group_id'],
+                    schema='categories')
+    op.execute('''
+        WITH RECURSIVE tree(id, path, read_path, protected) AS (
+            SELECT id, ARRAY[id], ARRAY[id], protection_mode = 2
+            FROM categories.categories
+            WHERE parent_id IS NULL
+
+            UNION ALL
+
+            SELECT cat.id,
+                   tree.path || cat.id,
+                   CASE WHEN cat.protection_mode = 1 THEN tree.read_path || cat.id ELSE ARRAY[cat.id] END,
+                   CASE WHEN cat.protection_mode = 1 THEN tree.protected ELSE cat.protection_mode = 2 END
+            FROM categories.categories cat, tree
+            WHERE cat.parent_id = tree.id
+        )
+        INSERT INTO categories.effective_readers (category_id, type, user_id, local_group_id, is_manager)
+        SELECT tree.id,
+               p.type,
+               CASE WHEN p.type = 1 THEN p.user_id END AS user_id,
+               CASE WHEN p.type = 2 THEN p.local_group_id END AS local_group_id,
+               bool_or(p.full_access)
+        FROM tree
+        JOIN categories.principals p ON (p.category_id = ANY(tree.path))
+        WHERE p.full_access OR (tree.protected AND p.category_id = ANY(tree.read_path))
+        GROUP BY tree.id, p.type, 3, 4;
+    ''')
+
+
+def downgrade():
+    op.drop_table('effective_readers', schema='categories')
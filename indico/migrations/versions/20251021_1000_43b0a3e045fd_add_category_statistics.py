@@ -0,0 +1,107 @@
+"""Add category statistics
+
+Revision ID: 43b0a3e045fd
+Revises: a6703f7753f1
+Create Date: 2025-10-21 10:00:00.000000
+"""
+
+import sqlalchemy as sa
+from alembic import op
+
+
+# revision identifiers, used by Alembic.
+revision = '43b0a3e045fd'
+down_revision = 'a6703f7753f1'
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    op.create_table(
+        'statistics',
+        sa.Column('category_id', sa.Integer(), nullable=False),
+        sa.Column('year', sa.Integer(), nullable=False),
+        sa.Column('events', sa.Integer(), nullable=False),
+        sa.Column('contributions', sa.Integer(), nullable=False),
+        sa.Column('attachments', sa.Integer(), nullable=False),
+        sa.Column('created_events', sa.Integer(), nullable=False),
+        sa.Column('own_events', sa.Integer(), nullable=False),
+        sa.Column('own_contributions', sa.Integer(), nullable=False),
+        sa.Column('own_attachments', sa.Integer(), nullable=False),
+        sa.Column('own_created_events', sa.Integer(), nullable=False),
+        sa.ForeignKeyConstraint(['category_id'], ['categories.categories.id']),
+        sa.PrimaryKeyConstraint('category_id', 'year'),
+        schema='categories'
+    )
+    op.execute('''
+        WITH RECURSIVE tree(id, path) AS (
+            SELECT id, ARRAY[id]
+            FROM categories.categories
+            WHERE parent_id IS NULL
+
+            UNION ALL
+
+            SELECT cat.id, tree.path || cat.id
+            FROM categories.categories cat, tree
+            WHERE cat.parent_id = tree.id
+        ), counts(category_id, year, events, contributions, attachments, created_events) AS (
+            SELECT e.category_id, extract(year FROM e.start_dt)::int, count(*), 0, 0, 0
+            FROM events.events e
+            WHERE NOT e.is_deleted AND e.category_id IS NOT NULL
+            GROUP BY 1, 2
+
+            UNION ALL
+
+            SELECT e.category_id, extract(year FROM tte.start_dt)::int, 0, count(*), 0, 0
+            FROM events.timetable_entries tte
+            JOIN events.events e ON (e.id = tte.event_id)
+            WHERE tte.type = 2 AND NOT e.is_deleted AND e.category_id IS NOT NULL
+            GROUP BY 1, 2
+
+            UNION ALL
+
+            SELECT e.category_id, extract(year FROM e.start_dt)::int, 0, 0, count(a.id), 0
+            FROM attachments.attachments a
+            JOIN attachments.folders f ON (f.id = a.folder_id)
+            JOIN events.events e ON (e.id = f.event_id)
+            LEFT JOIN events.sessions s ON (s.id = f.session_id)
+            LEFT JOIN events.contributions c ON (c.id = f.contribution_id)
+            LEFT JOIN events.subcontributions sc ON (sc.id = f.subcontribution_id)
+            LEFT JOIN events.contributions scc ON (scc.id = sc.contribution_id)
+            WHERE f.link_type != 1 AND
+                  NOT a.is_deleted AND
+                  NOT f.is_deleted AND
+                  NOT e.is_deleted AND
+                  NOT coalesce(s.is_deleted, c.is_deleted, sc.is_deleted, false) AND
+                  (scc.is_deleted IS NULL OR NOT scc.is_deleted) AND
+                  e.category_id IS NOT NULL
+            GROUP BY 1, 2
+
+            UNION ALL
+
+            SELECT e.category_id, extract(year FROM e.created_dt)::int, 0, 0, 0, count(*)
+            FROM events.events e
+            WHERE NOT e.is_deleted AND e.category_id IS NOT NULL
+            GROUP BY 1, 2
+        )
+        INSERT INTO categories.statistics (category_id, year, events, contributions, attachments, created_events,
+                                           own_events, own_contributions, own_attachments, own_created_events)
+        SELECT chain.id,
+               counts.year,
+               sum(counts.events),
+               sum(counts.contributions),
+               sum(counts.attachments),
+               sum(counts.created_events),
+               coalesce(sum(counts.events) FILTER (WHERE chain.id = counts.category_id), 0),
+               coalesce(sum(counts.contributions) FILTER (WHERE chain.id = counts.category_id), 0),
+               coalesce(sum(counts.attachments) FILTER (WHERE chain.id = counts.category_id), 0),
+               coalesce(sum(counts.created_events) FILTER (WHERE chain.id = counts.category_id), 0)
+        FROM counts
+        JOIN tree ON (tree.id = counts.category_id)
+        CROSS JOIN unnest(tree.path) AS chain(id)
+        GROUP BY chain.id, counts.year;
+    ''')
+
+
+def downgrade():
+    op.drop_table('statistics', schema='categories')
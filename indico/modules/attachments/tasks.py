@@ -5,26 +5,53 @@
 # modify it under the terms of the MIT License; see the
 # LICENSE file for more details.
 
-import os
+import hashlib
 
+from indico.core.cache import make_scoped_cache
 from indico.core.celery import celery
 from indico.core.config import config
 from indico.core.db import db
 from indico.modules.attachments.models.attachments import Attachment
 from indico.modules.files.models.files import File
+from indico.util.archives import IterableReader, iter_zip
+
+
+#: How long a generated material package is reused.  This must be shorter
+#: than the time after which the unclaimed package files are deleted.
+MATERIAL_PACKAGE_CACHE_TTL = 12 * 3600
+
+material_package_cache = make_scoped_cache('material-package')
+
+
+def _get_package_key(event, attachments, entries):
+    # the same files with the same paths result in the same package
+    data = [event.id, *((a.file_id, entry.name) for a, entry in zip(attachments, entries, strict=True))]
+    return hashlib.sha256(repr(data).encode()).hexdigest()
+
+
+def _get_cached_package(key):
+    if (file_id := material_package_cache.get(key)) is None:
+        return None
+    f = File.get(file_id)
+    if f is None or f.storage_file_id is None:
+        return None
+    return f
 
 
 @celery.task(ignore_result=False)
 def generate_materials_package(attachment_ids, event):
     from indico.modules.attachments.controllers.event_package import AttachmentPackageGeneratorMixin
-    attachments = Attachment.query.filter(Attachment.id.in_(attachment_ids)).all()
+    attachments = Attachment.query.filter(Attachment.id.in_(attachment_ids)).order_by(Attachment.id).all()
     attachment_package_mixin = AttachmentPackageGeneratorMixin()
     attachment_package_mixin.event = event
-    generated_zip = attachment_package_mixin._generate_zip_file(attachments, return_file=True)
+    entries = attachment_package_mixin._get_zip_entries(attachments)
+    key = _get_package_key(event, attachments, entries)
+    if f := _get_cached_package(key):
+        return f.signed_download_url
     f = File(filename='material-package.zip', content_type='application/zip', meta={'event_id': event.id})
     context = ('event', event.id, 'attachment-package')
-    f.save(context, generated_zip, backend=config.STATIC_SITE_STORAGE)
+    f.save(context, IterableReader(iter_zip(entries)), backend=config.STATIC_SITE_STORAGE)
     db.session.add(f)
     db.session.commit()
-    os.unlink(generated_zip.name)
+    material_package_cache.set(key, f.id, timeout=MATERIAL_PACKAGE_CACHE_TTL)
     return f.signed_download_url
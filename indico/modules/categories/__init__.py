@@ -6,8 +6,12 @@
 # LICENSE file for more details.
 
 from flask import session
+from sqlalchemy import orm
+from sqlalchemy.event import listens_for
 
 from indico.core import signals
+from indico.core.db import db
+from indico.core.db.sqlalchemy.links import LinkType
 from indico.core.db.sqlalchemy.protection import make_acl_log_fn
 from indico.core.logger import Logger
 from indico.core.permissions import ManagementPermission, check_permissions
@@ -40,6 +44,105 @@ def _import_tasks(sender, **kwargs):
 def _merge_users(target, source, **kwargs):
     from indico.modules.categories.models.principals import CategoryPrincipal
     CategoryPrincipal.merge_users(target, source, 'category')
+    _schedule_effective_readers_refresh(None)
+
+
+def _schedule_effective_readers_refresh(category):
+    """Schedule updating the effective readers of a category subtree.
+
+    The update happens when the transaction is committed, since the ACL
+    changes may not be flushable at the time the change happens.
+
+    :param category: The category to update, or ``None`` to update all
+                     categories.
+    """
+    db.session.info.setdefault('effective_readers_refresh', set()).add(category)
+
+
+@signals.acl.entry_changed.connect_via(Category)
+@signals.acl.protection_changed.connect_via(Category)
+def _category_acl_changed(sender, obj, **kwargs):
+    _schedule_effective_readers_refresh(obj)
+
+
+@signals.category.created.connect
+@signals.category.moved.connect
+def _category_created_or_moved(category, **kwargs):
+    _schedule_effective_readers_refresh(category)
+
+
+@listens_for(orm.Session, 'before_commit')
+def _refresh_effective_readers(sess):
+    from indico.modules.categories.models.effective_readers import CategoryEffectiveReader
+    if not (pending := sess.info.pop('effective_readers_refresh', None)):
+        return
+    sess.flush()
+    CategoryEffectiveReader.refresh(None if None in pending else {cat.id for cat in pending})
+
+
+def _schedule_statistics_refresh(category):
+    """Schedule updating the statistics of a category.
+
+    The objects directly inside the category are counted again when the
+    transaction is committed.
+
+    :param category: The category whose content changed, or ``None``
+                     for unlisted events (which are not counted).
+    """
+    if category is not None:
+        db.session.info.setdefault('statistics_refresh', set()).add(category)
+
+
+@signals.category.moved.connect
+def _category_moved(category, old_parent, **kwargs):
+    from indico.modules.categories.models.statistics import CategoryStatistics
+    CategoryStatistics.move_subtree(category, old_parent)
+
+
+@signals.event.created.connect
+@signals.event.deleted.connect
+@signals.event.restored.connect
+@signals.event.imported.connect
+@signals.event.times_changed.connect
+@signals.event.timetable_entry_created.connect
+@signals.event.timetable_entry_updated.connect
+@signals.event.timetable_entry_deleted.connect
+@signals.event.session_deleted.connect
+@signals.event.contribution_deleted.connect
+@signals.event.subcontribution_deleted.connect
+def _event_content_changed(sender, obj=None, **kwargs):
+    # `times_changed` is sent with the type of the object as the sender
+    obj = obj if obj is not None else sender
+    _schedule_statistics_refresh(obj.event.category)
+
+
+@signals.event.cloned.connect
+def _event_cloned(old_event, new_event, **kwargs):
+    _schedule_statistics_refresh(new_event.category)
+
+
+@signals.event.moved.connect
+def _event_moved(event, old_parent, **kwargs):
+    _schedule_statistics_refresh(old_parent)
+    _schedule_statistics_refresh(event.category)
+
+
+@signals.attachments.folder_deleted.connect
+@signals.attachments.attachment_created.connect
+@signals.attachments.attachment_deleted.connect
+def _attachments_changed(obj, **kwargs):
+    folder = getattr(obj, 'folder', obj)
+    if folder.link_type != LinkType.category:
+        _schedule_statistics_refresh(folder.event.category)
+
+
+@listens_for(orm.Session, 'before_commit')
+def _refresh_statistics(sess):
+    from indico.modules.categories.models.statistics import CategoryStatistics
+    if not (pending := sess.info.pop('statistics_refresh', None)):
+        return
+    sess.flush()
+    CategoryStatistics.refresh({cat.id for cat in pending})
 
 
 def _is_moderation_visible(category):
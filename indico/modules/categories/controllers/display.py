@@ -16,7 +16,7 @@ from time import mktime
 import dateutil
 from dateutil.parser import ParserError
 from dateutil.relativedelta import relativedelta
-from flask import flash, jsonify, redirect, request, session
+from flask import current_app, flash, jsonify, redirect, request, session
 from pytz import utc
 from sqlalchemy.orm import joinedload, load_only, selectinload, subqueryload, undefer, undefer_group
 from webargs import fields, validate
@@ -30,13 +30,15 @@ from indico.modules.categories.controllers.util import (get_category_view_params
                                                         group_by_month, make_format_event_date_func,
                                                         make_happening_now_func, make_is_recent_func)
 from indico.modules.categories.models.categories import Category
-from indico.modules.categories.serialize import (serialize_categories_ical, serialize_category, serialize_category_atom,
-                                                 serialize_category_chain)
+from indico.modules.categories.models.effective_readers import get_event_access_prefilter
+from indico.modules.categories.serialize import (get_categories_ical_events, serialize_categories_ical,
+                                                 serialize_category, serialize_category_atom, serialize_category_chain)
 from indico.modules.categories.util import get_category_stats, get_upcoming_events
 from indico.modules.categories.views import WPCategory, WPCategoryCalendar
+from indico.modules.events.ical import get_events_ical_etag
 from indico.modules.events.management.settings import global_event_settings
 from indico.modules.events.models.events import Event
-from indico.modules.events.timetable.util import get_category_timetable
+from indico.modules.events.timetable.util import get_category_overview_timetable
 from indico.modules.news.util import get_recent_news
 from indico.modules.rb.models.locations import Location
 from indico.modules.users import User
@@ -89,12 +91,6 @@ class RHCategoryLogo(RHDisplayCategoryBase):
 class RHCategoryStatisticsJSON(RHDisplayCategoryBase):
     def _process(self):
         stats = get_category_stats(self.category.id)
-        if 'min_year' not in stats:
-            # in case the instance was freshly updated and still has data
-            # cached we need to invalidate it to avoid breaking the page
-            # TODO: remove this in 3.0; by then people had enough time to update to 2.3...
-            get_category_stats.clear_cached(self.category.id)
-            stats = get_category_stats(self.category.id)
         data = {
             'events': stats['events_by_year'],
             'contributions': stats['contribs_by_year'],
@@ -205,18 +201,20 @@ class RHCategoryManagedEventSearch(RHCategoryBase):
             .filter(Event.title_matches(q), ~Event.is_deleted)
             .options(load_only('id', 'title', 'start_dt', 'end_dt', 'category_id', 'category_chain', 'series_id'))
         )
-        # Prefer favorite events
-        query = query.order_by(Event.favorite_of.any(favorite_event_table.c.user_id == session.user.id).desc())
-        # Prefer exact matches and matches at the beginning, then order by event title
-        query = query.order_by(
+        order_by = (
+            # Prefer favorite events
+            Event.favorite_of.any(favorite_event_table.c.user_id == session.user.id).desc(),
+            # Prefer exact matches and matches at the beginning, then order by event title
             (db.func.lower(Event.title) == q).desc(),
             db.func.lower(Event.title).startswith(q).desc(),
             Event.start_dt,
             db.func.lower(Event.title),
+            Event.id,
         )
         events_per_page = 10
         # Try to load one extra event. This tells us if there are more events to load later
-        events = get_n_matching(query, events_per_page + 1, lambda event: event.can_manage(session.user), offset=offset)
+        events = get_n_matching(query, events_per_page + 1, lambda event: event.can_manage(session.user), offset=offset,
+                                order_by=order_by)
         return SeriesManagementSearchResultsSchema().jsonify({'events': events[:events_per_page],
                                                               'has_more': len(events) > events_per_page})
 
@@ -356,9 +354,17 @@ class RHShowPastEventsInCategory(RHShowEventsInCategoryBase):
 class RHExportCategoryICAL(RHDisplayCategoryBase):
     def _process(self):
         filename = f'{secure_filename(self.category.title, str(self.category.id))}-category.ics'
-        buf = serialize_categories_ical([self.category.id], session.user,
-                                        Event.end_dt >= (now_utc() - timedelta(weeks=4)))
-        return send_file(filename, buf, 'text/calendar')
+        events = get_categories_ical_events([self.category.id], session.user,
+                                            Event.end_dt >= (now_utc() - timedelta(weeks=4)))
+        # calendar clients poll this quite often, so avoid sending the same data again and again
+        etag = get_events_ical_etag(events, session.user)
+        if request.if_none_match.contains(etag):
+            rv = current_app.response_class(status=304)
+        else:
+            buf = serialize_categories_ical([self.category.id], session.user, events=events)
+            rv = send_file(filename, buf, 'text/calendar')
+        rv.set_etag(etag)
+        return rv
 
 
 class RHExportCategoryAtom(RHDisplayCategoryBase):
@@ -375,9 +381,7 @@ class RHCategoryOverview(RHDisplayCategoryBase):
     """Display the events for a particular day, week or month."""
 
     def _get_timetable(self):
-        return get_category_timetable([self.category.id], self.start_dt, self.end_dt,
-                                      detail_level=self.detail, tz=self.category.display_tzinfo,
-                                      from_categ=self.category, grouped=False)
+        return get_category_overview_timetable(self.category, self.start_dt, self.end_dt, detail_level=self.detail)
 
     @use_kwargs({
         'detail': fields.String(load_default='event', validate=validate.OneOf(['event', 'session', 'contribution'])),
@@ -526,8 +530,9 @@ class RHCategoryOverview(RHDisplayCategoryBase):
                                      in groupby(timetable_objects, key=lambda x: x.start_dt.astimezone(tzinfo).date())}
 
         # All the days of the event shown in the overview
-        event_days = self._get_days(max(self.start_dt, event.start_dt.astimezone(tzinfo)),
-                                    min(self.end_dt, event.end_dt.astimezone(tzinfo)))
+        first_dt = max(self.start_dt, event.start_dt.astimezone(tzinfo))
+        event_days = [first_dt if day == first_dt.date() else tzinfo.localize(datetime.combine(day, time()))
+                      for day in info['event_days'][event.id]]
 
         # Generate a proxy object with adjusted start_dt and timetable_objects for each day
         return [_EventProxy(event, day, tzinfo, timetable_objects_by_date.get(day.date(), [])) for day in event_days]
@@ -714,9 +719,9 @@ class RHCategoryRelativeEventBase(RHDisplayCategoryBase):
                  .filter(Event.is_visible_in(self.category.id),
                          filter_,
                          ~Event.is_deleted)
-                 .options(subqueryload('acl_entries'))
-                 .order_by(*order))
-        res = get_n_matching(query, 1, lambda event: event.can_access(session.user))
+                 .options(subqueryload('acl_entries')))
+        res = get_n_matching(query, 1, lambda event: event.can_access(session.user), order_by=order,
+                             prefilter=get_event_access_prefilter(session.user))
         if res:
             return res[0]
 
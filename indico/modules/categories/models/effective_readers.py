@@ -0,0 +1,209 @@
+# This file is part of Indico.
+# Copyright (C) 2002 - 2025 CERN
+#
+# Indico is free software; you can redistribute it and/or
+# modify it under the terms of the MIT License; see the
+# LICENSE file for more details.
+
+from sqlalchemy.dialects.postgresql import array
+
+from indico.core import signals
+from indico.core.config import config
+from indico.core.db import db
+from indico.core.db.sqlalchemy import PyIntEnum
+from indico.core.db.sqlalchemy.principals import PrincipalType
+from indico.core.db.sqlalchemy.protection import ProtectionMode
+from indico.util.string import format_repr
+
+
+class CategoryEffectiveReader(db.Model):
+    """A principal that can access a category.
+
+    This is a denormalized version of the category ACLs which takes into
+    account the protection of the parent categories, so it can be used to
+    filter out inaccessible categories and events in SQL.
+
+    For each category, it contains all principals with management access
+    to the category or any of its parents, and, if the category is
+    protected, all principals from the ACLs of the category and its parents
+    up to the category it inherits its protection from.
+
+    Only users and local groups are stored with their ID, since only those
+    can be resolved in SQL.  For any other principal type, a single entry
+    without an ID is stored to indicate that the category may be accessible
+    for some users and a proper access check needs to be performed.
+    """
+
+    __tablename__ = 'effective_readers'
+    __table_args__ = (db.Index(None, 'category_id', 'type', 'user_id', 'local_group_id'),
+                      {'schema': 'categories'})
+
+    id = db.Column(
+        db.Integer,
+        primary_key=True
+    )
+    category_id = db.Column(
+        db.Integer,
+        db.ForeignKey('categories.categories.id'),
+        nullable=False,
+        index=True
+    )
+    type = db.Column(
+        PyIntEnum(PrincipalType),
+        nullable=False
+    )
+    user_id = db.Column(
+        db.Integer,
+        nullable=True,
+        index=True
+    )
+    local_group_id = db.Column(
+        db.Integer,
+        nullable=True,
+        index=True
+    )
+    #: Whether the principal has management access to the category,
+    #: which also grants access to protected events inside it
+    is_manager = db.Column(
+        db.Boolean,
+        nullable=False
+    )
+
+    def __repr__(self):
+        return format_repr(self, 'id', 'category_id', 'type', user_id=None, local_group_id=None, is_manager=False)
+
+    @classmethod
+    def refresh(cls, category_ids=None):
+        """Recalculate the effective readers.
+
+        :param category_ids: The IDs of categories whose effective readers
+                             (including those of their subcategories) have
+                             to be updated.  If omitted, all effective readers
+                             are recalculated.
+        """
+        from indico.modules.categories.models.categories import Category
+        from indico.modules.categories.models.principals import CategoryPrincipal
+
+        cat = db.aliased(Category)
+        # the tree contains the full chain of each category (needed to check for managers)
+        # and the chain up to the category it inherits its protection from (`read_path`)
+        tree = (db.select([cat.id,
+                           array([cat.id]).label('path'),
+                           array([cat.id]).label('read_path'),
+                           (cat.protection_mode == ProtectionMode.protected).label('protected')])
+                .where(cat.parent_id.is_(None))
+                .cte(recursive=True))
+        tree = tree.union_all(
+            db.select([cat.id,
+                       tree.c.path.op('||')(cat.id),
+                       db.case({ProtectionMode.inheriting.value: tree.c.read_path.op('||')(cat.id)},
+                               else_=array([cat.id]), value=cat.protection_mode),
+                       db.case({ProtectionMode.inheriting.value: tree.c.protected},
+                               else_=(cat.protection_mode == ProtectionMode.protected), value=cat.protection_mode)])
+            .where(cat.parent_id == tree.c.id)
+        )
+
+        principal = db.aliased(CategoryPrincipal)
+        in_read_path = principal.category_id == db.func.any(tree.c.read_path)
+        user_id = db.case({PrincipalType.user.value: principal.user_id}, value=principal.type)
+        local_group_id = db.case({PrincipalType.local_group.value: principal.local_group_id}, value=principal.type)
+        query = (db.select([tree.c.id, principal.type, user_id, local_group_id,
+                            db.func.bool_or(principal.full_access)])
+                 .select_from(tree.join(principal, principal.category_id == db.func.any(tree.c.path)))
+                 .where(principal.full_access | (tree.c.protected & in_read_path))
+                 .group_by(tree.c.id, principal.type, user_id, local_group_id))
+
+        delete = cls.__table__.delete()
+        if category_ids is not None:
+            category_ids = list(category_ids)
+            if not category_ids:
+                return
+            query = query.where(tree.c.path.overlap(array(category_ids)))
+            subtree = Category.get_subtree_ids_cte(category_ids)
+            delete = delete.where(cls.category_id.in_(db.select([subtree.c.id])))
+
+        db.session.execute(delete)
+        db.session.execute(cls.__table__.insert().from_select(
+            ['category_id', 'type', 'user_id', 'local_group_id', 'is_manager'], query
+        ))
+
+
+def get_principal_user_filter(principal_cls, user, *, exact=False):
+    """Get a filter for principals which may contain the user.
+
+    Users and local groups are checked directly; any other principal type
+    matches since its membership cannot be checked in SQL.
+
+    :param principal_cls: A principal model (or the effective readers
+                          model) to get the filter for
+    :param user: A :class:`.User` or ``None``
+    :param exact: Whether to only match principals which are known to
+                  contain the user, i.e. users and local groups
+    """
+    criteria = [] if exact else [principal_cls.type.notin_([PrincipalType.user, PrincipalType.local_group])]
+    if user is not None:
+        criteria.append((principal_cls.type == PrincipalType.user) & (principal_cls.user_id == user.id))
+        if config.LOCAL_GROUPS and (group_ids := {group.id for group in user.local_groups}):
+            criteria.append((principal_cls.type == PrincipalType.local_group) &
+                            principal_cls.local_group_id.in_(group_ids))
+    return db.or_(*criteria) if criteria else db.false()
+
+
+def has_access_override(cls):
+    """Check whether plugins may override access checks of a model.
+
+    Plugins may grant or deny access to objects regardless of their ACLs,
+    so in that case access cannot be determined in SQL.
+    """
+    return any(signals.acl.can_access.receivers_for(cls))
+
+
+def get_category_access_prefilter(user):
+    """Get a criterion matching categories the user can certainly access.
+
+    This is meant to be used as the `prefilter` of
+    :func:`~indico.core.db.sqlalchemy.util.queries.get_n_matching` so the
+    access of the user only needs to be checked in Python for the
+    categories not matching it.
+
+    :param user: A :class:`.User` or ``None``
+    :return: A SQL criterion or ``None`` if access cannot be checked in SQL
+    """
+    from indico.modules.categories.models.categories import Category
+    if has_access_override(Category):
+        return None
+    readers = (db.select([1])
+               .where(CategoryEffectiveReader.category_id == Category.id,
+                      get_principal_user_filter(CategoryEffectiveReader, user, exact=True))
+               .correlate(Category))
+    return (Category.effective_protection_mode == ProtectionMode.public) | readers.exists()
+
+
+def get_event_access_prefilter(user):
+    """Get a criterion matching events the user can certainly access.
+
+    This is the same as :func:`get_category_access_prefilter` but for
+    events.  Events are accessible if they are public, if the user is in
+    their ACL, or if they inherit their protection from a category the
+    user can access (or manage, in case of protected events).
+
+    :param user: A :class:`.User` or ``None``
+    :return: A SQL criterion or ``None`` if access cannot be checked in SQL
+    """
+    from indico.modules.categories.models.categories import Category
+    from indico.modules.events.models.events import Event
+    from indico.modules.events.models.principals import EventPrincipal
+    if has_access_override(Event) or has_access_override(Category):
+        return None
+    readers = (db.select([1])
+               .where(CategoryEffectiveReader.category_id == Event.category_id,
+                      CategoryEffectiveReader.is_manager | (Event.protection_mode == ProtectionMode.inheriting),
+                      get_principal_user_filter(CategoryEffectiveReader, user, exact=True))
+               .correlate(Event))
+    event_acl = (db.select([1])
+                 .where(EventPrincipal.event_id == Event.id,
+                        get_principal_user_filter(EventPrincipal, user, exact=True))
+                 .correlate(Event))
+    return db.or_(Event.effective_protection_mode == ProtectionMode.public,
+                  event_acl.exists(),
+                  readers.exists())
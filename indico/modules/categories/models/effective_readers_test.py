@@ -0,0 +1,118 @@
+# This file is part of Indico.
+# Copyright (C) 2002 - 2025 CERN
+#
+# Indico is free software; you can redistribute it and/or
+# modify it under the terms of the MIT License; see the
+# LICENSE file for more details.
+
+import pytest
+
+from indico.core import signals
+from indico.core.db.sqlalchemy.protection import ProtectionMode
+from indico.modules.categories import Category, _refresh_effective_readers
+from indico.modules.categories.models.effective_readers import (CategoryEffectiveReader, get_category_access_prefilter,
+                                                                get_event_access_prefilter, get_principal_user_filter)
+from indico.modules.events import Event
+
+
+def _get_accessible_ids(user):
+    readers = (CategoryEffectiveReader.query
+               .filter(CategoryEffectiveReader.category_id == Category.id,
+                       get_principal_user_filter(CategoryEffectiveReader, user))
+               .correlate(Category))
+    query = Category.query.filter((Category.effective_protection_mode == ProtectionMode.public) | readers.exists())
+    return {cat.id for cat in query}
+
+
+@pytest.fixture
+def category_tree(db, create_category, create_user, create_group):
+    users = {n: create_user(n) for n in range(1, 6)}
+    group = create_group(1)
+    group.group.members.add(users[5])
+    cats = {}
+    cats[1] = create_category(1, protection_mode=ProtectionMode.protected)
+    cats[2] = create_category(2, parent=cats[1])
+    cats[3] = create_category(3, parent=cats[2])
+    cats[4] = create_category(4, parent=cats[1], protection_mode=ProtectionMode.protected)
+    cats[5] = create_category(5, parent=cats[1], protection_mode=ProtectionMode.public)
+    cats[6] = create_category(6, parent=cats[4])
+    cats[7] = create_category(7, protection_mode=ProtectionMode.protected)
+    cats[1].update_principal(users[1], read_access=True)
+    cats[2].update_principal(users[2], read_access=True)
+    cats[1].update_principal(users[3], full_access=True)
+    cats[6].update_principal(users[4], permissions={'create'})
+    cats[4].update_principal(group, read_access=True)
+    db.session.flush()
+    db.session.info.pop('effective_readers_refresh', None)
+    return cats, users
+
+
+@pytest.mark.parametrize('refresh_all', (False, True))
+def test_effective_readers(db, category_tree, refresh_all):
+    __, users = category_tree
+    CategoryEffectiveReader.refresh(None if refresh_all else [0])
+    for user in (None, *users.values()):
+        expected = {cat.id for cat in Category.query if cat.can_access(user, allow_admin=False)}
+        assert _get_accessible_ids(user) == expected
+
+
+def test_effective_readers_refresh_subtree(db, category_tree):
+    cats, users = category_tree
+    CategoryEffectiveReader.refresh()
+    # users[2] can access category 3 since it inherits the protection of category 2
+    assert 3 in _get_accessible_ids(users[2])
+    assert 3 not in _get_accessible_ids(users[4])
+    cats[3].protection_mode = ProtectionMode.protected
+    cats[3].update_principal(users[4], read_access=True)
+    db.session.flush()
+    # only updating an unrelated subtree does nothing
+    CategoryEffectiveReader.refresh([7])
+    assert 3 in _get_accessible_ids(users[2])
+    assert 3 not in _get_accessible_ids(users[4])
+    CategoryEffectiveReader.refresh([cats[2].id])
+    assert 3 not in _get_accessible_ids(users[2])
+    assert 3 in _get_accessible_ids(users[4])
+    for user in (None, *users.values()):
+        expected = {cat.id for cat in Category.query if cat.can_access(user, allow_admin=False)}
+        assert _get_accessible_ids(user) == expected
+
+
+def test_effective_readers_scheduled_refresh(db, category_tree):
+    cats, users = category_tree
+    CategoryEffectiveReader.refresh()
+    cats[7].update_principal(users[2], read_access=True)
+    assert 7 not in _get_accessible_ids(users[2])
+    assert db.session.info['effective_readers_refresh'] == {cats[7]}
+    # this is triggered on commit, which is not possible in tests
+    _refresh_effective_readers(db.session())
+    assert 7 in _get_accessible_ids(users[2])
+    assert 'effective_readers_refresh' not in db.session.info
+
+
+def test_access_prefilters(db, category_tree, create_event):
+    cats, users = category_tree
+    events = [
+        create_event(category=cats[3]),
+        create_event(category=cats[4]),
+        create_event(category=cats[4], protection_mode=ProtectionMode.protected),
+        create_event(category=cats[5], protection_mode=ProtectionMode.protected),
+        create_event(category=cats[7], protection_mode=ProtectionMode.public),
+    ]
+    events[3].update_principal(users[4], read_access=True)
+    cats[4].update_principal(users[2], full_access=True)
+    db.session.flush()
+    CategoryEffectiveReader.refresh()
+    for user in (None, *users.values()):
+        # users and local groups can be fully resolved in SQL
+        expected = {cat.id for cat in Category.query if cat.can_access(user, allow_admin=False)}
+        assert {cat.id for cat in Category.query.filter(get_category_access_prefilter(user))} == expected
+        expected = {event.id for event in events if event.can_access(user, allow_admin=False)}
+        query = Event.query.filter(Event.id.in_(e.id for e in events), get_event_access_prefilter(user))
+        assert {event.id for event in query} == expected
+
+
+def test_access_prefilters_override(db, category_tree):
+    assert get_category_access_prefilter(None) is not None
+    with signals.acl.can_access.connected_to(lambda *a, **kw: None, sender=Category):
+        assert get_category_access_prefilter(None) is None
+        assert get_event_access_prefilter(None) is None
@@ -7,6 +7,7 @@
 
 from indico.core.db import db
 from indico.core.db.sqlalchemy.principals import PrincipalType
+from indico.modules.users.memberships import get_principal_memberships
 from indico.util.locators import locator_property
 from indico.util.string import format_repr
 
@@ -72,7 +73,7 @@ class CategoryRole(db.Model):
     # - in_track_acls (TrackPrincipal.category_role)
 
     def __contains__(self, user):
-        return user is not None and self in user.category_roles
+        return user is not None and self.id in get_principal_memberships(user).category_roles
 
     def __repr__(self):
         return format_repr(self, 'id', 'code', _text=self.name)
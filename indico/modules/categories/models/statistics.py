@@ -0,0 +1,229 @@
+# This file is part of Indico.
+# Copyright (C) 2002 - 2025 CERN
+#
+# Indico is free software; you can redistribute it and/or
+# modify it under the terms of the MIT License; see the
+# LICENSE file for more details.
+
+from collections import defaultdict
+from itertools import batched
+
+from sqlalchemy.dialects.postgresql import insert
+
+from indico.core.db import db
+from indico.util.string import format_repr
+
+
+#: The counters stored for each category and year
+COUNTERS = ('events', 'contributions', 'attachments', 'created_events')
+
+
+class CategoryStatistics(db.Model):
+    """The statistics of a category for a given year.
+
+    The ``events``, ``contributions``, ``attachments`` and
+    ``created_events`` columns contain the counts for the category
+    including all its subcategories, so the statistics of any category
+    can be retrieved without having to look at its subtree.  The same
+    counts for the objects directly inside the category are stored in
+    the ``own_*`` columns; they are used to calculate how much the
+    totals of the parent categories need to change whenever the counts
+    of a category are refreshed.
+
+    Events are counted in the year they start, contributions in the year
+    they are scheduled, attachments in the year their event starts, and
+    ``created_events`` counts the events in the year they were created.
+    """
+
+    __tablename__ = 'statistics'
+    __table_args__ = {'schema': 'categories'}
+
+    category_id = db.Column(
+        db.Integer,
+        db.ForeignKey('categories.categories.id'),
+        primary_key=True
+    )
+    year = db.Column(
+        db.Integer,
+        primary_key=True
+    )
+    events = db.Column(db.Integer, nullable=False, default=0)
+    contributions = db.Column(db.Integer, nullable=False, default=0)
+    attachments = db.Column(db.Integer, nullable=False, default=0)
+    created_events = db.Column(db.Integer, nullable=False, default=0)
+    own_events = db.Column(db.Integer, nullable=False, default=0)
+    own_contributions = db.Column(db.Integer, nullable=False, default=0)
+    own_attachments = db.Column(db.Integer, nullable=False, default=0)
+    own_created_events = db.Column(db.Integer, nullable=False, default=0)
+
+    def __repr__(self):
+        return format_repr(self, 'category_id', 'year', 'events', 'contributions', 'attachments')
+
+    @classmethod
+    def refresh(cls, category_ids=None):
+        """Recalculate the statistics of categories.
+
+        Only the objects directly inside the given categories are
+        counted again; the difference to the previously stored counts
+        is then added to the totals of the categories and all their
+        parents.
+
+        :param category_ids: The IDs of categories whose content changed.
+                             If omitted, all statistics are rebuilt from
+                             scratch.
+        """
+        from indico.modules.categories.models.categories import Category
+
+        if category_ids is None:
+            db.session.execute(cls.__table__.delete())
+            old_counts = {}
+        else:
+            category_ids = set(category_ids)
+            if not category_ids:
+                return
+            # lock the categories so concurrent refreshes of the same category
+            # cannot both apply the same difference to the totals
+            db.session.query(Category.id).filter(Category.id.in_(category_ids)).with_for_update().all()
+            query = (db.session.query(cls.category_id, cls.year, *(getattr(cls, f'own_{c}') for c in COUNTERS))
+                     .filter(cls.category_id.in_(category_ids)))
+            old_counts = {(category_id, year): tuple(counts) for category_id, year, *counts in query}
+
+        new_counts = _get_own_counts(category_ids)
+        changes = {}
+        for key in old_counts.keys() | new_counts.keys():
+            old = old_counts.get(key, (0,) * len(COUNTERS))
+            new = new_counts.get(key, (0,) * len(COUNTERS))
+            if old != new:
+                changes[key] = [n - o for n, o in zip(new, old, strict=True)]
+        if not changes:
+            return
+
+        chains = db.session.query(Category.id, Category.chain_ids)
+        if category_ids is not None:
+            chains = chains.filter(Category.id.in_(category_ids))
+        chains = dict(chains)
+        rows = defaultdict(lambda: [0] * (2 * len(COUNTERS)))
+        for (category_id, year), diff in changes.items():
+            rows[(category_id, year)][len(COUNTERS):] = diff
+            for parent_id in chains[category_id]:
+                row = rows[(parent_id, year)]
+                row[:len(COUNTERS)] = [a + b for a, b in zip(row[:len(COUNTERS)], diff, strict=True)]
+        cls._apply_changes(rows)
+        if category_ids is not None:
+            cls._delete_empty({category_id for category_id, __ in rows})
+
+    @classmethod
+    def move_subtree(cls, category, old_parent):
+        """Update the totals of the parents of a category after moving it.
+
+        The totals of the moved category are subtracted from its previous
+        parent categories and added to the new ones.
+
+        :param category: The category which has been moved
+        :param old_parent: The category's previous parent category
+        """
+        from indico.modules.categories.models.categories import Category
+
+        query = db.session.query(Category.chain_ids)
+        old_chain = set(query.filter(Category.id == old_parent.id).scalar())
+        new_chain = set(query.filter(Category.id == category.parent_id).scalar())
+        totals = (db.session.query(cls.year, *(getattr(cls, c) for c in COUNTERS))
+                  .filter(cls.category_id == category.id)
+                  .all())
+        rows = {}
+        for year, *counts in totals:
+            for parent_id in old_chain - new_chain:
+                rows[(parent_id, year)] = [-n for n in counts] + [0] * len(COUNTERS)
+            for parent_id in new_chain - old_chain:
+                rows[(parent_id, year)] = counts + [0] * len(COUNTERS)
+        cls._apply_changes(rows)
+        cls._delete_empty(old_chain - new_chain)
+
+    @classmethod
+    def _apply_changes(cls, rows):
+        columns = [*COUNTERS, *(f'own_{c}' for c in COUNTERS)]
+        # always lock the rows in the same order, otherwise concurrent updates
+        # of sibling categories (sharing their parents) may deadlock
+        for chunk in batched(sorted(rows.items()), 1000):
+            stmt = insert(cls.__table__).values([{'category_id': category_id, 'year': year,
+                                                   **dict(zip(columns, values, strict=True))}
+                                                  for (category_id, year), values in chunk])
+            stmt = stmt.on_conflict_do_update(
+                index_elements=[cls.category_id, cls.year],
+                set_={col: cls.__table__.c[col] + stmt.excluded[col] for col in columns}
+            )
+            db.session.execute(stmt)
+
+    @classmethod
+    def _delete_empty(cls, category_ids):
+        if not category_ids:
+            return
+        db.session.execute(cls.__table__.delete()
+                           .where(cls.category_id.in_(category_ids),
+                                  *(getattr(cls, c) == 0 for c in COUNTERS)))
+
+
+def _get_own_counts(category_ids=None):
+    """Count the objects directly inside categories by year.
+
+    :param category_ids: The IDs of the categories to count, or ``None``
+                         to count all categories.
+    :return: A dict mapping ``(category_id, year)`` tuples to a tuple
+             with the counts of each of the :data:`COUNTERS`.
+    """
+    from indico.core.db.sqlalchemy.links import LinkType
+    from indico.modules.attachments.models.attachments import Attachment
+    from indico.modules.attachments.models.folders import AttachmentFolder
+    from indico.modules.events.contributions.models.contributions import Contribution
+    from indico.modules.events.contributions.models.subcontributions import SubContribution
+    from indico.modules.events.models.events import Event
+    from indico.modules.events.sessions.models.sessions import Session
+    from indico.modules.events.timetable.models.entries import TimetableEntry, TimetableEntryType
+
+    def _year(column):
+        return db.cast(db.extract('year', column), db.Integer)
+
+    if category_ids is None:
+        category_filter = Event.category_id.isnot(None)
+    else:
+        category_filter = Event.category_id.in_(category_ids)
+
+    events = (db.session.query(Event.category_id, _year(Event.start_dt), db.func.count())
+              .filter(~Event.is_deleted, category_filter)
+              .group_by(Event.category_id, _year(Event.start_dt)))
+    contributions = (db.session.query(Event.category_id, _year(TimetableEntry.start_dt), db.func.count())
+                     .select_from(TimetableEntry)
+                     .join(TimetableEntry.event)
+                     .filter(TimetableEntry.type == TimetableEntryType.CONTRIBUTION,
+                             ~Event.is_deleted,
+                             category_filter)
+                     .group_by(Event.category_id, _year(TimetableEntry.start_dt)))
+    subcontrib_contrib = db.aliased(Contribution)
+    attachments = (db.session.query(Event.category_id, _year(Event.start_dt), db.func.count(Attachment.id))
+                   .select_from(Attachment)
+                   .join(Attachment.folder)
+                   .join(AttachmentFolder.event)
+                   .outerjoin(AttachmentFolder.session)
+                   .outerjoin(AttachmentFolder.contribution)
+                   .outerjoin(AttachmentFolder.subcontribution)
+                   .outerjoin(subcontrib_contrib, subcontrib_contrib.id == SubContribution.contribution_id)
+                   .filter(AttachmentFolder.link_type != LinkType.category,
+                           ~Attachment.is_deleted,
+                           ~AttachmentFolder.is_deleted,
+                           ~Event.is_deleted,
+                           # we have exactly one of those or none if the attachment is on the event itself
+                           ~db.func.coalesce(Session.is_deleted, Contribution.is_deleted, SubContribution.is_deleted,
+                                             False),
+                           # in case of a subcontribution we also need to check that the contrib is not deleted
+                           (subcontrib_contrib.is_deleted.is_(None) | ~subcontrib_contrib.is_deleted),
+                           category_filter)
+                   .group_by(Event.category_id, _year(Event.start_dt)))
+    created_events = (db.session.query(Event.category_id, _year(Event.created_dt), db.func.count())
+                      .filter(~Event.is_deleted, category_filter)
+                      .group_by(Event.category_id, _year(Event.created_dt)))
+
+    counts = defaultdict(lambda: [0] * len(COUNTERS))
+    for i, query in enumerate((events, contributions, attachments, created_events)):
+        for category_id, year, count in query:
+            counts[(category_id, year)][i] = count
+    return {key: tuple(values) for key, values in counts.items()}
@@ -0,0 +1,91 @@
+# This file is part of Indico.
+# Copyright (C) 2002 - 2025 CERN
+#
+# Indico is free software; you can redistribute it and/or
+# modify it under the terms of the MIT License; see the
+# LICENSE file for more details.
+
+from datetime import datetime
+
+import pytest
+from pytz import utc
+
+from indico.modules.categories import Category, _refresh_statistics, _schedule_statistics_refresh
+from indico.modules.categories.models.statistics import CategoryStatistics
+from indico.modules.categories.util import get_category_stats
+
+
+def _dt(year):
+    return datetime(year, 6, 1, 12, 0, tzinfo=utc)
+
+
+def _get_counts(category):
+    stats = get_category_stats(category.id)
+    return stats['events_by_year'], stats['contribs_by_year']
+
+
+@pytest.fixture
+def category_tree(db, create_category, create_event, create_contribution, create_timetable_entry):
+    cats = {}
+    cats[1] = create_category(1)
+    cats[2] = create_category(2, parent=cats[1])
+    cats[3] = create_category(3)
+    create_event(category=cats[1], start_dt=_dt(2021), end_dt=_dt(2021))
+    event = create_event(category=cats[2], start_dt=_dt(2020), end_dt=_dt(2020))
+    create_timetable_entry(event, create_contribution(event, 'Contribution'), _dt(2020))
+    create_event(category=cats[3], start_dt=_dt(2020), end_dt=_dt(2020))
+    db.session.flush()
+    db.session.info.pop('statistics_refresh', None)
+    CategoryStatistics.refresh()
+    return cats
+
+
+def test_category_statistics(category_tree):
+    cats = category_tree
+    root = Category.get_root()
+    assert _get_counts(root) == ({2020: 2, 2021: 1}, {2020: 1})
+    assert _get_counts(cats[1]) == ({2020: 1, 2021: 1}, {2020: 1})
+    assert _get_counts(cats[2]) == ({2020: 1}, {2020: 1})
+    assert _get_counts(cats[3]) == ({2020: 1}, {})
+
+
+def test_category_statistics_scheduled_refresh(db, category_tree, create_event):
+    cats = category_tree
+    root = Category.get_root()
+    event = create_event(category=cats[2], start_dt=_dt(2019), end_dt=_dt(2019))
+    cats[3].events[0].is_deleted = True
+    _schedule_statistics_refresh(cats[2])
+    _schedule_statistics_refresh(cats[3])
+    _schedule_statistics_refresh(None)
+    assert db.session.info['statistics_refresh'] == {cats[2], cats[3]}
+    # this is triggered on commit, which is not possible in tests
+    _refresh_statistics(db.session())
+    assert 'statistics_refresh' not in db.session.info
+    assert _get_counts(root) == ({2019: 1, 2020: 1, 2021: 1}, {2020: 1})
+    assert _get_counts(cats[1]) == ({2019: 1, 2020: 1, 2021: 1}, {2020: 1})
+    assert _get_counts(cats[3]) == ({}, {})
+    # the rows of categories which no longer contain anything are removed
+    assert not CategoryStatistics.query.filter_by(category_id=cats[3].id).has_rows()
+    # refreshing without changes does nothing
+    CategoryStatistics.refresh([cats[2].id])
+    assert _get_counts(cats[2]) == ({2019: 1, 2020: 1}, {2020: 1})
+    event.start_dt = _dt(2022)
+    event.end_dt = _dt(2022)
+    db.session.flush()
+    CategoryStatistics.refresh([cats[2].id])
+    assert _get_counts(cats[1]) == ({2020: 1, 2021: 1, 2022: 1}, {2020: 1})
+
+
+def test_category_statistics_move_subtree(db, category_tree):
+    cats = category_tree
+    root = Category.get_root()
+    cats[2].parent = cats[3]
+    db.session.flush()
+    CategoryStatistics.move_subtree(cats[2], cats[1])
+    assert _get_counts(root) == ({2020: 2, 2021: 1}, {2020: 1})
+    assert _get_counts(cats[1]) == ({2021: 1}, {})
+    assert _get_counts(cats[3]) == ({2020: 2}, {2020: 1})
+    # the totals match the ones calculated from scratch
+    rows = {(s.category_id, s.year): s.events for s in CategoryStatistics.query}
+    CategoryStatistics.refresh()
+    assert {(s.category_id, s.year): s.events for s in CategoryStatistics.query} == rows
@@ -18,8 +18,8 @@ from indico.modules.events.settings import event_contact_settings
 from indico.util.string import sanitize_html
 
 
-def serialize_categories_ical(category_ids, user, event_filter=True, event_filter_fn=None, update_query=None):
-    """Export the events in a category to iCal.
+def get_categories_ical_events(category_ids, user, event_filter=True, event_filter_fn=None, update_query=None):
+    """Get the events in a category to export to iCal.
 
     :param category_ids: Category IDs to export
     :param user: The user who needs to be able to access the events
@@ -29,6 +29,7 @@ def serialize_categories_ical(category_ids, user, event_filter=True, event_filte
     :param event_filter_fn: A callable that determines which events to include (after querying)
     :param update_query: A callable that can update the query used to retrieve the events.
                          Must return the updated query object.
+    :return: A list of the events the user can access
     """
     own_room_strategy = joinedload('own_room')
     own_room_strategy.load_only('location_id', 'site', 'building', 'floor', 'number', 'verbose_name')
@@ -61,8 +62,30 @@ def serialize_categories_ical(category_ids, user, event_filter=True, event_filte
                       .options(load_only('id', 'parent_id', 'protection_mode'),
                                joinedload('acl_entries'))
                       .all())
+    return [e for e in events if e.can_access(user)]
+
+
+def serialize_categories_ical(category_ids, user, event_filter=True, event_filter_fn=None, update_query=None, *,
+                              events=None):
+    """Export the events in a category to iCal.
 
-    return BytesIO(events_to_ical(events, user))
+    The serialized events are cached, so only events which changed
+    since the last export need to be serialized again.
+
+    :param category_ids: Category IDs to export
+    :param user: The user who needs to be able to access the events
+    :param event_filter: A SQLalchemy criterion to restrict which
+                         events will be returned.  Usually something
+                         involving the start/end date of the event.
+    :param event_filter_fn: A callable that determines which events to include (after querying)
+    :param update_query: A callable that can update the query used to retrieve the events.
+                         Must return the updated query object.
+    :param events: The events to export if they have already been
+                   retrieved using :func:`get_categories_ical_events`
+    """
+    if events is None:
+        events = get_categories_ical_events(category_ids, user, event_filter, event_filter_fn, update_query)
+    return BytesIO(events_to_ical(events, user, use_cache=True))
 
 
 def serialize_category_atom(category, url, user, event_filter):
@@ -63,7 +63,7 @@ class CategorySettingsProxy(SettingsProxyBase):
         """
         self._check_name(name)
         CategorySetting.set(self.module, name, self._convert_from_python(name, value), category_id=category)
-        self._flush_cache()
+        self._flush_cache(category_id=category)
 
     @_category_or_id
     def set_multi(self, category, items):
@@ -74,7 +74,7 @@ class CategorySettingsProxy(SettingsProxyBase):
         """
         items = {k: self._convert_from_python(k, v) for k, v in items.items()}
         CategorySetting.set_multi(self.module, items, category_id=category)
-        self._flush_cache()
+        self._flush_cache(category_id=category)
 
     @_category_or_id
     def delete(self, category, *names):
@@ -84,7 +84,7 @@ class CategorySettingsProxy(SettingsProxyBase):
         :param names: One or more names of settings to delete
         """
         CategorySetting.delete(self.module, *names, category_id=category)
-        self._flush_cache()
+        self._flush_cache(category_id=category)
 
     @_category_or_id
     def delete_all(self, category):
@@ -93,4 +93,4 @@ class CategorySettingsProxy(SettingsProxyBase):
         :param category: Category (or its ID)
         """
         CategorySetting.delete_all(self.module, category_id=category)
-        self._flush_cache()
+        self._flush_cache(category_id=category)
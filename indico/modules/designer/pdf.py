@@ -5,8 +5,10 @@
 # modify it under the terms of the MIT License; see the
 # LICENSE file for more details.
 
+import math
 import re
 from collections import namedtuple
+from functools import lru_cache
 from io import BytesIO
 
 from PIL import Image
@@ -46,6 +48,8 @@ ALIGNMENTS = {
 
 PIXELS_CM = 50
 FONT_SIZE_RE = re.compile(r'(\d+)(pt)?')
+MIN_FONT_SIZE = 6
+FONT_SIZE_STEP = 0.25
 
 TplData = namedtuple('TplData', ['width', 'height', 'items', 'background_position', 'width_cm', 'height_cm'])
 
@@ -54,6 +58,30 @@ def _extract_font_size(text):
     return int(FONT_SIZE_RE.match(text).group(1))
 
 
+@lru_cache(maxsize=4096)
+def fit_font_size(content, font_size, font_name, width):
+    """Get the largest font size at which a string fits into a given width.
+
+    The font size is reduced in steps of 0.25pt, but never below 6pt.
+
+    :param content: The string to fit
+    :param font_size: The preferred font size
+    :param font_name: The name of the font
+    :param width: The available width in points
+    """
+    if font_size <= MIN_FONT_SIZE:
+        return font_size
+    text_width = stringWidth(content, font_name, font_size)
+    if text_width <= width:
+        return font_size
+    # the width of a string is proportional to its font size, so we know the
+    # exact size at which it fits without measuring it again for every step
+    fitting_size = max(MIN_FONT_SIZE, font_size * width / text_width)
+    # the epsilon avoids an extra step due to rounding errors
+    steps = math.ceil((font_size - fitting_size) / FONT_SIZE_STEP - 1e-9)
+    return font_size - steps * FONT_SIZE_STEP
+
+
 class DesignerPDFBase:
     placeholders_context = 'designer-fields'
 
@@ -68,6 +96,7 @@ class DesignerPDFBase:
         if self.config.page_orientation == PageOrientation.landscape:
             self.page_size = pagesizes.landscape(self.page_size)
         self.width, self.height = self.page_size
+        self._background_images = {}
         setTTFonts()
 
     def _process_tpl_data(self, tpl_data):
@@ -89,6 +118,21 @@ class DesignerPDFBase:
         fd.seek(0)
         return fd
 
+    def _get_background_image(self, template):
+        """Get an image reader for the background image of a template.
+
+        The image is only loaded and processed once, no matter on how many
+        badges/pages it is used.
+        """
+        try:
+            return self._background_images[template.id]
+        except KeyError:
+            pass
+        with template.background_image.open() as f:
+            data = BytesIO(self._remove_transparency(f).read())
+        reader = self._background_images[template.id] = ImageReader(data)
+        return reader
+
     def get_pdf(self):
         data = BytesIO()
         canvas = Canvas(data, pagesize=self.page_size)
@@ -108,11 +152,7 @@ class DesignerPDFBase:
 
     def _get_resized_font(self, content, font_size, font_name, width):
         content = str(content)  # resolve LazyString
-        min_font_size = 6
-        resized_font = font_size
-        item_width = width / PIXELS_CM * cm
-        while resized_font > min_font_size and item_width < stringWidth(content, font_name, resized_font):
-            resized_font -= 0.25
+        resized_font = fit_font_size(content, font_size, font_name, width / PIXELS_CM * cm)
         return {'fontSize': resized_font, 'leading': resized_font}
 
     def _draw_item(self, canvas, item, tpl_data, content, margin_x, margin_y):
@@ -0,0 +1,34 @@
+# This file is part of Indico.
+# Copyright (C) 2002 - 2025 CERN
+#
+# Indico is free software; you can redistribute it and/or
+# modify it under the terms of the MIT License; see the
+# LICENSE file for more details.
+
+import pytest
+from reportlab.pdfbase.pdfmetrics import stringWidth
+
+from indico.modules.designer.pdf import fit_font_size
+
+
+def _fit_font_size_iteratively(content, font_size, font_name, width):
+    while font_size > 6 and width < stringWidth(content, font_name, font_size):
+        font_size -= 0.25
+    return font_size
+
+
+@pytest.mark.parametrize('font_name', ('Times-Roman', 'Courier-Bold'))
+@pytest.mark.parametrize('content', ('', 'CERN', 'European Organization for Nuclear Research',
+                                     'Université de Genève'))
+@pytest.mark.parametrize('font_size', (5, 6, 12, 24))
+@pytest.mark.parametrize('width', (10, 50, 123.45, 300))
+def test_fit_font_size(content, font_size, font_name, width):
+    assert fit_font_size(content, font_size, font_name, width) == _fit_font_size_iteratively(content, font_size,
+                                                                                            font_name, width)
+
+
+@pytest.mark.parametrize('size', (6.25, 7, 10.5, 24))
+def test_fit_font_size_exact(size):
+    # a string fitting exactly at one of the steps must not be made smaller
+    content = 'European Organization for Nuclear Research'
+    assert fit_font_size(content, 30, 'Times-Roman', stringWidth(content, 'Times-Roman', size)) == size
@@ -53,6 +53,11 @@ event_management_object_url_prefixes = {
 signals.acl.entry_changed.connect(make_acl_log_fn(Event, EventLogRealm.management), sender=Event, weak=False)
 
 
+@signals.core.import_tasks.connect
+def _import_tasks(sender, **kwargs):
+    import indico.modules.events.tasks  # noqa: F401
+
+
 @signals.users.merged.connect
 def _merge_users(target, source, **kwargs):
     from indico.modules.events.models.persons import EventPerson
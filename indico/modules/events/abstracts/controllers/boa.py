@@ -14,7 +14,7 @@ from indico.core.config import config
 from indico.modules.events.abstracts.controllers.base import RHAbstractsBase, RHManageAbstractsBase
 from indico.modules.events.abstracts.forms import BOASettingsForm
 from indico.modules.events.abstracts.settings import boa_settings
-from indico.modules.events.abstracts.util import clear_boa_cache, create_boa, create_boa_tex
+from indico.modules.events.abstracts.util import clear_boa_cache, create_boa_tex, send_boa
 from indico.modules.events.contributions import contribution_settings
 from indico.modules.files.controllers import UploadFileMixin
 from indico.modules.logs.models.entries import EventLogRealm, LogKind
@@ -92,11 +92,11 @@ class RHExportBOA(RHAbstractsBase):
             config.LATEX_ENABLED and
             self.event.can_manage(session.user, permission='abstracts')
         ):
-            return send_file('book-of-abstracts.pdf', create_boa(self.event), 'application/pdf')
+            return send_boa(self.event)
         if self.event.has_custom_boa:
             return self.event.custom_boa.send()
         elif config.LATEX_ENABLED:
-            return send_file('book-of-abstracts.pdf', create_boa(self.event), 'application/pdf')
+            return send_boa(self.event)
         raise NotFound
 
 
@@ -5,10 +5,7 @@
 # modify it under the terms of the MIT License; see the
 # LICENSE file for more details.
 
-import errno
 import itertools
-import os
-import shutil
 from collections import defaultdict, namedtuple
 
 from sqlalchemy.orm import contains_eager, joinedload, load_only, noload
@@ -16,7 +13,7 @@ from sqlalchemy.orm import contains_eager, joinedload, load_only, noload
 from indico.core.config import config
 from indico.core.db import db
 from indico.core.db.sqlalchemy.util.session import no_autoflush
-from indico.legacy.pdfinterface.latex import AbstractBook
+from indico.legacy.pdfinterface.latex import AbstractBook, get_cached_latex_pdf, release_latex_pdf, send_latex_pdf
 from indico.modules.events import Event
 from indico.modules.events.abstracts.forms import InvitedAbstractMixin
 from indico.modules.events.abstracts.models.abstracts import Abstract, AbstractState
@@ -311,26 +308,16 @@ def get_track_reviewer_abstract_counts(event, user):
             for track, total, reviewed, unreviewed in query}
 
 
-def create_boa(event):
-    """Create the book of abstracts if necessary.
-
-    :return: The path to the PDF file
-    """
-    path = boa_settings.get(event, 'cache_path')
-    if path:
-        path = os.path.join(config.CACHE_DIR, path)
-        if os.path.exists(path):
-            # update file mtime so it's not deleted during cache cleanup
-            os.utime(path, None)
-            return path
+def send_boa(event):
+    """Send the book of abstracts, generating it in the background if necessary."""
+    filename = 'book-of-abstracts.pdf'
+    key = boa_settings.get(event, 'cache_key')
+    if key and (file := get_cached_latex_pdf(key, persistent=True)) is not None:
+        return file.storage.send_file(file.storage_file_id, file.content_type, filename)
     with force_locale(config.DEFAULT_LOCALE):
-        pdf = AbstractBook(event)
-        tmp_path = pdf.generate()
-    filename = f'boa-{event.id}.pdf'
-    full_path = os.path.join(config.CACHE_DIR, filename)
-    shutil.move(tmp_path, full_path)
-    boa_settings.set(event, 'cache_path', filename)
-    return full_path
+        source = AbstractBook(event).prepare_source()
+    boa_settings.set(event, 'cache_key', source.key)
+    return send_latex_pdf(source, filename, event, persistent=True)
 
 
 def create_boa_tex(event):
@@ -344,15 +331,14 @@ def create_boa_tex(event):
 
 
 def clear_boa_cache(event):
-    """Delete the cached book of abstract."""
-    path = boa_settings.get(event, 'cache_path')
-    if path:
-        try:
-            os.remove(os.path.join(config.CACHE_DIR, path))
-        except OSError as e:
-            if e.errno != errno.ENOENT:
-                raise
-        boa_settings.delete(event, 'cache_path')
+    """Forget the cached book of abstracts.
+
+    The stored PDF is released so it gets cleaned up, and the next request
+    generates a new one.
+    """
+    if key := boa_settings.get(event, 'cache_key'):
+        release_latex_pdf(key)
+    boa_settings.delete(event, 'cache_key')
 
 
 def get_events_with_abstract_reviewer_convener(user, dt=None):
@@ -7,6 +7,7 @@
 
 import fnmatch
 import re
+from base64 import urlsafe_b64decode, urlsafe_b64encode
 from datetime import datetime
 from hashlib import md5
 from operator import attrgetter
@@ -21,6 +22,7 @@ from indico.core import signals
 from indico.core.db import db
 from indico.core.db.sqlalchemy.principals import PrincipalType
 from indico.core.db.sqlalchemy.protection import ProtectionMode
+from indico.core.db.sqlalchemy.util.queries import fnmatch_to_like
 from indico.modules.attachments.api.util import build_folders_api_data, build_material_legacy_api_data
 from indico.modules.categories import Category
 from indico.modules.categories.models.legacy_mapping import LegacyCategoryMapping
@@ -28,12 +30,15 @@ from indico.modules.categories.serialize import serialize_categories_ical
 from indico.modules.events import Event
 from indico.modules.events.contributions import contribution_settings
 from indico.modules.events.contributions.models.contributions import Contribution
+from indico.modules.events.models.events import EventType
 from indico.modules.events.models.persons import PersonLinkBase
 from indico.modules.events.notes.util import build_note_api_data, build_note_legacy_api_data
 from indico.modules.events.sessions.models.blocks import SessionBlock
 from indico.modules.events.sessions.models.sessions import Session
 from indico.modules.events.timetable.legacy import TimetableSerializer
 from indico.modules.events.timetable.models.entries import TimetableEntry
+from indico.modules.rb.models.locations import Location
+from indico.modules.rb.models.rooms import Room
 from indico.util.date_time import iterdays
 from indico.util.i18n import orig_string
 from indico.util.signals import values_from_signal
@@ -48,6 +53,18 @@ MAX_DATETIME = utc.localize(datetime(2099, 12, 31, 23, 59, 0))
 MIN_DATETIME = utc.localize(datetime(2000, 1, 1))
 
 
+def _encode_event_cursor(event):
+    return urlsafe_b64encode(f'{event.start_dt.isoformat()}/{event.id}'.encode()).decode()
+
+
+def _decode_event_cursor(cursor):
+    try:
+        start_dt, event_id = urlsafe_b64decode(cursor.encode()).decode().split('/')
+        return datetime.fromisoformat(start_dt), int(event_id)
+    except ValueError:
+        raise HTTPAPIError('Invalid cursor', 400)
+
+
 def find_event_day_bounds(obj, day):
     if not (obj.start_dt_local.date() <= day <= obj.end_dt_local.date()):
         return None, None
@@ -119,6 +136,14 @@ class CategoryEventHook(HTTPAPIHook):
         self._occurrences = get_query_parameter(self._queryParams, ['occ', 'occurrences'], 'no') == 'yes'
         self._location = get_query_parameter(self._queryParams, ['l', 'location'])
         self._room = get_query_parameter(self._queryParams, ['r', 'room'])
+        # keyset pagination: the events are ordered by start date and id, and the `next` cursor
+        # in the response can be passed as `after` to get the events on the following page
+        after = get_query_parameter(self._queryParams, ['after'])
+        self._paginate = after is not None or get_query_parameter(self._queryParams, ['paginate'], 'no') == 'yes'
+        self._after = _decode_event_cursor(after) if after else None
+        self._next_cursor = None
+        if self._paginate and (self._orderBy or self._offset):
+            raise HTTPAPIError('Pagination cannot be combined with a custom order or an offset', 400)
 
     def export_categ(self, user):
         expInt = CategoryEventFetcher(user, self)
@@ -133,7 +158,10 @@ class CategoryEventHook(HTTPAPIHook):
     def export_categ_extra(self, user, resultList):
         expInt = CategoryEventFetcher(user, self)
         ids = {event['categoryId'] for event in resultList}
-        return expInt.category_extra(ids)
+        extra = expInt.category_extra(ids)
+        if self._paginate:
+            extra['next'] = self._next_cursor
+        return extra
 
     def export_event(self, user):
         expInt = CategoryEventFetcher(user, self)
@@ -413,6 +441,7 @@ class CategoryEventFetcher(IteratedDataFetcher, SerializerBase):
         self._occurrences = hook._occurrences
         self._location = hook._location
         self._room = hook._room
+        self._paginate = getattr(hook, '_paginate', False)
         self.user = user
         self._detail_level = get_query_parameter(request.args.to_dict(), ['d', 'detail'], 'events')
         if self._detail_level not in ('events', 'contributions', 'subcontributions', 'sessions'):
@@ -476,7 +505,8 @@ class CategoryEventFetcher(IteratedDataFetcher, SerializerBase):
             raise HTTPAPIError('Category IDs must be numeric', 400)
         if format == 'ics':
             buf = serialize_categories_ical(idlist, self.user,
-                                            event_filter=Event.happens_between(self._fromDT, self._toDT),
+                                            event_filter=db.and_(Event.happens_between(self._fromDT, self._toDT),
+                                                                 *self._get_event_filters()),
                                             event_filter_fn=self._filter_event,
                                             update_query=self._update_query)
             return send_file('events.ics', buf, 'text/calendar')
@@ -484,11 +514,39 @@ class CategoryEventFetcher(IteratedDataFetcher, SerializerBase):
             query = (Event.query
                      .filter(~Event.is_deleted,
                              Event.category_chain_overlaps(idlist),
-                             Event.happens_between(self._fromDT, self._toDT))
+                             Event.happens_between(self._fromDT, self._toDT),
+                             *self._get_event_filters())
                      .options(*self._get_query_options(self._detail_level)))
+        if self._paginate:
+            return self.serialize_events(self._get_page(query))
         query = self._update_query(query)
         return self.serialize_events(x for x in query if self._filter_event(x) and x.can_access(self.user))
 
+    def _get_page(self, query):
+        """Get the accessible events on the current page.
+
+        Events the user cannot access (or which do not match the
+        filters that cannot be applied in SQL) are skipped, so unlike
+        with limit/offset each page is full unless it is the last one.
+        """
+        query = query.order_by(Event.start_dt, Event.id)
+        cursor = self._hook._after
+        events = []
+        while True:
+            chunk = query
+            if cursor:
+                chunk = chunk.filter(db.tuple_(Event.start_dt, Event.id) > cursor)
+            # fetching one more event than needed tells us whether there is a next page
+            chunk = chunk.limit(self._limit + 1).all()
+            events += [e for e in chunk if self._filter_event(e) and e.can_access(self.user)]
+            if len(events) > self._limit:
+                events = events[:self._limit]
+                self._hook._next_cursor = _encode_event_cursor(events[-1])
+                return events
+            elif len(chunk) <= self._limit:
+                return events
+            cursor = (chunk[-1].start_dt, chunk[-1].id)
+
     def category_extra(self, ids):
         if self._toDT is None:
             has_future_events = False
@@ -522,6 +580,32 @@ class CategoryEventFetcher(IteratedDataFetcher, SerializerBase):
         )
         return self.serialize_events(x for x in query if self._filter_event(x) and x.can_access(self.user))
 
+    def _get_event_filters(self):
+        """Get SQL criteria for the event type, location and room filters.
+
+        The wildcards supported by :meth:`_filter_event` are translated to
+        LIKE patterns so events not matching them are not even loaded.
+        """
+        filters = []
+        if self._eventType:
+            event_type = EventType.__members__.get(self._eventType)
+            filters.append(Event.type_ == event_type if event_type else db.false())
+        if self._location and (pattern := fnmatch_to_like(self._location)):
+            venue_name = db.func.coalesce(Location.query
+                                          .filter(Location.id == Event.own_venue_id)
+                                          .with_entities(Location.name)
+                                          .scalar_subquery(),
+                                          Event.own_venue_name)
+            filters.append(venue_name.ilike(pattern))
+        if self._room and (pattern := fnmatch_to_like(self._room)):
+            room_name = db.func.coalesce(Room.query
+                                         .filter(Room.id == Event.own_room_id)
+                                         .with_entities(Room.full_name)
+                                         .scalar_subquery(),
+                                         Event.own_room_name)
+            filters.append(room_name.ilike(pattern))
+        return filters
+
     def _filter_event(self, event):
         if self._room or self._location or self._eventType:
             if self._eventType and event.type_.name != self._eventType:
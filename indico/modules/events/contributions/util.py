@@ -361,9 +361,9 @@ def import_contributions_from_csv(event, f, delimiter=','):
 
 
 def render_pdf(event, contribs, sort_by, cls):
+    from indico.legacy.pdfinterface.latex import send_latex_pdf
     pdf = cls(event, session.user, contribs, tz=event.timezone, sort_by=sort_by)
-    res = pdf.generate()
-    return send_file('book-of-abstracts.pdf', res, 'application/pdf')
+    return send_latex_pdf(pdf.prepare_source(), 'book-of-abstracts.pdf', event)
 
 
 def render_archive(event, contribs, sort_by, cls):
@@ -7,9 +7,14 @@
 
 from io import BytesIO
 
-from flask import jsonify, redirect, request, session
+from celery.exceptions import TimeoutError
+from flask import jsonify, redirect, render_template, request, session
 from webargs import fields
+from werkzeug.exceptions import NotFound
 
+from indico.core.celery import AsyncResult
+from indico.core.errors import IndicoError
+from indico.legacy.pdfinterface.latex import LATEX_PDF_WAIT_TIMEOUT, is_latex_pdf_task_known
 from indico.modules.events.controllers.base import RHDisplayEventBase, RHEventBase
 from indico.modules.events.ical import CalendarScope, event_to_ical, events_to_ical
 from indico.modules.events.layout.views import WPPage
@@ -18,6 +23,8 @@ from indico.modules.events.models.events import EventType
 from indico.modules.events.settings import autolinker_settings
 from indico.modules.events.util import get_theme
 from indico.modules.events.views import WPConferenceDisplay, WPConferencePrivacyDisplay, WPSimpleEventDisplay
+from indico.modules.files.models.files import File
+from indico.util.i18n import _
 from indico.web.args import use_kwargs
 from indico.web.flask.util import send_file, url_for
 from indico.web.rh import RHProtected, allow_signed_url
@@ -41,6 +48,31 @@ class RHExportEventICAL(RHDisplayEventBase):
             return send_file('event-series.ics', BytesIO(events_ical), 'text/calendar')
 
 
+class RHLatexPDFStatus(RHDisplayEventBase):
+    """Wait for a LaTeX PDF which is generated in the background.
+
+    The PDF is sent as soon as it is available; until then a page which
+    reloads itself is shown.
+    """
+
+    def _process(self):
+        task_id = request.view_args['task_id']
+        res = AsyncResult(task_id)
+        if res.state == 'PENDING' and not is_latex_pdf_task_known(task_id):
+            # celery does not distinguish between unknown and pending tasks
+            raise NotFound(_('This PDF is not being generated anymore. Please request it again.'))
+        try:
+            file_id = res.get(LATEX_PDF_WAIT_TIMEOUT, propagate=False)
+        except TimeoutError:
+            return render_template('events/display/pdf_progress.html', event=self.event)
+        if not res.successful():
+            raise IndicoError(_('PDF generation failed'))
+        file = File.get_or_404(file_id)
+        if file.meta.get('event_id') != self.event.id:
+            raise NotFound
+        return file.storage.send_file(file.storage_file_id, file.content_type, file.filename)
+
+
 class RHDisplayEvent(RHDisplayEventBase):
     """Display the main page of an event.
 
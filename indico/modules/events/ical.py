@@ -9,12 +9,14 @@ from datetime import timedelta
 from email import message
 from email.mime.base import MIMEBase
 from email.policy import compat32
+from hashlib import sha1
 
 import icalendar
 from lxml import html
 from lxml.etree import ParserError
 
 from indico.core import signals
+from indico.core.cache import make_scoped_cache
 from indico.core.db.sqlalchemy.protection import ProtectionMode
 from indico.modules.events.contributions.models.contributions import Contribution
 from indico.modules.events.models.events import Event
@@ -25,6 +27,13 @@ from indico.util.enum import IndicoEnum
 from indico.util.signals import values_from_signal
 
 
+# serialized VEVENTs of events, keyed by a fingerprint of the data they are generated from.
+# plugins may add data (e.g. videoconference details) which is not part of the fingerprint,
+# so the entries expire after some time to pick up such changes as well.
+_event_component_cache = make_scoped_cache('ical-event-components')
+EVENT_COMPONENT_CACHE_TTL = 3600
+
+
 class MIMECalendar(MIMEBase):
     """MIME `text/calendar` class which adds the `method=REQUEST` to the Content-Type."""
 
@@ -178,6 +187,48 @@ def event_to_ical(
                           organizer=organizer)
 
 
+def _get_user_cache_key(user):
+    if user is None:
+        return 'anon'
+    # the alarm settings are the only part of the component that depends on the user itself;
+    # the user id is still needed since plugins may include data only some users can see
+    alerts = user.settings.get('add_ical_alerts')
+    return f'{user.id}:{user.settings.get("add_ical_alerts_mins") if alerts else ""}'
+
+
+def _get_event_component_cache_key(event, user_cache_key):
+    data = (event.title, event.label.title if event.label else None, event.start_dt, event.end_dt,
+            str(event.description), event.room_name, event.venue_name,
+            [(link.full_name, link.affiliation) for link in event.person_links],
+            event.contact_emails, event.contact_phones,
+            event.effective_protection_mode == ProtectionMode.public, event.logo_metadata,
+            sorted((assoc.id, assoc.vc_room_id, assoc.show, repr(assoc.data))
+                   for assoc in event.vc_room_associations))
+    fingerprint = sha1(repr(data).encode()).hexdigest()
+    return f'{event.id}:{user_cache_key}:{fingerprint}'
+
+
+def get_events_ical_etag(events, user=None):
+    """Get an ETag for the iCalendar data of events.
+
+    The ETag only changes when any of the data used for the events'
+    components changes, so it can be used to avoid serializing the
+    events when the client already has the latest version.
+
+    :param events: A list of events the user can access
+    :param user: The user the events are serialized for
+    """
+    user_cache_key = _get_user_cache_key(user)
+    keys = [_get_event_component_cache_key(event, user_cache_key) for event in events]
+    return sha1('\n'.join(keys).encode()).hexdigest()
+
+
+def _build_calendar(calendar, serialized_components):
+    # like `calendar.to_ical()` for a calendar containing the given (already serialized) components
+    header, footer = calendar.to_ical().rsplit(b'END:VCALENDAR', 1)
+    return b''.join([header, *serialized_components, b'END:VCALENDAR', footer])
+
+
 def events_to_ical(
     events: list[Event],
     user: User | None = None,
@@ -185,7 +236,8 @@ def events_to_ical(
     *,
     skip_access_check: bool = False,
     method: str | None = None,
-    organizer: tuple[str, str] | None = None
+    organizer: tuple[str, str] | None = None,
+    use_cache: bool = False
 ):
     """Serialize multiple events into an ical.
 
@@ -195,6 +247,9 @@ def events_to_ical(
     :param skip_access_check: Do not perform access checks. Defaults to False.
     :param method: METHOD field of the iCalendar object
     :param organizer: ORGANIZER field of the iCalendar object
+    :param use_cache: Whether to cache the serialized event components,
+                      which avoids generating them again for events which
+                      did not change.  Only used when not using a `scope`.
     """
     from indico.modules.events.contributions.ical import generate_contribution_component
     from indico.modules.events.sessions.ical import generate_session_block_component
@@ -206,10 +261,23 @@ def events_to_ical(
     if method:
         calendar.add('method', method)
 
+    use_cache = use_cache and not scope and not organizer
+    user_cache_key = _get_user_cache_key(user) if use_cache else None
+    serialized_components = []
     for event in events:
         if not skip_access_check and not event.can_access(user):
             continue
 
+        if use_cache:
+            cache_key = _get_event_component_cache_key(event, user_cache_key)
+            serialized = _event_component_cache.get(cache_key)
+            if serialized is None:
+                component = generate_event_component(event, user, skip_access_check=skip_access_check)
+                serialized = component.to_ical()
+                _event_component_cache.set(cache_key, serialized, timeout=EVENT_COMPONENT_CACHE_TTL)
+            serialized_components.append(serialized)
+            continue
+
         if scope == CalendarScope.contribution and event.contributions_count > 0:
             components = [
                 generate_contribution_component(contrib, organizer=organizer)
@@ -236,4 +304,6 @@ def events_to_ical(
         for component in components:
             calendar.add_component(component)
 
+    if use_cache:
+        return _build_calendar(calendar, serialized_components)
     return calendar.to_ical()
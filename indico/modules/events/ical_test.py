@@ -0,0 +1,37 @@
+# This file is part of Indico.
+# Copyright (C) 2002 - 2025 CERN
+#
+# Indico is free software; you can redistribute it and/or
+# modify it under the terms of the MIT License; see the
+# LICENSE file for more details.
+
+from indico.modules.events import ical
+from indico.modules.events.ical import events_to_ical, get_events_ical_etag
+
+
+def test_events_to_ical_cached(mocker, dummy_event, create_event):
+    other_event = create_event(title='Other event')
+    events = [dummy_event, other_event]
+    generate = mocker.spy(ical, 'generate_event_component')
+    # dtstamp is different every time
+    mocker.patch('indico.modules.events.ical.now_utc', return_value=dummy_event.start_dt)
+    uncached = events_to_ical(events)
+    assert generate.call_count == 2
+    assert events_to_ical(events, use_cache=True) == uncached
+    assert generate.call_count == 4
+    assert events_to_ical(events, use_cache=True) == uncached
+    assert generate.call_count == 4
+    # only the modified event needs to be generated again
+    dummy_event.title = 'Modified'
+    assert b'SUMMARY:Modified' in events_to_ical(events, use_cache=True)
+    assert generate.call_count == 5
+
+
+def test_get_events_ical_etag(dummy_event, dummy_user, create_event):
+    other_event = create_event()
+    etag = get_events_ical_etag([dummy_event, other_event])
+    assert get_events_ical_etag([dummy_event, other_event]) == etag
+    assert get_events_ical_etag([dummy_event]) != etag
+    assert get_events_ical_etag([dummy_event, other_event], dummy_user) != etag
+    other_event.start_dt = other_event.start_dt.replace(year=2000)
+    assert get_events_ical_etag([dummy_event, other_event]) != etag
@@ -17,6 +17,7 @@ from indico.core.permissions import get_available_permissions
 from indico.modules.events import Event
 from indico.modules.events.models.principals import EventPrincipal
 from indico.testing.util import bool_matrix
+from indico.web.flask.stats import get_request_stats, request_stats_request_started
 
 
 @pytest.fixture(autouse=True)
@@ -460,3 +461,31 @@ def test_has_management_permission_db(create_event, create_user, dummy_user):
     assert not _query().count()
     assert _query('foo').one() == entry
     assert _query('ANY').count() == 2
+
+
+@pytest.mark.usefixtures('request_context')
+def test_can_access_request_cache(app, db, mocker, create_event, create_user, dummy_category):
+    mocker.patch.dict(app.config, TESTING=False)
+    request_stats_request_started()
+    user = create_user(123)
+    event = create_event(category=dummy_category)
+    other_event = create_event(category=dummy_category)
+    dummy_category.protection_mode = ProtectionMode.protected
+    assert not event.can_access(user)
+    assert get_request_stats()['access_cache_hits'] == 0
+    assert not event.can_access(user)
+    assert get_request_stats()['access_cache_hits'] == 1
+    # the parent category's decision is cached as well
+    assert not other_event.can_access(user)
+    assert get_request_stats()['access_cache_hits'] == 2
+    # acl changes invalidate the cache
+    dummy_category.update_principal(user, read_access=True)
+    assert event.can_access(user)
+    # so do protection changes
+    event.protection_mode = ProtectionMode.protected
+    assert not event.can_access(user)
+    # changes which do not trigger any signals are picked up once flushed
+    event.acl_entries.add(EventPrincipal(principal=user, read_access=True))
+    assert not event.can_access(user)
+    db.session.flush()
+    assert event.can_access(user)
@@ -10,12 +10,14 @@ from collections import namedtuple
 from itertools import product
 
 from reportlab.lib.units import cm
-from reportlab.lib.utils import ImageReader
+from sqlalchemy.orm import subqueryload
 from werkzeug.exceptions import BadRequest
 
 from indico.core import signals
+from indico.modules.designer import PageLayout
 from indico.modules.designer.pdf import DesignerPDFBase
 from indico.modules.designer.util import is_regform_field_placeholder
+from indico.modules.events.registration.models.registrations import Registration
 from indico.modules.events.registration.settings import DEFAULT_BADGE_SETTINGS
 from indico.util.i18n import _
 from indico.util.placeholders import get_placeholders
@@ -49,7 +51,8 @@ class RegistrantsListToBadgesPDF(DesignerPDFBase):
                        config.top_margin + n_y * (tpl_data.height_cm + config.margin_rows))
             canvas.showPage()
 
-    def _build_pdf(self, canvas):
+    def _get_grid_size(self):
+        """Get the number of badges that fit on a page horizontally and vertically."""
         config = self.config
 
         available_width = self.width - (config.left_margin + config.right_margin + config.margin_columns) * cm
@@ -61,6 +64,34 @@ class RegistrantsListToBadgesPDF(DesignerPDFBase):
 
         if not n_horizontal or not n_vertical:
             raise BadRequest(_('The template dimensions are too large for the page size you selected'))
+        return n_horizontal, n_vertical
+
+    @property
+    def badges_per_page(self):
+        n_horizontal, n_vertical = self._get_grid_size()
+        return n_horizontal * n_vertical
+
+    def iter_pdf_chunks(self, chunk_size):
+        """Generate the PDF in multiple parts.
+
+        Each part contains the badges of up to `chunk_size` persons, rounded
+        down to full pages so concatenating all parts results in the same
+        document as :meth:`get_pdf`.
+
+        :return: An iterator yielding ``(num_persons, pdf_data)`` tuples
+        """
+        per_page = self.badges_per_page
+        chunk_size = max(1, chunk_size // per_page) * per_page
+        persons = self.persons
+        try:
+            for i in range(0, len(persons), chunk_size):
+                self.persons = persons[i:i + chunk_size]
+                yield len(self.persons), self.get_pdf()
+        finally:
+            self.persons = persons
+
+    def _build_pdf(self, canvas):
+        n_horizontal, n_vertical = self._get_grid_size()
 
         # Print a badge for each registration
         for person, (x, y) in zip(self.persons, self._iter_position(canvas, n_horizontal, n_vertical), strict=False):
@@ -84,8 +115,7 @@ class RegistrantsListToBadgesPDF(DesignerPDFBase):
             canvas.restoreState()
 
         if template.background_image:
-            with template.background_image.open() as f:
-                self._draw_background(canvas, ImageReader(self._remove_transparency(f)), tpl_data, *badge_rect)
+            self._draw_background(canvas, self._get_background_image(template), tpl_data, *badge_rect)
 
         placeholders = get_placeholders(self.placeholders_context)
 
@@ -137,6 +167,8 @@ class RegistrantsListToBadgesPDF(DesignerPDFBase):
 
 
 class RegistrantsListToBadgesPDFFoldable(RegistrantsListToBadgesPDF):
+    badges_per_page = 1
+
     def _build_pdf(self, canvas):
         # Only one badge per page
         n_horizontal = 1
@@ -166,18 +198,7 @@ class RegistrantsListToBadgesPDFFoldable(RegistrantsListToBadgesPDF):
 
 class RegistrantsListToBadgesPDFDoubleSided(RegistrantsListToBadgesPDF):
     def _build_pdf(self, canvas):
-        config = self.config
-
-        available_width = self.width - (config.left_margin + config.right_margin + config.margin_columns) * cm
-        n_horizontal = int((available_width + config.margin_columns*cm) /
-                           ((self.tpl_data.width_cm + config.margin_columns) * cm))
-        available_height = self.height - (config.top_margin + config.bottom_margin + config.margin_rows) * cm
-        n_vertical = int((available_height + config.margin_rows*cm) /
-                         ((self.tpl_data.height_cm + config.margin_rows) * cm))
-
-        if not n_horizontal or not n_vertical:
-            raise BadRequest(_('The template dimensions are too large for the page size you selected'))
-
+        n_horizontal, n_vertical = self._get_grid_size()
         per_page = n_horizontal * n_vertical
         # make batch of as many badges as we can fit into one page and add duplicates for printing back sides
         page_used = 0
@@ -208,3 +229,27 @@ class RegistrantsListToBadgesPDFDoubleSided(RegistrantsListToBadgesPDF):
                 x_cm = (self.width - x*cm - self.tpl_data.width_cm*cm)
                 self._draw_badge(canvas, person, self.template.backside_template,
                                  self.backside_tpl_data, x_cm, y * cm)
+
+
+def get_badges_pdf(template, config_params, regform, registration_ids):
+    """Get the PDF generator for the badges of some registrations.
+
+    :param template: The badge template to use
+    :param config_params: A dict containing the badge printing settings
+    :param regform: The registration form of the registrations
+    :param registration_ids: The IDs of the registrations to print
+    """
+    if config_params['page_layout'] == PageLayout.foldable:
+        pdf_class = RegistrantsListToBadgesPDFFoldable
+    elif config_params['page_layout'] == PageLayout.double_sided:
+        pdf_class = RegistrantsListToBadgesPDFDoubleSided
+    else:
+        pdf_class = RegistrantsListToBadgesPDF
+    registrations = (Registration.query.with_parent(regform.event)
+                     .filter(Registration.id.in_(registration_ids),
+                             Registration.is_active)
+                     .order_by(*Registration.order_by_name)
+                     .options(subqueryload('data').joinedload('field_data'))
+                     .all())
+    signals.event.designer.print_badge_template.send(template, regform=regform, registrations=registrations)
+    return pdf_class(template, config_params, regform.event, registrations, regform.tickets_for_accompanying_persons)
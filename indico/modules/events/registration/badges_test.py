@@ -0,0 +1,42 @@
+# This file is part of Indico.
+# Copyright (C) 2002 - 2025 CERN
+#
+# Indico is free software; you can redistribute it and/or
+# modify it under the terms of the MIT License; see the
+# LICENSE file for more details.
+
+import pytest
+from pypdf import PdfReader
+
+from indico.core.db.sqlalchemy.util.management import DEFAULT_BADGE_DATA
+from indico.modules.designer.pdf import DesignerPDFBase
+from indico.modules.events.registration.badges import get_badges_pdf
+from indico.modules.events.registration.settings import DEFAULT_BADGE_SETTINGS
+
+
+pytest_plugins = ('indico.modules.designer.testing.fixtures',
+                  'indico.modules.events.registration.testing.fixtures')
+
+
+def _get_pages_text(data):
+    return [page.extract_text() for page in PdfReader(data).pages]
+
+
+@pytest.mark.usefixtures('request_context')
+def test_iter_pdf_chunks(db, mocker, dummy_event, dummy_regform, create_user, create_registration,
+                         create_dummy_designer_template, dummy_designer_image_file):
+    template = create_dummy_designer_template('Badge', event=dummy_event, data=DEFAULT_BADGE_DATA)
+    template.background_image = dummy_designer_image_file
+    registrations = [create_registration(create_user(n), dummy_regform) for n in range(1, 13)]
+    db.session.flush()
+    remove_transparency = mocker.spy(DesignerPDFBase, '_remove_transparency')
+    pdf = get_badges_pdf(template, DEFAULT_BADGE_SETTINGS, dummy_regform, [r.id for r in registrations])
+    assert pdf.badges_per_page == 10
+    # chunks always contain full pages
+    chunks = list(pdf.iter_pdf_chunks(4))
+    assert [count for count, __ in chunks] == [10, 2]
+    chunk_pages = [text for __, chunk in chunks for text in _get_pages_text(chunk)]
+    assert len(chunk_pages) == 2
+    assert chunk_pages == _get_pages_text(pdf.get_pdf())
+    # the background image is only processed once
+    assert remove_transparency.call_count == 1
@@ -11,6 +11,7 @@
           build_url:false */
 
 import {showUserSearch} from 'indico/react/components/principals/imperative';
+import {indicoAxios, handleAxiosError} from 'indico/utils/axios';
 import {$T} from 'indico/utils/i18n';
 
 (function(global) {
@@ -133,4 +134,35 @@ import {$T} from 'indico/utils/i18n';
 
     handleRegListRowSelection();
   };
+
+  global.setupBadgePrintingProgress = function setupBadgePrintingProgress(statusURL) {
+    const $box = $('#badge-printing-progress');
+    const $bar = $box.find('.i-progress-bar');
+    const $label = $box.find('.i-progress-label');
+
+    async function poll() {
+      let res;
+      try {
+        res = await indicoAxios.get(statusURL);
+      } catch (error) {
+        handleAxiosError(error);
+        return;
+      }
+      const {done, total, download_url: downloadURL} = res.data;
+      if (total) {
+        $bar.width(`${(100 * done) / total}%`);
+        $label.text($T.gettext('{0} of {1} badges').format(done, total));
+      }
+      if (downloadURL) {
+        $box
+          .find('.js-badge-printing-message')
+          .text($T.gettext('The PDF has been generated and is being downloaded.'));
+        window.location.href = downloadURL;
+      } else {
+        setTimeout(poll, 1000);
+      }
+    }
+
+    poll();
+  };
 })(window);
@@ -10,7 +10,6 @@ import itertools
 import os
 import uuid
 from collections import defaultdict
-from contextlib import contextmanager
 from io import BytesIO
 from operator import attrgetter
 
@@ -22,6 +21,7 @@ from werkzeug.exceptions import BadRequest, Forbidden, NotFound
 
 from indico.core import signals
 from indico.core.cache import make_scoped_cache
+from indico.core.celery import AsyncResult
 from indico.core.config import config
 from indico.core.db import db
 from indico.core.errors import IndicoError, NoReportError
@@ -34,9 +34,7 @@ from indico.modules.designer.util import get_badge_format, get_inherited_templat
 from indico.modules.events import EventLogRealm
 from indico.modules.events.payment.util import toggle_registration_payment
 from indico.modules.events.registration import logger
-from indico.modules.events.registration.badges import (RegistrantsListToBadgesPDF,
-                                                       RegistrantsListToBadgesPDFDoubleSided,
-                                                       RegistrantsListToBadgesPDFFoldable)
+from indico.modules.events.registration.badges import get_badges_pdf
 from indico.modules.events.registration.controllers import (CheckEmailMixin, RegistrationEditMixin,
                                                             UploadRegistrationFileMixin, UploadRegistrationPictureMixin)
 from indico.modules.events.registration.controllers.management import (RHManageRegFormBase, RHManageRegFormsBase,
@@ -52,6 +50,7 @@ from indico.modules.events.registration.notifications import (notify_registratio
                                                               notify_registration_state_update)
 from indico.modules.events.registration.placeholders.registrations import PicturePlaceholder
 from indico.modules.events.registration.settings import event_badge_settings
+from indico.modules.events.registration.tasks import generate_badges_pdf
 from indico.modules.events.registration.util import (ActionMenuEntry, create_registration,
                                                      generate_spreadsheet_from_registrations,
                                                      get_flat_section_submission_data, get_initial_form_values,
@@ -64,6 +63,7 @@ from indico.modules.events.util import ZipGeneratorMixin
 from indico.modules.logs import LogKind
 from indico.modules.logs.util import make_diff_log
 from indico.modules.receipts.models.files import ReceiptFile
+from indico.util.archives import ZipEntry
 from indico.util.date_time import format_currency, now_utc, relativedelta
 from indico.util.fs import secure_filename
 from indico.util.i18n import _, ngettext
@@ -80,6 +80,9 @@ from indico.web.util import jsonify_data, jsonify_form, jsonify_template
 
 badge_cache = make_scoped_cache('badge-printing')
 
+#: Badges for more registrations than this are generated in the background
+BADGE_PRINTING_ASYNC_THRESHOLD = 250
+
 
 def _render_registration_details(registration):
     from indico.modules.events.registration.schemas import RegistrationTagSchema
@@ -493,7 +496,7 @@ class RHRegistrationsExportCSV(RHRegistrationsExportBase):
     def _process(self):
         headers, rows = generate_spreadsheet_from_registrations(self.registrations, self.export_config['regform_items'],
                                                                 self.export_config['static_item_ids'])
-        return send_csv('registrations.csv', headers, rows)
+        return send_csv('registrations.csv', headers, rows, stream=True)
 
 
 class RHRegistrationsExportExcel(RHRegistrationsExportBase):
@@ -503,7 +506,8 @@ class RHRegistrationsExportExcel(RHRegistrationsExportBase):
         headers, rows = generate_spreadsheet_from_registrations(self.registrations, self.export_config['regform_items'],
                                                                 self.export_config['static_item_ids'])
         column_formats = get_registration_spreadsheet_column_formats(self.export_config['regform_items'])
-        return send_xlsx('registrations.xlsx', headers, rows, tz=self.event.tzinfo, column_formats=column_formats)
+        return send_xlsx('registrations.xlsx', headers, rows, tz=self.event.tzinfo, column_formats=column_formats,
+                         stream=True)
 
 
 class RHRegistrationsImport(RHRegistrationsActionBase):
@@ -557,25 +561,40 @@ class RHRegistrationsPrintBadges(RHRegistrationsActionBase):
         config_params = badge_cache.get(request.view_args['uuid'])
         if not config_params:
             raise NotFound
-        if config_params['page_layout'] == PageLayout.foldable:
-            pdf_class = RegistrantsListToBadgesPDFFoldable
-        elif config_params['page_layout'] == PageLayout.double_sided:
-            pdf_class = RegistrantsListToBadgesPDFDoubleSided
-        else:
-            pdf_class = RegistrantsListToBadgesPDF
         registration_ids = config_params.pop('registration_ids')
-        registrations = (Registration.query.with_parent(self.event)
-                         .filter(Registration.id.in_(registration_ids),
-                                 Registration.is_active)
-                         .order_by(*Registration.order_by_name)
-                         .options(subqueryload('data').joinedload('field_data'))
-                         .all())
-        signals.event.designer.print_badge_template.send(self.template, regform=self.regform,
-                                                         registrations=registrations)
         file_name_prefix = 'Tickets' if config_params.pop('is_ticket') else 'Badges'
-        pdf = pdf_class(self.template, config_params, self.event, registrations,
-                        self.regform.tickets_for_accompanying_persons)
-        return send_file(f'{file_name_prefix}-{self.event.id}.pdf', pdf.get_pdf(), 'application/pdf')
+        filename = f'{file_name_prefix}-{self.event.id}.pdf'
+        if len(registration_ids) > BADGE_PRINTING_ASYNC_THRESHOLD:
+            return self._process_async(config_params, registration_ids, filename)
+        pdf = get_badges_pdf(self.template, config_params, self.regform, registration_ids)
+        return send_file(filename, pdf.get_pdf(), 'application/pdf')
+
+    def _process_async(self, config_params, registration_ids, filename):
+        task_key = '{}-task'.format(request.view_args['uuid'])
+        # reloading the page must not start generating the same badges again
+        if not badge_cache.get(task_key):
+            task = generate_badges_pdf.delay(self.template, self.regform, config_params, registration_ids, filename)
+            badge_cache.set(task_key, task.id, timeout=1800)
+        return WPManageRegistration.render_template('management/print_badges_progress.html', self.event,
+                                                    regform=self.regform, template=self.template,
+                                                    uuid=request.view_args['uuid'])
+
+
+class RHRegistrationsPrintBadgesStatus(RHRegistrationsPrintBadges):
+    """Get the progress of a background badge generation task."""
+
+    def _process(self):
+        task_id = badge_cache.get('{}-task'.format(request.view_args['uuid']))
+        if not task_id:
+            raise NotFound
+        res = AsyncResult(task_id)
+        if res.state == 'PROGRESS':
+            return jsonify(download_url=None, **res.info)
+        elif not res.ready():
+            return jsonify(download_url=None, done=0, total=None)
+        elif not res.successful():
+            raise IndicoError(_('Badge generation failed'))
+        return jsonify(download_url=res.result)
 
 
 class RHRegistrationsConfigBadges(RHRegistrationsActionBase):
@@ -1023,14 +1042,10 @@ class RHRegistrationsExportReceipts(ZipGeneratorMixin, RHRegistrationsActionBase
             outputbuf.seek(0)
             yield _FileWrapper(outputbuf, f'{template.title}-{template.id}.pdf')
 
-    @contextmanager
-    def _get_item_path(self, item):
+    def _get_zip_entry(self, item, name):
         if isinstance(item, _FileWrapper):
-            yield item.content
-            return
-
-        with item[1].get_local_path() as path:
-            yield path
+            return ZipEntry(name, lambda: item.content, item.content.getbuffer().nbytes, 'application/pdf')
+        return super()._get_zip_entry(item[1], name)
 
     @use_kwargs({
         'combined': fields.Bool(load_default=False),
@@ -23,6 +23,7 @@ from indico.modules.designer.models.templates import DesignerTemplate
 from indico.modules.events.registration.models.form_fields import RegistrationFormPersonalDataField
 from indico.modules.events.registration.models.registrations import (PublishRegistrationsMode, Registration,
                                                                      RegistrationState)
+from indico.modules.users.memberships import get_principal_memberships
 from indico.util.caching import memoize_request
 from indico.util.date_time import format_currency, now_utc
 from indico.util.enum import RichIntEnum
@@ -371,15 +372,7 @@ class RegistrationForm(db.Model):
     # - reminders (EventReminder.forms)
 
     def __contains__(self, user):
-        if user is None:
-            return False
-        return (Registration.query.with_parent(self)
-                .join(Registration.registration_form)
-                .filter(Registration.user == user,
-                        Registration.state.in_([RegistrationState.unpaid, RegistrationState.complete]),
-                        ~Registration.is_deleted,
-                        ~RegistrationForm.is_deleted)
-                .has_rows())
+        return user is not None and self.id in get_principal_memberships(user).registration_forms
 
     @property
     def name(self):
@@ -6,24 +6,33 @@
 # LICENSE file for more details.
 
 from collections import defaultdict
+from tempfile import TemporaryFile
 
 from celery.schedules import crontab
+from pypdf import PdfWriter
 
 from indico.core import signals
 from indico.core.celery import celery
+from indico.core.config import config
 from indico.core.db import db
 from indico.core.storage.backend import get_storage
 from indico.modules.events import Event
 from indico.modules.events.registration import logger
+from indico.modules.events.registration.badges import get_badges_pdf
 from indico.modules.events.registration.models.form_fields import RegistrationFormField, RegistrationFormFieldData
 from indico.modules.events.registration.models.forms import RegistrationForm
 from indico.modules.events.registration.models.registrations import Registration, RegistrationData
 from indico.modules.events.registration.util import close_registration
+from indico.modules.files.models.files import File
 from indico.modules.receipts.models.files import ReceiptFile
 from indico.util.date_time import now_utc
 from indico.util.string import snakify_keys
 
 
+#: The number of persons whose badges are rendered at once
+BADGE_PRINTING_CHUNK_SIZE = 100
+
+
 def _delete_file(reg_data):
     if reg_data.storage_file_id is None:
         return
@@ -118,3 +127,32 @@ def delete_previous_registration_file(registration_id, field_data_id, storage_ba
     logger.debug('Deleting registration file: %s from %s storage', storage_file_id, storage_backend)
     storage = get_storage(storage_backend)
     storage.delete(storage_file_id)
+
+
+@celery.task(name='generate_badges_pdf', bind=True, ignore_result=False, request_context=True)
+def generate_badges_pdf(self, template, regform, config_params, registration_ids, filename):
+    """Generate a PDF containing the badges of many registrations.
+
+    The badges are rendered in chunks; after each chunk the progress is
+    stored in the task state so it can be shown while waiting.
+
+    :return: The download URL of the generated PDF
+    """
+    pdf = get_badges_pdf(template, config_params, regform, registration_ids)
+    total = len(pdf.persons)
+    done = 0
+    self.update_state(state='PROGRESS', meta={'done': done, 'total': total})
+    output = PdfWriter()
+    for count, chunk in pdf.iter_pdf_chunks(BADGE_PRINTING_CHUNK_SIZE):
+        output.append(chunk)
+        done += count
+        self.update_state(state='PROGRESS', meta={'done': done, 'total': total})
+    with TemporaryFile(dir=config.TEMP_DIR) as fd:
+        output.write(fd)
+        fd.seek(0)
+        f = File(filename=filename, content_type='application/pdf', meta={'event_id': regform.event_id})
+        f.save(('event', regform.event_id, 'badges'), fd)
+    db.session.add(f)
+    db.session.commit()
+    logger.info('Generated %d badges for %r', total, regform)
+    return f.signed_download_url
@@ -572,6 +572,8 @@ def generate_spreadsheet_from_registrations(registrations, regform_items, static
     :param registrations: The list of registrations to include in the file
     :param regform_items: The registration form items to be used as columns
     :param static_items: Registration form information as extra columns
+    :return: A tuple containing the column names and a generator yielding
+             the rows, so they can be written to the spreadsheet one by one
     """
     field_names = ['ID', 'Name']
     special_item_mapping = {
@@ -592,40 +594,42 @@ def generate_spreadsheet_from_registrations(registrations, regform_items, static
             field_names.append(unique_col('{} ({})'.format(item.title, 'Arrival'), item.id))
             field_names.append(unique_col('{} ({})'.format(item.title, 'Departure'), item.id))
     field_names.extend(title for name, (title, fn) in special_item_mapping.items() if name in static_items)
-    rows = []
-    for registration in registrations:
-        data = registration.data_by_field
-        registration_dict = {
-            'ID': registration.friendly_id,
-            'Name': f'{registration.first_name} {registration.last_name}'
-        }
-        tzinfo = registration.event.tzinfo
-        for item in regform_items:
-            key = unique_col(item.title, item.id)
-            if item.input_type == 'accommodation':
-                registration_dict[key] = data[item.id].friendly_data.get('choice') if item.id in data else ''
-                key = unique_col('{} ({})'.format(item.title, 'Arrival'), item.id)
-                arrival_date = data[item.id].friendly_data.get('arrival_date') if item.id in data else None
-                registration_dict[key] = arrival_date or ''
-                key = unique_col('{} ({})'.format(item.title, 'Departure'), item.id)
-                departure_date = data[item.id].friendly_data.get('departure_date') if item.id in data else None
-                registration_dict[key] = departure_date or ''
-            elif item.input_type == 'date':
-                if item.id not in data or not data[item.id].data:  # missing or empty data for the field
+
+    def _iter_rows():
+        for registration in registrations:
+            data = registration.data_by_field
+            registration_dict = {
+                'ID': registration.friendly_id,
+                'Name': f'{registration.first_name} {registration.last_name}'
+            }
+            tzinfo = registration.event.tzinfo
+            for item in regform_items:
+                key = unique_col(item.title, item.id)
+                if item.input_type == 'accommodation':
+                    registration_dict[key] = data[item.id].friendly_data.get('choice') if item.id in data else ''
+                    key = unique_col('{} ({})'.format(item.title, 'Arrival'), item.id)
+                    arrival_date = data[item.id].friendly_data.get('arrival_date') if item.id in data else None
+                    registration_dict[key] = arrival_date or ''
+                    key = unique_col('{} ({})'.format(item.title, 'Departure'), item.id)
+                    departure_date = data[item.id].friendly_data.get('departure_date') if item.id in data else None
+                    registration_dict[key] = departure_date or ''
+                elif item.input_type == 'date':
+                    if item.id not in data or not data[item.id].data:  # missing or empty data for the field
+                        registration_dict[key] = ''
+                        continue
+                    registration_dict[key] = datetime.fromisoformat(data[item.id].data).replace(tzinfo=tzinfo)
+                elif item.id in data:
+                    registration_dict[key] = item.field_impl.render_spreadsheet_data(data[item.id])
+                else:
                     registration_dict[key] = ''
+            for name, (title, fn) in special_item_mapping.items():
+                if name not in static_items:
                     continue
-                registration_dict[key] = datetime.fromisoformat(data[item.id].data).replace(tzinfo=tzinfo)
-            elif item.id in data:
-                registration_dict[key] = item.field_impl.render_spreadsheet_data(data[item.id])
-            else:
-                registration_dict[key] = ''
-        for name, (title, fn) in special_item_mapping.items():
-            if name not in static_items:
-                continue
-            value = fn(registration)
-            registration_dict[title] = value
-        rows.append(registration_dict)
-    return field_names, rows
+                value = fn(registration)
+                registration_dict[title] = value
+            yield registration_dict
+
+    return field_names, _iter_rows()
 
 
 def get_registrations_with_tickets(user, event):
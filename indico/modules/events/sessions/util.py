@@ -161,6 +161,12 @@ def generate_session_pdf_timetable(sess):
     return generate_pdf_timetable(sess.event, config, only_session=sess)
 
 
+def send_session_pdf_timetable(sess):
+    from indico.modules.events.timetable.util import TimetableExportConfig, send_pdf_timetable
+    config = TimetableExportConfig(show_toc=False)
+    return send_pdf_timetable(sess.event, config, only_session=sess, filename='session-timetable.pdf')
+
+
 def render_session_type_row(session_type):
     template = get_template_module('events/sessions/management/_types_table.html')
     return template.types_table_row(session_type=session_type)
@@ -17,7 +17,8 @@ from indico.core import signals
 from indico.core.settings import ACLProxyBase, SettingProperty, SettingsProxyBase
 from indico.core.settings.converters import DatetimeConverter, TimedeltaConverter
 from indico.core.settings.proxy import SettingsProxy
-from indico.core.settings.util import get_all_settings, get_setting, get_setting_acl, preload_settings_bulk
+from indico.core.settings.util import (get_all_settings, get_setting, get_setting_acl, preload_acl_settings_bulk,
+                                       preload_settings_bulk)
 from indico.modules.events.models.settings import EventSetting, EventSettingPrincipal
 from indico.util.caching import memoize
 from indico.util.signals import values_from_signal
@@ -35,6 +36,11 @@ def event_or_id(f):
     return wrapper
 
 
+def _event_ids(events):
+    from indico.modules.events import Event
+    return {event.id if isinstance(event, Event) else int(event) for event in events}
+
+
 class EventACLProxy(ACLProxyBase):
     """Proxy class for event-specific ACL settings."""
 
@@ -76,6 +82,30 @@ class EventACLProxy(ACLProxyBase):
         acl_entries = EventACLProxy.get(self, event, name)
         return any(user in principal for principal in iter_acl(acl_entries))
 
+    def contains_user_bulk(self, events, name, user):
+        """Check if a user is in an ACL of many events.
+
+        The ACLs of all events are loaded in a single query.
+
+        :param events: Events (or their IDs)
+        :param name: Setting name
+        :param user: A :class:`.User`
+        :return: A dict mapping the event IDs to whether the user is in
+                 the event's ACL
+        """
+        self._check_name(name)
+        acls = preload_acl_settings_bulk(self, EventSettingPrincipal.event_id, _event_ids(events), {name})[name]
+        return {event_id: any(user in principal for principal in iter_acl(acl)) for event_id, acl in acls.items()}
+
+    def preload_bulk(self, events, names=None):
+        """Preload ACL settings for many events.
+
+        :param events: Events (or their IDs)
+        :param names: The names of the ACL settings to preload; all of
+                      them if omitted
+        """
+        preload_acl_settings_bulk(self, EventSettingPrincipal.event_id, _event_ids(events), names)
+
     @event_or_id
     def add_principal(self, event, name, principal):
         """Add a principal to an ACL.
@@ -148,7 +178,7 @@ class EventSettingsProxy(SettingsProxyBase):
         """
         self._check_name(name)
         EventSetting.set(self.module, name, self._convert_from_python(name, value), event_id=event)
-        self._flush_cache()
+        self._flush_cache(event_id=event)
 
     @event_or_id
     def set_multi(self, event, items):
@@ -161,7 +191,7 @@ class EventSettingsProxy(SettingsProxyBase):
         self._split_call(items,
                          lambda x: EventSetting.set_multi(self.module, x, event_id=event),
                          lambda x: EventSettingPrincipal.set_acl_multi(self.module, x, event_id=event))
-        self._flush_cache()
+        self._flush_cache(event_id=event)
 
     @event_or_id
     def delete(self, event, *names):
@@ -173,7 +203,7 @@ class EventSettingsProxy(SettingsProxyBase):
         self._split_call(names,
                          lambda name: EventSetting.delete(self.module, *name, event_id=event),
                          lambda name: EventSettingPrincipal.delete(self.module, *name, event_id=event))
-        self._flush_cache()
+        self._flush_cache(event_id=event)
 
     @event_or_id
     def delete_all(self, event):
@@ -183,7 +213,7 @@ class EventSettingsProxy(SettingsProxyBase):
         """
         EventSetting.delete_all(self.module, event_id=event)
         EventSettingPrincipal.delete_all(self.module, event_id=event)
-        self._flush_cache()
+        self._flush_cache(event_id=event)
 
     def preload_bulk(self, event_ids):
         """Preload all settings for the specified event ids.
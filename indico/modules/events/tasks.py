@@ -0,0 +1,79 @@
+# This file is part of Indico.
+# Copyright (C) 2002 - 2025 CERN
+#
+# Indico is free software; you can redistribute it and/or
+# modify it under the terms of the MIT License; see the
+# LICENSE file for more details.
+
+from indico.core.celery import celery
+from indico.core.config import config
+from indico.core.db import db
+from indico.legacy.pdfinterface.latex import (LATEX_PDF_CACHE_TTL, LATEX_PDF_TASK_TIMEOUT, compile_latex_source,
+                                              latex_pdf_cache, load_latex_source)
+from indico.modules.events import logger
+from indico.modules.files.models.files import File
+
+
+#: How long to wait before trying again when too many PDFs are being compiled
+LATEX_JOB_RETRY_DELAY = 5
+#: How often to try again before giving up when too many PDFs are being compiled
+LATEX_JOB_MAX_RETRIES = LATEX_PDF_TASK_TIMEOUT // LATEX_JOB_RETRY_DELAY
+
+
+def _acquire_latex_job_slot(task_id):
+    if not config.LATEX_MAX_CONCURRENT_JOBS:
+        return None
+    for i in range(config.LATEX_MAX_CONCURRENT_JOBS):
+        slot_key = f'job-slot-{i}'
+        if latex_pdf_cache.add(slot_key, task_id, timeout=LATEX_PDF_TASK_TIMEOUT):
+            return slot_key
+    return False
+
+
+def _keep_latex_pdf_task_reserved(task_id, key):
+    latex_pdf_cache.set(f'task-{key}', task_id, timeout=LATEX_PDF_TASK_TIMEOUT)
+    latex_pdf_cache.set(f'task-id-{task_id}', key, timeout=LATEX_PDF_TASK_TIMEOUT)
+
+
+@celery.task(name='generate_latex_pdf', bind=True, ignore_result=False, max_retries=LATEX_JOB_MAX_RETRIES)
+def generate_latex_pdf(self, source_file, key, filename, event, *, persistent=False):
+    """Compile a LaTeX PDF and store it for later downloads.
+
+    At most :data:`LATEX_MAX_CONCURRENT_JOBS` PDFs are compiled at the same
+    time; if all slots are taken the task is retried a few seconds later,
+    keeping the PDF reserved for this task while it waits.
+
+    :param source_file: The file containing the LaTeX source, see
+                        :func:`~indico.legacy.pdfinterface.latex.store_latex_source`
+    :param key: The hash of the source
+    :param persistent: Whether to claim the stored file so it is kept
+                       until it is released explicitly
+    :return: The ID of the stored file
+    """
+    slot_key = _acquire_latex_job_slot(self.request.id)
+    if slot_key is False:
+        if self.request.retries < self.max_retries:
+            _keep_latex_pdf_task_reserved(self.request.id, key)
+            raise self.retry(countdown=LATEX_JOB_RETRY_DELAY)
+        # allow the next request to try again
+        latex_pdf_cache.delete(f'task-{key}')
+        raise RuntimeError('Timed out waiting for a LaTeX job slot')
+    try:
+        pdf = compile_latex_source(load_latex_source(source_file))
+    except Exception:
+        # allow the next request to try again
+        latex_pdf_cache.delete(f'task-{key}')
+        raise
+    finally:
+        if slot_key:
+            latex_pdf_cache.delete(slot_key)
+    source_file.delete(delete_from_db=True)
+    f = File(filename=filename, content_type='application/pdf', meta={'event_id': event.id, 'latex_key': key})
+    f.save(('event', event.id, 'latex'), pdf)
+    if persistent:
+        f.claim()
+    db.session.add(f)
+    db.session.commit()
+    latex_pdf_cache.set(key, f.id, timeout=(0 if persistent else LATEX_PDF_CACHE_TTL))
+    logger.info('Generated LaTeX PDF %s for %r (%s)', filename, event, key)
+    return f.id
@@ -0,0 +1,49 @@
+# This file is part of Indico.
+# Copyright (C) 2002 - 2025 CERN
+#
+# Indico is free software; you can redistribute it and/or
+# modify it under the terms of the MIT License; see the
+# LICENSE file for more details.
+
+import pytest
+
+from indico.legacy.pdfinterface.latex import (LatexSource, is_latex_pdf_task_known, latex_pdf_cache, load_latex_source,
+                                              store_latex_source)
+from indico.modules.events.tasks import _acquire_latex_job_slot
+
+
+def test_latex_source_key():
+    source = LatexSource('book', True, {'book.tex': b'foo', 'a.png': b'bar'})
+    assert source.key == LatexSource('book', True, {'a.png': b'bar', 'book.tex': b'foo'}).key
+    assert source.key != LatexSource('book', False, {'book.tex': b'foo', 'a.png': b'bar'}).key
+    assert source.key != LatexSource('book', True, {'book.tex': b'foo', 'a.png': b'baz'}).key
+
+
+def test_store_latex_source(dummy_event):
+    source = LatexSource('book', True, {'book.tex': b'foo', 'images/a.png': b'bar'})
+    f = store_latex_source(source, dummy_event)
+    assert not f.claimed
+    loaded = load_latex_source(f)
+    assert loaded == source
+    assert loaded.key == source.key
+
+
+@pytest.mark.parametrize('limit', (None, 0))
+def test_acquire_latex_job_slot_unlimited(patch_indico_config, limit):
+    patch_indico_config('LATEX_MAX_CONCURRENT_JOBS', limit)
+    assert _acquire_latex_job_slot('task') is None
+
+
+def test_acquire_latex_job_slot(patch_indico_config):
+    patch_indico_config('LATEX_MAX_CONCURRENT_JOBS', 2)
+    assert _acquire_latex_job_slot('task-1') == 'job-slot-0'
+    assert _acquire_latex_job_slot('task-2') == 'job-slot-1'
+    assert _acquire_latex_job_slot('task-3') is False
+    latex_pdf_cache.delete('job-slot-0')
+    assert _acquire_latex_job_slot('task-3') == 'job-slot-0'
+
+
+def test_is_latex_pdf_task_known():
+    assert not is_latex_pdf_task_known('unknown')
+    latex_pdf_cache.set('task-id-known', 'key')
+    assert is_latex_pdf_task_known('known')
@@ -20,6 +20,11 @@ from indico.web.menu import SideMenuItem
 logger = Logger.get('events.timetable')
 
 
+@signals.core.import_tasks.connect
+def _import_tasks(sender, **kwargs):
+    import indico.modules.events.timetable.tasks  # noqa: F401
+
+
 @signals.event.sidemenu.connect
 def _extend_event_menu(sender, **kwargs):
     from indico.modules.events.contributions import contribution_settings
@@ -48,6 +53,52 @@ def _get_timetable_cloner(sender, **kwargs):
     return TimetableCloner
 
 
+@signals.event.created.connect
+@signals.event.updated.connect
+@signals.event.deleted.connect
+@signals.event.restored.connect
+@signals.event.moved.connect
+@signals.category.updated.connect
+@signals.category.moved.connect
+@signals.category.deleted.connect
+def _invalidate_category_overview_cache(sender, **kwargs):
+    from indico.modules.events.timetable.util import invalidate_category_overview_cache
+    invalidate_category_overview_cache()
+
+
+@signals.event.updated.connect
+@signals.event.location_changed.connect
+@signals.event.times_changed.connect
+@signals.event.timetable_entry_created.connect
+@signals.event.timetable_entry_updated.connect
+@signals.event.timetable_entry_deleted.connect
+@signals.event.contribution_created.connect
+@signals.event.contribution_updated.connect
+@signals.event.contribution_deleted.connect
+@signals.event.subcontribution_created.connect
+@signals.event.subcontribution_updated.connect
+@signals.event.subcontribution_deleted.connect
+@signals.event.session_updated.connect
+@signals.event.session_deleted.connect
+@signals.event.session_block_updated.connect
+@signals.event.session_block_deleted.connect
+@signals.event.person_updated.connect
+def _invalidate_pdf_timetables(sender, obj=None, **kwargs):
+    from indico.modules.events.timetable.util import invalidate_pdf_timetables
+    if (event := (obj or sender).event) is not None:
+        invalidate_pdf_timetables(event)
+
+
+@signals.acl.entry_changed.connect
+@signals.acl.protection_changed.connect
+def _invalidate_pdf_timetables_on_acl_change(sender, obj, **kwargs):
+    from indico.modules.events.contributions.models.contributions import Contribution
+    from indico.modules.events.sessions.models.sessions import Session
+    from indico.modules.events.timetable.util import invalidate_pdf_timetables
+    if isinstance(obj, (Session, Contribution)):
+        invalidate_pdf_timetables(obj.event)
+
+
 @template_hook('session-timetable')
 def _render_session_timetable(session, **kwargs):
     from indico.modules.events.timetable.util import render_session_timetable
@@ -6,7 +6,8 @@
 # LICENSE file for more details.
 
 from indico.modules.events.timetable.controllers.display import (RHTimetable, RHTimetableEntryInfo,
-                                                                 RHTimetableExportDefaultPDF, RHTimetableExportPDF)
+                                                                 RHTimetableExportDefaultPDF, RHTimetableExportPDF,
+                                                                 RHTimetableExportPDFStatus)
 from indico.modules.events.timetable.controllers.legacy import (RHLegacyTimetableAddBreak,
                                                                 RHLegacyTimetableAddContribution,
                                                                 RHLegacyTimetableAddSession,
@@ -71,6 +72,7 @@ with _bp.add_prefixed_rules('/manage/timetable/session/<int:session_id>', '/mana
 _bp.add_url_rule('/timetable/', 'timetable', RHTimetable)
 _bp.add_url_rule('/timetable/pdf', 'export_pdf', RHTimetableExportPDF, methods=('GET', 'POST'))
 _bp.add_url_rule('/timetable/timetable.pdf', 'export_default_pdf', RHTimetableExportDefaultPDF)
+_bp.add_url_rule('/timetable/pdf/<task_id>', 'export_pdf_status', RHTimetableExportPDFStatus)
 _bp.add_url_rule('/timetable/entry/<int:entry_id>/info', 'entry_info', RHTimetableEntryInfo)
 
 
@@ -5,23 +5,28 @@
 # modify it under the terms of the MIT License; see the
 # LICENSE file for more details.
 
-from flask import jsonify, request, session
+from celery.exceptions import TimeoutError
+from flask import jsonify, render_template, request, session
 from marshmallow import fields
 from werkzeug.exceptions import Forbidden, NotFound
 
+from indico.core.celery import AsyncResult
+from indico.core.errors import IndicoError
 from indico.modules.events.contributions import contribution_settings
 from indico.modules.events.controllers.base import RHDisplayEventBase
 from indico.modules.events.layout import layout_settings
 from indico.modules.events.timetable.forms import TimetablePDFExportForm
 from indico.modules.events.timetable.legacy import TimetableSerializer
-from indico.modules.events.timetable.util import (TimetableExportConfig, generate_pdf_timetable,
-                                                  render_entry_info_balloon, serialize_event_info)
+from indico.modules.events.timetable.util import (PDF_TIMETABLE_WAIT_TIMEOUT, TimetableExportConfig,
+                                                  is_pdf_timetable_task_known, render_entry_info_balloon,
+                                                  send_pdf_timetable, serialize_event_info)
 from indico.modules.events.timetable.views import WPDisplayTimetable
 from indico.modules.events.util import get_theme
 from indico.modules.events.views import WPSimpleEventDisplay
+from indico.modules.files.models.files import File
 from indico.util.i18n import _
 from indico.web.args import use_kwargs
-from indico.web.flask.util import send_file, url_for
+from indico.web.flask.util import url_for
 from indico.web.util import jsonify_data, jsonify_template
 
 
@@ -100,8 +105,7 @@ class RHTimetableExportPDF(RHTimetableProtectionBase):
                 print_date_close_to_sessions=form.session_info.data['printDateCloseToSessions'],
             )
 
-            pdf = generate_pdf_timetable(self.event, config)
-            return send_file('timetable.pdf', pdf, 'application/pdf')
+            return send_pdf_timetable(self.event, config)
         return jsonify_template('events/timetable/timetable_pdf_export.html', form=form,
                                 back_url=url_for('.timetable', self.event))
 
@@ -110,5 +114,29 @@ class RHTimetableExportDefaultPDF(RHTimetableProtectionBase):
     """Generate a PDF timetable with default settings."""
 
     def _process(self):
-        pdf = generate_pdf_timetable(self.event)
-        return send_file('timetable.pdf', pdf, 'application/pdf')
+        return send_pdf_timetable(self.event)
+
+
+class RHTimetableExportPDFStatus(RHDisplayEventBase):
+    """Wait for a PDF timetable which is generated in the background.
+
+    The PDF is sent as soon as it is available; until then a page which
+    reloads itself is shown.
+    """
+
+    def _process(self):
+        task_id = request.view_args['task_id']
+        res = AsyncResult(task_id)
+        if res.state == 'PENDING' and not is_pdf_timetable_task_known(task_id):
+            # celery does not distinguish between unknown and pending tasks
+            raise NotFound(_('This PDF is not being generated anymore. Please request it again.'))
+        try:
+            file_id = res.get(PDF_TIMETABLE_WAIT_TIMEOUT, propagate=False)
+        except TimeoutError:
+            return render_template('events/display/pdf_progress.html', event=self.event)
+        if not res.successful():
+            raise IndicoError(_('PDF timetable generation failed'))
+        file = File.get_or_404(file_id)
+        if file.meta.get('event_id') != self.event.id:
+            raise NotFound
+        return file.storage.send_file(file.storage_file_id, file.content_type, file.filename)
@@ -0,0 +1,43 @@
+# This file is part of Indico.
+# Copyright (C) 2002 - 2025 CERN
+#
+# Indico is free software; you can redistribute it and/or
+# modify it under the terms of the MIT License; see the
+# LICENSE file for more details.
+
+from flask import session
+
+from indico.core.celery import celery
+from indico.core.db import db
+from indico.modules.events.timetable import logger
+from indico.modules.events.timetable.util import PDF_TIMETABLE_CACHE_TTL, generate_pdf_timetable, pdf_timetable_cache
+from indico.modules.files.models.files import File
+
+
+@celery.task(name='generate_pdf_timetable', ignore_result=False, request_context=True)
+def generate_pdf_timetable_file(event, config, key, *, only_session=None, user=None, lang=None,
+                                filename='timetable.pdf'):
+    """Generate a PDF timetable and store it for later downloads.
+
+    :param config: The :class:`~indico.modules.events.timetable.util.TimetableExportConfig`
+    :param key: The hash identifying the PDF, see
+                :func:`~indico.modules.events.timetable.util.get_pdf_timetable_hash`
+    :param user: The user the timetable is rendered for
+    :param lang: The language the timetable is rendered in
+    :return: The ID of the stored file
+    """
+    session.set_session_user(user)
+    session.lang = lang
+    try:
+        pdf = generate_pdf_timetable(event, config, only_session=only_session)
+    except Exception:
+        # allow the next request to try again
+        pdf_timetable_cache.delete(f'task-{key}')
+        raise
+    f = File(filename=filename, content_type='application/pdf', meta={'event_id': event.id})
+    f.save(('event', event.id, 'timetable'), pdf)
+    db.session.add(f)
+    db.session.commit()
+    pdf_timetable_cache.set(key, f.id, timeout=PDF_TIMETABLE_CACHE_TTL)
+    logger.info('Generated PDF timetable for %r (%s)', event, key)
+    return f.id
@@ -5,19 +5,26 @@
 # modify it under the terms of the MIT License; see the
 # LICENSE file for more details.
 
+import dataclasses
+import hashlib
+import json
+import uuid
 from collections import defaultdict
 from dataclasses import dataclass
+from datetime import timedelta
 from io import BytesIO
 from itertools import groupby
 from operator import attrgetter
 
-from flask import render_template, session
+from flask import redirect, render_template, session
 from pytz import utc
 from sqlalchemy import Date, cast
-from sqlalchemy.orm import contains_eager, joinedload, subqueryload, undefer
+from sqlalchemy.orm import contains_eager, joinedload, load_only, subqueryload, undefer
 from weasyprint import CSS, HTML
 
+from indico.core.cache import make_scoped_cache
 from indico.core.db import db
+from indico.core.db.sqlalchemy.protection import ProtectionMode
 from indico.modules.events.contributions.models.contributions import Contribution
 from indico.modules.events.models.events import Event
 from indico.modules.events.models.persons import EventPersonLink
@@ -26,14 +33,41 @@ from indico.modules.events.sessions.models.sessions import Session
 from indico.modules.events.timetable.legacy import TimetableSerializer, serialize_event_info
 from indico.modules.events.timetable.models.breaks import Break
 from indico.modules.events.timetable.models.entries import TimetableEntry, TimetableEntryType
+from indico.modules.files.models.files import File
 from indico.modules.receipts.util import sandboxed_url_fetcher
 from indico.util.caching import memoize_request
 from indico.util.date_time import format_time, get_day_end, get_day_start, iterdays
 from indico.util.i18n import _
 from indico.web.flask.templating import get_template_module
+from indico.web.flask.util import url_for
 from indico.web.forms.colors import get_colors
 
 
+#: How long a generated PDF timetable is reused. This must be less than
+#: a day since unclaimed files are deleted after that time.
+PDF_TIMETABLE_CACHE_TTL = 6 * 3600
+#: How long a request waits for a PDF timetable to be generated before
+#: showing a page which reloads until it is ready
+PDF_TIMETABLE_WAIT_TIMEOUT = 10
+#: How long the generation of a PDF timetable in the background may take
+PDF_TIMETABLE_TASK_TIMEOUT = 600
+
+pdf_timetable_cache = make_scoped_cache('pdf-timetable')
+
+#: How long the days on which events are shown in a category overview are cached
+CATEGORY_OVERVIEW_CACHE_TTL = 3600
+
+category_overview_cache = make_scoped_cache('category-overview')
+
+# the event columns used when displaying an event in the category overview
+_CATEGORY_OVERVIEW_EVENT_COLUMNS = (
+    Event.id, Event.category_id, Event.title, Event._type, Event.start_dt, Event.end_dt, Event.timezone,
+    Event.is_deleted, Event.label_id, Event.label_message, Event.protection_mode, Event.access_key,
+    Event.inherit_location, Event.own_venue_id, Event.own_venue_name, Event.own_room_id, Event.own_room_name,
+    Event.own_address, Event.own_map_url
+)
+
+
 def _query_events(categ_ids, day_start, day_end):
     event = db.aliased(Event)
     dates_overlap = lambda t: (t.start_dt >= day_start) & (t.start_dt <= day_end)
@@ -217,7 +251,12 @@ def get_category_timetable(categ_ids, start_dt, end_dt, detail_level='event', tz
         'ongoing_events': ongoing_events
     })
 
-    # according to detail level, ask for extra information from the DB
+    _add_timetable_details(result, event_ids, dates_overlap, detail_level, tz, grouped)
+    return result
+
+
+def _add_timetable_details(result, event_ids, dates_overlap, detail_level, tz, grouped):
+    """Add the sessions/contributions/breaks of events to a category timetable."""
     if detail_level != 'event':
         query = _query_blocks(event_ids, dates_overlap, detail_level)
         if grouped:
@@ -255,6 +294,92 @@ def get_category_timetable(categ_ids, start_dt, end_dt, detail_level='event', tz
         else:
             for b in query:
                 result[b.timetable_entry.event_id]['breaks'].append(b)
+
+
+def _get_category_overview_event_days(category, start_dt, end_dt):
+    tzname = category.display_tzinfo.zone
+    # all calculations are done with naive datetimes in the display timezone of the category
+    first = db.func.greatest(Event.start_dt.astimezone(tzname), start_dt.replace(tzinfo=None))
+    last = db.func.least(Event.end_dt.astimezone(tzname), end_dt.replace(tzinfo=None))
+    # an event is shown on the day it starts (within the period) and on each following day
+    # that starts before its end
+    days = db.func.generate_series(cast(cast(first, Date), db.DateTime), last - timedelta(microseconds=1),
+                                   timedelta(days=1))
+    query = (db.session.query(Event.id, cast(days, Date))
+             .filter(Event.category_chain_overlaps([category.id]),
+                     ~Event.is_deleted,
+                     Event.happens_between(start_dt.astimezone(utc), end_dt.astimezone(utc)),
+                     Event.is_visible_in(category.id),
+                     first < last))
+    event_days = defaultdict(list)
+    for event_id, day in query:
+        event_days[event_id].append(day)
+    return {event_id: sorted(days) for event_id, days in event_days.items()}
+
+
+def get_category_overview_event_days(category, start_dt, end_dt):
+    """Get the days on which events are shown in the overview of a category.
+
+    The days are calculated in the database using the display timezone of
+    the category. Since they are the same for all users, the result is
+    cached until an event or category changes.
+
+    :param category: The category whose events are shown
+    :param start_dt: start of the overview period (in display timezone)
+    :param end_dt: end of the overview period (in display timezone, exclusive)
+    :return: a dict mapping event IDs to a sorted list of dates
+    """
+    version = category_overview_cache.get('version', '')
+    key = f'{category.id}-{start_dt.isoformat()}-{end_dt.isoformat()}-{version}'
+    event_days = category_overview_cache.get(key)
+    if event_days is None:
+        event_days = _get_category_overview_event_days(category, start_dt, end_dt)
+        category_overview_cache.set(key, event_days, timeout=CATEGORY_OVERVIEW_CACHE_TTL)
+    return event_days
+
+
+def invalidate_category_overview_cache():
+    """Invalidate the cached event days of all category overviews."""
+    category_overview_cache.set('version', uuid.uuid4().hex)
+
+
+def get_category_overview_timetable(category, start_dt, end_dt, detail_level='event'):
+    """Retrieve the timetable data shown in the overview of a category.
+
+    This returns the same data as :func:`get_category_timetable` with
+    ``grouped=False``, but the events to show are taken from
+    :func:`get_category_overview_event_days` and only the event columns
+    needed by the overview are loaded.  In addition, ``event_days`` maps
+    the ID of each event to the days on which it is shown.
+
+    :param category: The category whose events are shown
+    :param start_dt: start of the overview period (in display timezone)
+    :param end_dt: end of the overview period (in display timezone, exclusive)
+    :param detail_level: the level of detail of information
+                         (``event|session|contribution``)
+    """
+    event_days = get_category_overview_event_days(category, start_dt, end_dt)
+    events = (Event.query
+              .filter(Event.id.in_(event_days), ~Event.is_deleted)
+              .options(load_only(*_CATEGORY_OVERVIEW_EVENT_COLUMNS),
+                       subqueryload(Event.person_links).joinedload(EventPersonLink.person),
+                       joinedload(Event.own_room).noload('owner'),
+                       joinedload(Event.own_venue),
+                       joinedload(Event.label),
+                       joinedload(Event.category).undefer('effective_icon_data'),
+                       undefer('effective_protection_mode'))
+              .all()) if event_days else []
+    result = defaultdict(lambda: defaultdict(list))
+    result.update({
+        'events': events,
+        'ongoing_events': [],
+        'event_days': event_days
+    })
+    day_start = start_dt.astimezone(utc)
+    day_end = end_dt.astimezone(utc)
+    dates_overlap = lambda t: (t.start_dt >= day_start) & (t.start_dt <= day_end)
+    _add_timetable_details(result, {e.id for e in events}, dates_overlap, detail_level, category.display_tzinfo,
+                           grouped=False)
     return result
 
 
@@ -472,12 +597,13 @@ def create_pdf(html, css, event) -> BytesIO:
     return f
 
 
-def generate_pdf_timetable(
+def render_pdf_timetable(
     event: Event,
     config=TimetableExportConfig(),  # noqa: B008 (frozen dataclass)
     *,
     only_session: Session | None = None,
-):
+) -> tuple[str, str]:
+    """Render the HTML and CSS used to generate a PDF timetable."""
     css = render_template('events/timetable/pdf/timetable.css')
     entries = get_nested_timetable(event)
     if only_session:
@@ -495,9 +621,122 @@ def generate_pdf_timetable(
 
     html = render_template('events/timetable/pdf/timetable.html', event=event, days=days, config=config,
                            program_config=program_config, only_session=only_session)
+    return html, css
+
+
+def generate_pdf_timetable(
+    event: Event,
+    config=TimetableExportConfig(),  # noqa: B008 (frozen dataclass)
+    *,
+    only_session: Session | None = None,
+):
+    html, css = render_pdf_timetable(event, config, only_session=only_session)
     return create_pdf(html, css, event)
 
 
+def get_pdf_timetable_version(event):
+    """Get a token which changes whenever the timetable of an event is modified.
+
+    See :func:`invalidate_pdf_timetables` for how it is changed.
+    """
+    version_key = f'version-{event.id}'
+    if (version := pdf_timetable_cache.get(version_key)) is None:
+        version = str(uuid.uuid4())
+        if not pdf_timetable_cache.add(version_key, version, timeout=PDF_TIMETABLE_CACHE_TTL):
+            version = pdf_timetable_cache.get(version_key, version)
+    return version
+
+
+def invalidate_pdf_timetables(event):
+    """Stop reusing the PDF timetables generated for an event."""
+    pdf_timetable_cache.delete(f'version-{event.id}')
+
+
+def _has_protected_timetable_objects(event):
+    return (Session.query.filter_by(event=event, is_deleted=False, protection_mode=ProtectionMode.protected)
+            .has_rows() or
+            Contribution.query.filter_by(event=event, is_deleted=False, protection_mode=ProtectionMode.protected)
+            .has_rows())
+
+
+def get_pdf_timetable_hash(
+    event: Event,
+    config=TimetableExportConfig(),  # noqa: B008 (frozen dataclass)
+    *,
+    only_session: Session | None = None,
+    user=None,
+    lang=None,
+):
+    """Get a hash identifying a PDF timetable.
+
+    The hash is based on the version of the timetable instead of its
+    contents, so it can be computed without rendering the timetable.
+
+    :param user: The user the PDF is generated for, in case the timetable
+                 contains entries which are not visible to everyone
+    :param lang: The language the PDF is generated in
+    """
+    data = json.dumps([event.id, get_pdf_timetable_version(event), only_session.id if only_session else None,
+                       user.id if user else None, lang, dataclasses.asdict(config)], sort_keys=True)
+    return hashlib.sha256(data.encode()).hexdigest()
+
+
+def get_cached_pdf_timetable(key):
+    """Get the previously generated PDF timetable with the given hash.
+
+    :return: A :class:`~indico.modules.files.models.files.File` or `None`
+    """
+    file_id = pdf_timetable_cache.get(key)
+    return File.get(file_id) if file_id is not None else None
+
+
+def is_pdf_timetable_task_known(task_id):
+    """Check whether a task generating a PDF timetable was started recently.
+
+    Celery reports tasks it does not know about as pending, so this is
+    needed to tell a task which has not started yet from one that never
+    existed or expired.
+    """
+    return pdf_timetable_cache.get(f'task-id-{task_id}') is not None
+
+
+def send_pdf_timetable(
+    event: Event,
+    config=TimetableExportConfig(),  # noqa: B008 (frozen dataclass)
+    *,
+    only_session: Session | None = None,
+    filename='timetable.pdf',
+):
+    """Send a PDF timetable, generating it in the background if needed.
+
+    The generated PDF is stored and reused until the timetable is modified
+    (see :func:`invalidate_pdf_timetables`) or the export settings change.
+    Since the timetable hides entries the user cannot access, PDFs of events
+    with protected sessions or contributions are only reused for the same
+    user.
+
+    When the PDF needs to be generated, this is done in a Celery task,
+    and requests for the same PDF arriving in the meantime wait for the
+    task that is already running instead of generating it again. The user
+    is redirected to a page which waits for the PDF and reloads itself
+    until it can be downloaded.
+    """
+    from indico.modules.events.timetable.tasks import generate_pdf_timetable_file
+    user = session.user if _has_protected_timetable_objects(event) else None
+    key = get_pdf_timetable_hash(event, config, only_session=only_session, user=user, lang=session.lang)
+    if (file := get_cached_pdf_timetable(key)) is not None:
+        return file.storage.send_file(file.storage_file_id, file.content_type, filename)
+    task_key = f'task-{key}'
+    task_id = str(uuid.uuid4())
+    if pdf_timetable_cache.add(task_key, task_id, timeout=PDF_TIMETABLE_TASK_TIMEOUT):
+        pdf_timetable_cache.set(f'task-id-{task_id}', key, timeout=PDF_TIMETABLE_TASK_TIMEOUT)
+        kwargs = {'only_session': only_session, 'user': session.user, 'lang': session.lang, 'filename': filename}
+        generate_pdf_timetable_file.apply_async((event, config, key), kwargs, task_id=task_id)
+    else:
+        task_id = pdf_timetable_cache.get(task_key)
+    return redirect(url_for('timetable.export_pdf_status', event, task_id=task_id))
+
+
 @memoize_request
 def get_top_level_entries(event):
     return event.timetable_entries.filter_by(parent_id=None).all()
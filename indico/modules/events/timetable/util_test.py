@@ -10,7 +10,9 @@ from datetime import date, datetime
 import pytest
 from pytz import utc
 
-from indico.modules.events.timetable.util import find_latest_entry_end_dt
+from indico.modules.events.timetable.util import (TimetableExportConfig, _get_category_overview_event_days,
+                                                  find_latest_entry_end_dt, get_pdf_timetable_hash,
+                                                  invalidate_pdf_timetables)
 
 
 @pytest.mark.parametrize(('event_start_dt', 'event_end_dt', 'day', 'valid'), (
@@ -27,3 +29,39 @@ def test_find_latest_entry_end_dt_valid_day(dummy_event, event_start_dt, event_e
     if not valid:
         with pytest.raises(ValueError):
             find_latest_entry_end_dt(obj=dummy_event, day=day)
+
+
+def test_get_pdf_timetable_hash(dummy_event, dummy_user):
+    key = get_pdf_timetable_hash(dummy_event, TimetableExportConfig(), lang='en_GB')
+    assert get_pdf_timetable_hash(dummy_event, TimetableExportConfig(), lang='en_GB') == key
+    assert get_pdf_timetable_hash(dummy_event, TimetableExportConfig(show_toc=False), lang='en_GB') != key
+    assert get_pdf_timetable_hash(dummy_event, TimetableExportConfig(), lang='fr_FR') != key
+    assert get_pdf_timetable_hash(dummy_event, TimetableExportConfig(), user=dummy_user, lang='en_GB') != key
+    invalidate_pdf_timetables(dummy_event)
+    assert get_pdf_timetable_hash(dummy_event, TimetableExportConfig(), lang='en_GB') != key
+
+
+def test_get_category_overview_event_days(dummy_category, create_event):
+    dummy_category.timezone = 'Europe/Zurich'
+    tz = dummy_category.display_tzinfo
+    # one day in zurich, but spans two days in UTC
+    event1 = create_event(start_dt=datetime(2025, 3, 3, 23, 30, tzinfo=utc),
+                          end_dt=datetime(2025, 3, 4, 1, 0, tzinfo=utc))
+    # starts before the period and ends at midnight
+    event2 = create_event(start_dt=datetime(2025, 2, 27, 8, 0, tzinfo=utc),
+                          end_dt=tz.localize(datetime(2025, 3, 5)))
+    # ends after the period
+    event3 = create_event(start_dt=datetime(2025, 3, 8, 8, 0, tzinfo=utc),
+                          end_dt=datetime(2025, 3, 12, 8, 0, tzinfo=utc))
+    # outside the period
+    create_event(start_dt=datetime(2025, 3, 20, 8, 0, tzinfo=utc), end_dt=datetime(2025, 3, 20, 9, 0, tzinfo=utc))
+    deleted = create_event(start_dt=datetime(2025, 3, 4, 8, 0, tzinfo=utc),
+                           end_dt=datetime(2025, 3, 4, 9, 0, tzinfo=utc))
+    deleted.is_deleted = True
+    start_dt = tz.localize(datetime(2025, 3, 3))
+    end_dt = tz.localize(datetime(2025, 3, 10))
+    assert _get_category_overview_event_days(dummy_category, start_dt, end_dt) == {
+        event1.id: [date(2025, 3, 4)],
+        event2.id: [date(2025, 3, 3), date(2025, 3, 4)],
+        event3.id: [date(2025, 3, 8), date(2025, 3, 9)],
+    }
@@ -13,11 +13,9 @@ import warnings
 from collections import defaultdict
 from contextlib import contextmanager
 from copy import deepcopy
-from io import BytesIO
 from mimetypes import guess_extension
 from tempfile import NamedTemporaryFile
 from urllib.parse import urlsplit
-from zipfile import ZipFile
 
 from flask import current_app, flash, g, redirect, request, session
 from sqlalchemy import inspect
@@ -48,13 +46,14 @@ from indico.modules.events.timetable.models.breaks import Break
 from indico.modules.events.timetable.models.entries import TimetableEntry
 from indico.modules.networks import IPNetworkGroup
 from indico.modules.users import User
+from indico.util.archives import ZipEntry, iter_zip
 from indico.util.caching import memoize_request
-from indico.util.fs import chmod_umask, secure_filename
+from indico.util.fs import secure_filename
 from indico.util.i18n import _
 from indico.util.iterables import materialize_iterable
 from indico.util.string import strip_tags
 from indico.util.user import principal_from_identifier
-from indico.web.flask.util import send_file, url_for
+from indico.web.flask.util import send_stream, url_for
 from indico.web.forms.colors import get_colors
 
 
@@ -710,35 +709,38 @@ class ZipGeneratorMixin:
     def _iter_items(self, files_holder):
         yield from files_holder
 
-    def _get_item_path(self, item):
-        return item.get_local_path()
+    def _get_zip_entry(self, item, name):
+        return ZipEntry(name, item.open, item.size, item.content_type)
 
-    def _generate_zip_file(self, files_holder, name_prefix='material', name_suffix=None, return_file=False):
-        """Generate a zip file containing the files passed.
+    def _get_zip_entries(self, files_holder):
+        """Get the entries of a zip file containing the files passed.
+
+        :param files_holder: An iterable (or an iterable containing) object that
+                             contains the files to be added in the zip file.
+        :return: A list of :class:`.ZipEntry` objects
+        """
+        self.used_filenames = set()
+        entries = []
+        for item in self._iter_items(files_holder):
+            name = self._prepare_folder_structure(item)
+            self.used_filenames.add(name)
+            entries.append(self._get_zip_entry(item, name))
+        return entries
+
+    def _generate_zip_file(self, files_holder, name_prefix='material', name_suffix=None):
+        """Send a zip file containing the files passed.
+
+        The zip file is sent while it is being generated, so the download
+        starts immediately and it is never written to disk.
 
         :param files_holder: An iterable (or an iterable containing) object that
                              contains the files to be added in the zip file.
         :param name_prefix: The prefix to the zip file name
         :param name_suffix: The suffix to the zip file name
-        :param return_file: Return the temp file instead of a response
         """
-        temp_file = NamedTemporaryFile(suffix='.zip', dir=config.TEMP_DIR, delete=False)  # noqa: SIM115
-        with ZipFile(temp_file.name, 'w', allowZip64=True) as zip_handler:
-            self.used_filenames = set()
-            for item in self._iter_items(files_holder):
-                name = self._prepare_folder_structure(item)
-                self.used_filenames.add(name)
-                with self._get_item_path(item) as filepath:
-                    if isinstance(filepath, BytesIO):
-                        zip_handler.writestr(name, filepath.getvalue())
-                    else:
-                        zip_handler.write(filepath, name)
-
+        entries = self._get_zip_entries(files_holder)
         zip_file_name = f'{name_prefix}-{name_suffix}.zip' if name_suffix else f'{name_prefix}.zip'
-        chmod_umask(temp_file.name)
-        if return_file:
-            return temp_file
-        return send_file(zip_file_name, temp_file.name, 'application/zip', inline=False)
+        return send_stream(zip_file_name, iter_zip(entries), 'application/zip')
 
     def _prepare_folder_structure(self, item):
         file_name = secure_filename(f'{item.id}_{item.filename}', str(item.id))
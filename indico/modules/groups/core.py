@@ -18,6 +18,7 @@ from indico.core.db import db
 from indico.core.db.sqlalchemy.principals import PrincipalType
 from indico.modules.auth import Identity
 from indico.modules.groups.models.groups import LocalGroup
+from indico.modules.users.memberships import get_principal_memberships
 from indico.util.caching import memoize_request
 
 
@@ -158,7 +159,7 @@ class _LocalGroupProxy(GroupProxy):
     def has_member(self, user):
         if not config.LOCAL_GROUPS:
             return False
-        return user and self.group in user.local_groups
+        return user and self.id in get_principal_memberships(user).local_groups
 
     def get_members(self):
         return set(self.group.members)
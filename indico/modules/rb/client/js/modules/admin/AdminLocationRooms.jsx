@@ -5,6 +5,8 @@
 // modify it under the terms of the MIT License; see the
 // LICENSE file for more details.
 
+import occupancyExportURL from 'indico-url:rb.admin_rooms_occupancy_export';
+
 import PropTypes from 'prop-types';
 import React, {useState} from 'react';
 import {connect} from 'react-redux';
@@ -57,11 +59,26 @@ function AdminLocationRooms({location, isFetching, fetchRooms, filters: {text}})
         <Translate>
           Location: <Param name="location" value={location.name} />
         </Translate>
-        <Button
-          size="small"
-          content={Translate.string('Add room')}
-          onClick={() => setAdding(true)}
-        />
+        <div>
+          <Button.Group size="small" basic>
+            <Button
+              as="a"
+              icon="download"
+              content={Translate.string('Occupancy (CSV)')}
+              href={occupancyExportURL({format: 'csv', location_id: location.id})}
+            />
+            <Button
+              as="a"
+              content={Translate.string('XLSX')}
+              href={occupancyExportURL({format: 'xlsx', location_id: location.id})}
+            />
+          </Button.Group>{' '}
+          <Button
+            size="small"
+            content={Translate.string('Add room')}
+            onClick={() => setAdding(true)}
+          />
+        </div>
       </Header>
 
       <SearchBar />
@@ -10,7 +10,7 @@ import React, {useState} from 'react';
 import {connect} from 'react-redux';
 import {Button, Confirm, Item} from 'semantic-ui-react';
 
-import {Translate} from 'indico/react/i18n';
+import {Param, Translate} from 'indico/react/i18n';
 
 import {RoomEditModal} from '../../common/rooms';
 import SpriteImage from '../../components/SpriteImage';
@@ -45,6 +45,14 @@ function AdminRoomItem({room, locationId, deleteRoom, fetchRooms}) {
         </Item.Header>
         <Item.Meta>{room.ownerName}</Item.Meta>
         <Item.Description>{room.comments}</Item.Description>
+        {room.occupancy !== null && (
+          <Item.Extra>
+            <Translate>
+              Occupancy in the last 30 days:{' '}
+              <Param name="occupancy" value={`${Math.round(room.occupancy * 100)}%`} />
+            </Translate>
+          </Item.Extra>
+        )}
       </Item.Content>
       {editing && (
         <RoomEditModal roomId={room.id} locationId={locationId} onClose={handleCloseModal} />
@@ -5,9 +5,11 @@
 # modify it under the terms of the MIT License; see the
 # LICENSE file for more details.
 
+from datetime import date
 from io import BytesIO
 from operator import itemgetter
 
+from dateutil.relativedelta import relativedelta
 from flask import jsonify, request, session
 from marshmallow import missing, validate
 from PIL import Image
@@ -37,12 +39,16 @@ from indico.modules.rb.schemas import (AdminRoomSchema, EquipmentTypeArgs, Featu
                                        admin_equipment_type_schema, admin_locations_schema, bookable_hours_schema,
                                        map_areas_schema, nonbookable_periods_admin_schema, room_attribute_schema,
                                        room_equipment_schema, room_feature_schema, room_update_schema)
+from indico.modules.rb.statistics import (calculate_bookable_time_per_room, calculate_each_room_occupancy,
+                                          calculate_rooms_daily_booked_time)
 from indico.modules.rb.util import (WEEKDAYS, build_rooms_spritesheet, get_resized_room_photo, rb_is_admin,
                                     rb_is_location_manager, remove_room_spritesheet_photo)
-from indico.util.date_time import overlaps
+from indico.util.date_time import iterdays, overlaps
 from indico.util.i18n import _
 from indico.util.iterables import group_list
 from indico.util.marshmallow import ModelField
+from indico.util.spreadsheets import send_csv, send_xlsx
+from indico.util.string import natural_sort_key
 from indico.web.args import use_args, use_kwargs, use_rh_kwargs
 from indico.web.flask.util import send_file
 from indico.web.util import ExpectedError
@@ -443,7 +449,8 @@ class RHRooms(RHRoomBookingAdminBase):
 
     def _process_GET(self):
         rooms = Room.query.filter_by(is_deleted=False).order_by(db.func.indico.natsort(Room.full_name)).all()
-        return AdminRoomSchema().jsonify(rooms, many=True)
+        occupancy = calculate_each_room_occupancy(rooms)
+        return AdminRoomSchema(context={'occupancy': occupancy}).jsonify(rooms, many=True)
 
     @use_kwargs({'location': ModelField(Location, filter_deleted=True, required=True, data_key='location_id')})
     @use_args(RoomUpdateArgsSchema)
@@ -459,6 +466,47 @@ class RHRooms(RHRoomBookingAdminBase):
         return jsonify(id=room.id)
 
 
+class RHRoomsOccupancyExport(RHRoomBookingAdminBase):
+    """Export the daily occupancy of all rooms."""
+
+    def _skip_admin_check(self):
+        return rb_is_location_manager(session.user)
+
+    @use_kwargs({
+        'start_date': fields.Date(load_default=lambda: date.today() - relativedelta(days=30)),
+        'end_date': fields.Date(load_default=lambda: date.today() - relativedelta(days=1)),
+        'location': ModelField(Location, filter_deleted=True, data_key='location_id', load_default=None),
+    }, location='query')
+    def _process(self, start_date, end_date, location):
+        if start_date > end_date:
+            abort(422, messages={'end_date': ['End date cannot be before start date']})
+        query = Room.query.filter_by(is_deleted=False).options(joinedload('location'))
+        if location:
+            query = query.filter_by(location=location)
+        rooms = [room for room in query if room.location.can_manage(session.user)]
+        rooms.sort(key=lambda room: natural_sort_key(room.location_name + room.full_name))
+        days = [day.date() for day in iterdays(start_date, end_date)]
+        daily_booked_time = calculate_rooms_daily_booked_time(rooms, start_date, end_date)
+        bookable_time = calculate_bookable_time_per_room(start_date, end_date)
+        headers = ['Location', 'Room', 'Booked hours', 'Bookable hours', 'Occupancy (%)',
+                   *(day.isoformat() for day in days)]
+        rows = []
+        for room in rooms:
+            booked_time = daily_booked_time[room.id]
+            rows.append({
+                'Location': room.location_name,
+                'Room': room.full_name,
+                'Booked hours': round(sum(booked_time) / 3600, 2),
+                'Bookable hours': round(bookable_time / 3600, 2),
+                'Occupancy (%)': round(sum(booked_time) / bookable_time * 100, 2) if bookable_time else 0,
+                **{day.isoformat(): round(seconds / 3600, 2) for day, seconds in zip(days, booked_time, strict=True)}
+            })
+        if request.view_args['format'] == 'csv':
+            return send_csv('room-occupancy.csv', headers, rows)
+        else:
+            return send_xlsx('room-occupancy.xlsx', headers, rows)
+
+
 _base_args = {
     'default': fields.Bool(),
     'bounds': fields.Nested({
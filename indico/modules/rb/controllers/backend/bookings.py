@@ -11,7 +11,7 @@ from datetime import date, datetime, time, timedelta
 import dateutil
 from flask import jsonify, request, session
 from marshmallow import fields, validate
-from sqlalchemy.orm import joinedload
+from sqlalchemy.orm import contains_eager, joinedload
 from werkzeug.exceptions import BadRequest, Forbidden, NotFound
 
 from indico.core import signals
@@ -499,6 +499,18 @@ class RHBookingOccurrenceLink(RHBookingBase):
         return jsonify(occurrence=reservation_occurrences_schema.dump(self.occurrence, many=False))
 
 
+def _get_export_occurrences(room_ids, start_date, end_date):
+    return (ReservationOccurrence.query
+            .join(ReservationOccurrence.reservation)
+            .filter(Reservation.room_id.in_(room_ids),
+                    ReservationOccurrence.is_valid,
+                    db_dates_overlap(ReservationOccurrence,
+                                     'start_dt', datetime.combine(start_date, time()),
+                                     'end_dt', datetime.combine(end_date, time.max)))
+            .options(contains_eager(ReservationOccurrence.reservation).joinedload(Reservation.room))
+            .yield_per(1000))
+
+
 class RHBookingExport(RHRoomBookingBase):
     @use_kwargs({
         'room_ids': fields.List(fields.Int(), required=True),
@@ -507,17 +519,11 @@ class RHBookingExport(RHRoomBookingBase):
         'format': fields.Str(validate=validate.OneOf({'csv', 'xlsx'}), required=True),
     })
     def _process(self, room_ids, start_date, end_date, format):
-        occurrences = (ReservationOccurrence.query
-                       .join(ReservationOccurrence.reservation)
-                       .filter(Reservation.room_id.in_(room_ids),
-                               ReservationOccurrence.is_valid,
-                               db_dates_overlap(ReservationOccurrence,
-                                                'start_dt', datetime.combine(start_date, time()),
-                                                'end_dt', datetime.combine(end_date, time.max)))).all()
-
+        # the spreadsheet is generated when downloading it, so we can stream it
+        # instead of keeping all the rows in memory (and in the cache)
         token = str(uuid.uuid4())
-        headers, rows = generate_spreadsheet_from_occurrences(occurrences)
-        _export_cache.set(token, {'headers': headers, 'rows': rows}, timeout=1800)
+        _export_cache.set(token, {'room_ids': room_ids, 'start_date': start_date, 'end_date': end_date},
+                          timeout=1800)
         download_url = url_for('rb.export_bookings_file', format=format, token=token)
         return jsonify(url=download_url)
 
@@ -525,8 +531,11 @@ class RHBookingExport(RHRoomBookingBase):
 class RHBookingExportFile(RHRoomBookingBase):
     def _process(self):
         data = _export_cache.get(request.args['token'])
+        if data is None:
+            raise NotFound(_('This export has expired. Please export the bookings again.'))
+        headers, rows = generate_spreadsheet_from_occurrences(_get_export_occurrences(**data))
         file_format = request.view_args['format']
         if file_format == 'csv':
-            return send_csv('bookings.csv', **data)
+            return send_csv('bookings.csv', headers, rows, stream=True)
         elif file_format == 'xlsx':
-            return send_xlsx('bookings.xlsx', **data)
+            return send_xlsx('bookings.xlsx', headers, rows, stream=True)
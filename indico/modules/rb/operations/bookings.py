@@ -35,6 +35,7 @@ from indico.modules.rb.util import (WEEKDAYS, group_by_occurrence_date, serializ
                                     serialize_unbookable_hours)
 from indico.util.date_time import iterdays, server_to_utc
 from indico.util.i18n import _
+from indico.util.intervals import IntervalIndex
 from indico.util.iterables import group_list
 from indico.util.string import natural_sort_key
 
@@ -156,8 +157,10 @@ def get_rooms_availability(rooms, start_dt, end_dt, repeat_frequency, repeat_int
 
 
 def get_room_candidates(candidates, conflicts):
+    index = IntervalIndex(conflicts)
     return [candidate for candidate in candidates
-            if not (any(candidate.overlaps(conflict) for conflict in conflicts))]
+            if not any(candidate.overlaps(conflict)
+                       for conflict in index.overlapping(candidate.start_dt, candidate.end_dt))]
 
 
 def _bookings_query(filters, *, noload_room=False, load_room_acl=False):
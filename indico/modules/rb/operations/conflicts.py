@@ -6,8 +6,8 @@
 # LICENSE file for more details.
 
 from collections import defaultdict
-from datetime import datetime
-from itertools import combinations
+from datetime import datetime, timedelta
+from operator import itemgetter
 
 from flask import session
 from sqlalchemy.orm import contains_eager
@@ -18,6 +18,7 @@ from indico.modules.rb.models.rooms import Room
 from indico.modules.rb.util import (WEEKDAYS, TempReservationConcurrentOccurrence, TempReservationOccurrence,
                                     check_empty_candidates, rb_is_admin)
 from indico.util.date_time import get_overlap
+from indico.util.intervals import IntervalIndex
 from indico.util.iterables import group_list
 
 
@@ -80,10 +81,9 @@ def get_room_bookings_conflicts(candidates, occurrences, skip_conflicts_with=fro
     conflicts = set()
     pre_conflicts = set()
     conflicting_candidates = set()
+    index = IntervalIndex(occ for occ in occurrences if occ.reservation.id not in skip_conflicts_with)
     for candidate in candidates:
-        for occurrence in occurrences:
-            if occurrence.reservation.id in skip_conflicts_with:
-                continue
+        for occurrence in index.overlapping(candidate.start_dt, candidate.end_dt):
             if candidate.overlaps(occurrence):
                 overlap = candidate.get_overlap(occurrence)
                 obj = TempReservationOccurrence(*overlap, reservation=occurrence.reservation)
@@ -98,10 +98,14 @@ def get_room_bookings_conflicts(candidates, occurrences, skip_conflicts_with=fro
 def get_room_blockings_conflicts(room_id, candidates, occurrences, allow_admin):
     conflicts = set()
     conflicting_candidates = set()
+    # blockings include their end date, so the day after is the end of the interval
+    index = IntervalIndex(occurrences, start=lambda occ: occ.blocking.start_date,
+                          end=lambda occ: occ.blocking.end_date + timedelta(days=1))
     for candidate in candidates:
-        for occurrence in occurrences:
+        candidate_date = candidate.start_dt.date()
+        for occurrence in index.overlapping(candidate_date, candidate_date + timedelta(days=1)):
             blocking = occurrence.blocking
-            if blocking.start_date <= candidate.start_dt.date() <= blocking.end_date:
+            if blocking.start_date <= candidate_date <= blocking.end_date:
                 if blocking.can_override(session.user, room=Room.get(room_id), allow_admin=allow_admin):
                     continue
                 conflicting_candidates.add(candidate)
@@ -113,8 +117,9 @@ def get_room_blockings_conflicts(room_id, candidates, occurrences, allow_admin):
 def get_room_nonbookable_periods_conflicts(candidates, occurrences):
     conflicts = set()
     conflicting_candidates = set()
+    index = IntervalIndex(occurrences)
     for candidate in candidates:
-        for occurrence in occurrences:
+        for occurrence in index.overlapping(candidate.start_dt, candidate.end_dt):
             overlap = get_overlap((candidate.start_dt, candidate.end_dt), (occurrence.start_dt, occurrence.end_dt))
             if overlap.count(None) != len(overlap):
                 conflicting_candidates.add(candidate)
@@ -142,11 +147,15 @@ def get_room_unbookable_hours_conflicts(candidates, occurrences):
 
 def get_concurrent_pre_bookings(pre_bookings, skip_conflicts_with=frozenset()):
     concurrent_pre_bookings = []
-    for (x, y) in combinations(pre_bookings, 2):
-        if any(pre_booking.reservation.id in skip_conflicts_with for pre_booking in [x, y]):
-            continue
-        if x.overlaps(y):
-            overlap = x.get_overlap(y)
-            obj = TempReservationConcurrentOccurrence(*overlap, reservations=[x.reservation, y.reservation])
-            concurrent_pre_bookings.append(obj)
+    pre_bookings = [(i, pre_booking) for i, pre_booking in enumerate(pre_bookings)
+                    if pre_booking.reservation.id not in skip_conflicts_with]
+    index = IntervalIndex(pre_bookings, start=lambda item: item[1].start_dt, end=lambda item: item[1].end_dt)
+    for i, x in pre_bookings:
+        # only look at the pairs where `x` comes first so we get every pair just once
+        overlapping = sorted(((j, y) for j, y in index.overlapping(x.start_dt, x.end_dt) if j > i), key=itemgetter(0))
+        for __, y in overlapping:
+            if x.overlaps(y):
+                overlap = x.get_overlap(y)
+                obj = TempReservationConcurrentOccurrence(*overlap, reservations=[x.reservation, y.reservation])
+                concurrent_pre_bookings.append(obj)
     return concurrent_pre_bookings
@@ -22,7 +22,7 @@ from indico.modules.rb.models.reservation_occurrences import ReservationOccurren
 from indico.modules.rb.models.reservations import Reservation
 from indico.modules.rb.models.room_features import RoomFeature
 from indico.modules.rb.models.rooms import Room
-from indico.modules.rb.statistics import calculate_rooms_occupancy
+from indico.modules.rb.statistics import calculate_bookable_time_per_room, calculate_rooms_daily_booked_time
 from indico.modules.rb.util import rb_is_admin
 from indico.util.caching import memoize_redis
 
@@ -111,18 +111,21 @@ def get_room_statistics(room):
     }
     ranges = [7, 30, 365]
     end_date = date.today()
-    for days in ranges:
-        start_date = date.today() - relativedelta(days=days)
-        count = (ReservationOccurrence.query
-                 .join(ReservationOccurrence.reservation)
-                 .join(Reservation.room)
-                 .filter(Room.id == room.id,
-                         ReservationOccurrence.is_valid,
-                         db_dates_overlap(ReservationOccurrence,
-                                          'start_dt', datetime.combine(start_date, time()),
-                                          'end_dt', datetime.combine(end_date, time.max)))
-                 .count())
-        percentage = calculate_rooms_occupancy([room], start_date, end_date) * 100
+    start_dates = {days: end_date - relativedelta(days=days) for days in ranges}
+    counts = (ReservationOccurrence.query
+              .join(ReservationOccurrence.reservation)
+              .filter(Reservation.room_id == room.id,
+                      ReservationOccurrence.is_valid)
+              .with_entities(*(db.func.count().filter(db_dates_overlap(ReservationOccurrence,
+                                                                       'start_dt', datetime.combine(start_date, time()),
+                                                                       'end_dt', datetime.combine(end_date, time.max)))
+                               for start_date in start_dates.values()))
+              .one())
+    # the booked time is calculated for the longest range and then summed up for each range
+    booked_time = calculate_rooms_daily_booked_time([room], min(start_dates.values()), end_date)[room.id]
+    for days, count in zip(ranges, counts, strict=True):
+        bookable_time = calculate_bookable_time_per_room(start_dates[days], end_date)
+        percentage = (sum(booked_time[-(days + 1):]) / bookable_time * 100) if bookable_time else 0
         if count > 0 or percentage > 0:
             data['count']['values'].append({'days': days, 'value': count})
             data['percentage']['values'].append({'days': days, 'value': percentage})
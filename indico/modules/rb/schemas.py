@@ -70,9 +70,15 @@ class RoomSchema(mm.SQLAlchemyAutoSchema):
 
 
 class AdminRoomSchema(mm.SQLAlchemyAutoSchema):
+    occupancy = Method('_get_occupancy')
+
     class Meta:
         modal = Room
-        fields = ('id', 'location_id', 'name', 'full_name', 'sprite_position', 'owner_name', 'comments')
+        fields = ('id', 'location_id', 'name', 'full_name', 'sprite_position', 'owner_name', 'comments', 'occupancy')
+
+    def _get_occupancy(self, room):
+        # calculated for all rooms at once, see `calculate_each_room_occupancy`
+        return self.context.get('occupancy', {}).get(room.id)
 
 
 class RoomUpdateSchema(RoomSchema):
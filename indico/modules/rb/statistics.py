@@ -18,47 +18,100 @@ from indico.util.date_time import iterdays
 WORKING_TIME_PERIODS = ((time(8, 30), time(12, 30)), (time(13, 30), time(17, 30)))
 
 
-def calculate_rooms_bookable_time(rooms, start_date=None, end_date=None):
-    if end_date is None:
-        end_date = date.today() - relativedelta(days=1)
-    if start_date is None:
-        start_date = end_date - relativedelta(days=29)
+def calculate_bookable_time_per_room(start_date, end_date):
+    """Calculate the working time (in seconds) of a single room in a given period."""
     working_time_per_day = sum((datetime.combine(date.today(), end) - datetime.combine(date.today(), start)).seconds
                                for start, end in WORKING_TIME_PERIODS)
     working_days = sum(1 for __ in iterdays(start_date, end_date, skip_weekends=True))
-    return working_days * working_time_per_day * len(rooms)
+    return working_days * working_time_per_day
 
 
-def calculate_rooms_booked_time(rooms, start_date=None, end_date=None):
+def calculate_rooms_bookable_time(rooms, start_date=None, end_date=None):
     if end_date is None:
         end_date = date.today() - relativedelta(days=1)
     if start_date is None:
         start_date = end_date - relativedelta(days=29)
-    # Reservations on working days
-    reservations_query = (Reservation.query
-                          .filter(Reservation.room_id.in_(r.id for r in rooms),
-                                  db.extract('dow', ReservationOccurrence.start_dt).between(1, 5),
-                                  db.cast(ReservationOccurrence.start_dt, db.Date) >= start_date,
-                                  db.cast(ReservationOccurrence.end_dt, db.Date) <= end_date,
-                                  ReservationOccurrence.is_valid)
-                          .join(Reservation.occurrences))
+    return calculate_bookable_time_per_room(start_date, end_date) * len(rooms)
 
+
+def _get_working_time_overlap():
     rsv_start = db.cast(ReservationOccurrence.start_dt, db.TIME)
     rsv_end = db.cast(ReservationOccurrence.end_dt, db.TIME)
     slots = ((db.cast(start, db.TIME), db.cast(end, db.TIME)) for start, end in WORKING_TIME_PERIODS)
 
     # this basically handles all possible ways an occurrence overlaps with each one of the working time slots
-    overlaps = sum(db.case([
+    return sum(db.case([
         ((rsv_start < start) & (rsv_end > end), db.extract('epoch', end - start)),
         ((rsv_start < start) & (rsv_end > start) & (rsv_end <= end), db.extract('epoch', rsv_end - start)),
         ((rsv_start >= start) & (rsv_start < end) & (rsv_end > end), db.extract('epoch', end - rsv_start)),
         ((rsv_start >= start) & (rsv_end <= end), db.extract('epoch', rsv_end - rsv_start))
     ], else_=0) for start, end in slots)
 
-    return reservations_query.with_entities(db.func.sum(overlaps)).scalar() or 0
+
+def _get_working_days_occurrences_query(room_ids, start_date, end_date):
+    # Reservations on working days
+    return (Reservation.query
+            .filter(Reservation.room_id.in_(room_ids),
+                    db.extract('dow', ReservationOccurrence.start_dt).between(1, 5),
+                    db.cast(ReservationOccurrence.start_dt, db.Date) >= start_date,
+                    db.cast(ReservationOccurrence.end_dt, db.Date) <= end_date,
+                    ReservationOccurrence.is_valid)
+            .join(Reservation.occurrences))
+
+
+def calculate_rooms_booked_time(rooms, start_date=None, end_date=None):
+    if end_date is None:
+        end_date = date.today() - relativedelta(days=1)
+    if start_date is None:
+        start_date = end_date - relativedelta(days=29)
+    reservations_query = _get_working_days_occurrences_query([r.id for r in rooms], start_date, end_date)
+    return reservations_query.with_entities(db.func.sum(_get_working_time_overlap())).scalar() or 0
+
+
+def calculate_rooms_daily_booked_time(rooms, start_date, end_date):
+    """Calculate the booked working time of each room on each day.
+
+    All rooms are handled in a single query, so this should be used
+    instead of :func:`calculate_rooms_booked_time` when statistics for
+    many rooms or for several periods are needed.
+
+    :return: A dict mapping room IDs to lists containing the booked
+             seconds for each day from `start_date` to `end_date`
+             (inclusive), i.e. the value for a given day is at index
+             ``(day - start_date).days``.
+    """
+    room_ids = [r.id for r in rooms]
+    num_days = (end_date - start_date).days + 1
+    booked_time = {room_id: [0] * num_days for room_id in room_ids}
+    if num_days <= 0 or not room_ids:
+        return booked_time
+    occurrence_date = db.cast(ReservationOccurrence.start_dt, db.Date)
+    query = (_get_working_days_occurrences_query(room_ids, start_date, end_date)
+             .with_entities(Reservation.room_id, occurrence_date, db.func.sum(_get_working_time_overlap()))
+             .group_by(Reservation.room_id, occurrence_date))
+    for room_id, day, seconds in query:
+        booked_time[room_id][(day - start_date).days] = int(seconds)
+    return booked_time
 
 
 def calculate_rooms_occupancy(rooms, start=None, end=None):
     bookable_time = calculate_rooms_bookable_time(rooms, start, end)
     booked_time = calculate_rooms_booked_time(rooms, start, end)
     return booked_time / bookable_time if bookable_time else 0
+
+
+def calculate_each_room_occupancy(rooms, start_date=None, end_date=None):
+    """Calculate the occupancy of each room in a given period.
+
+    Unlike :func:`calculate_rooms_occupancy`, which calculates the
+    occupancy of all the rooms together, this returns a dict mapping
+    room IDs to the occupancy of each room.
+    """
+    if end_date is None:
+        end_date = date.today() - relativedelta(days=1)
+    if start_date is None:
+        start_date = end_date - relativedelta(days=29)
+    bookable_time = calculate_bookable_time_per_room(start_date, end_date)
+    daily_booked_time = calculate_rooms_daily_booked_time(rooms, start_date, end_date)
+    return {room_id: (sum(booked_time) / bookable_time if bookable_time else 0)
+            for room_id, booked_time in daily_booked_time.items()}
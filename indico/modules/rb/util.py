@@ -260,15 +260,17 @@ def generate_spreadsheet_from_occurrences(occurrences):
     """Generate spreadsheet data from a given booking occurrence list.
 
     :param occurrences: The booking occurrences to include in the spreadsheet
+    :return: A tuple containing the column names and a generator yielding
+             the rows, so they can be written to the spreadsheet one by one
     """
     headers = ['Room', 'Booking ID', 'Booked for', 'Reason', 'Occurrence start', 'Occurrence end']
-    rows = [{'Room': occ.reservation.room.full_name,
+    rows = ({'Room': occ.reservation.room.full_name,
              'Booking ID': occ.reservation.id,
              'Booked for': occ.reservation.booked_for_name,
              'Reason': occ.reservation.booking_reason,
              'Occurrence start': occ.start_dt,
              'Occurrence end': occ.end_dt}
-            for occ in occurrences]
+            for occ in occurrences)
     return headers, rows
 
 
@@ -21,65 +21,99 @@ import {camelizeKeys, snakifyKeys} from 'indico/utils/case';
  * This modal shows to the user any non-fatal templating errors which may have happened during
  * the templating process. The user may choose to download the result anyway (pre-downloaded by
  * the browser).
+ *
+ * It also lists the documents which could not be generated at all; those cannot be retried
+ * since generating them again would fail the same way.
  */
-function PrintingErrorsModal({onRetry, onClose, errors}) {
+function PrintingErrorsModal({onRetry, onClose, errors, renderErrors}) {
   const [open, setOpen] = useState(true);
+  const canRetry = !!onRetry && errors.length > 0;
   return (
     <Modal open={open} onClose={onClose} closeIcon>
       <Modal.Header>
-        <Translate>Templating Errors</Translate>
+        {errors.length ? (
+          <Translate>Templating Errors</Translate>
+        ) : (
+          <Translate>Generation Errors</Translate>
+        )}
       </Modal.Header>
       <Modal.Content>
         <Message error>
           <Translate>There were some errors while trying to generate your documents.</Translate>
         </Message>
-        <Table celled fixed>
-          <Table.Header>
-            <Table.Row>
-              <Table.HeaderCell>
-                <Translate>Registrant's name</Translate>
-              </Table.HeaderCell>
-              <Table.HeaderCell>
-                <Translate>Missing fields</Translate>
-              </Table.HeaderCell>
-            </Table.Row>
-          </Table.Header>
-          <Table.Body>
-            {errors.map(({registration, undefineds}) => (
-              <Table.Row key={registration.id}>
-                <Table.Cell>{registration.fullName}</Table.Cell>
-                <Table.Cell>
-                  {undefineds.map(name => (
-                    <Label key={`${registration.id}-${name}`} color="red">
-                      {name}
-                    </Label>
-                  ))}
-                </Table.Cell>
+        {errors.length > 0 && (
+          <Table celled fixed>
+            <Table.Header>
+              <Table.Row>
+                <Table.HeaderCell>
+                  <Translate>Registrant's name</Translate>
+                </Table.HeaderCell>
+                <Table.HeaderCell>
+                  <Translate>Missing fields</Translate>
+                </Table.HeaderCell>
+              </Table.Row>
+            </Table.Header>
+            <Table.Body>
+              {errors.map(({registration, undefineds}) => (
+                <Table.Row key={registration.id}>
+                  <Table.Cell>{registration.fullName}</Table.Cell>
+                  <Table.Cell>
+                    {undefineds.map(name => (
+                      <Label key={`${registration.id}-${name}`} color="red">
+                        {name}
+                      </Label>
+                    ))}
+                  </Table.Cell>
+                </Table.Row>
+              ))}
+            </Table.Body>
+          </Table>
+        )}
+        {renderErrors.length > 0 && (
+          <Table celled fixed>
+            <Table.Header>
+              <Table.Row>
+                <Table.HeaderCell>
+                  <Translate>Registrant's name</Translate>
+                </Table.HeaderCell>
+                <Table.HeaderCell>
+                  <Translate>Document not generated</Translate>
+                </Table.HeaderCell>
               </Table.Row>
-            ))}
-          </Table.Body>
-        </Table>
+            </Table.Header>
+            <Table.Body>
+              {renderErrors.map(({registration, error}) => (
+                <Table.Row key={registration.id}>
+                  <Table.Cell>{registration.fullName}</Table.Cell>
+                  <Table.Cell>{error}</Table.Cell>
+                </Table.Row>
+              ))}
+            </Table.Body>
+          </Table>
+        )}
       </Modal.Content>
       <Modal.Actions>
         <ButtonGroup>
-          <Button
-            onClick={async () => {
-              await onRetry();
-              setOpen(false);
-              onClose();
-            }}
-            primary
-          >
-            <Icon name="sync" />
-            <Translate>Generate anyway</Translate>
-          </Button>
+          {canRetry && (
+            <Button
+              onClick={async () => {
+                await onRetry();
+                setOpen(false);
+                onClose();
+              }}
+              primary
+            >
+              <Icon name="sync" />
+              <Translate>Generate anyway</Translate>
+            </Button>
+          )}
           <Button
             onClick={() => {
               setOpen(false);
               onClose();
             }}
           >
-            <Translate>Cancel</Translate>
+            {canRetry ? <Translate>Cancel</Translate> : <Translate>Close</Translate>}
           </Button>
         </ButtonGroup>
       </Modal.Actions>
@@ -87,20 +121,47 @@ function PrintingErrorsModal({onRetry, onClose, errors}) {
   );
 }
 
+const registrationPropType = PropTypes.shape({
+  firstName: PropTypes.string,
+  lastName: PropTypes.string,
+});
+
 PrintingErrorsModal.propTypes = {
-  onRetry: PropTypes.func.isRequired,
+  onRetry: PropTypes.func,
   onClose: PropTypes.func.isRequired,
   errors: PropTypes.arrayOf(
     PropTypes.shape({
-      registration: PropTypes.shape({
-        firstName: PropTypes.string,
-        lastName: PropTypes.string,
-      }),
+      registration: registrationPropType,
       undefineds: PropTypes.arrayOf(PropTypes.string),
     })
-  ).isRequired,
+  ),
+  renderErrors: PropTypes.arrayOf(
+    PropTypes.shape({
+      registration: registrationPropType,
+      error: PropTypes.string,
+    })
+  ),
+};
+
+PrintingErrorsModal.defaultProps = {
+  onRetry: null,
+  errors: [],
+  renderErrors: [],
 };
 
+const showPrintingErrors = props =>
+  new Promise(resolve => {
+    injectModal(resolveModal => (
+      <PrintingErrorsModal
+        {...props}
+        onClose={() => {
+          resolve();
+          resolveModal();
+        }}
+      />
+    ));
+  });
+
 /**
  * Handle the printing logic for a given template on a given event, based on previous user input.
  *
@@ -119,26 +180,23 @@ export async function printReceipt(eventId, registrationIds, values) {
   try {
     const data = await printReceiptsRequest(registrationIds, false);
     let receiptIds = data.receipt_ids;
+    let renderErrors = data.render_errors;
     if (data.errors.length) {
-      await new Promise(resolve => {
-        injectModal(resolveModal => (
-          <PrintingErrorsModal
-            onRetry={async () => {
-              const retryData = await printReceiptsRequest(
-                [...new Set(data.errors.map(e => e.registration.id))],
-                true
-              );
-              receiptIds = [...receiptIds, ...retryData.receipt_ids];
-            }}
-            onClose={() => {
-              resolve();
-              resolveModal();
-            }}
-            errors={camelizeKeys(data.errors)}
-          />
-        ));
+      await showPrintingErrors({
+        onRetry: async () => {
+          const retryData = await printReceiptsRequest(
+            [...new Set(data.errors.map(e => e.registration.id))],
+            true
+          );
+          receiptIds = [...receiptIds, ...retryData.receipt_ids];
+          renderErrors = [...renderErrors, ...retryData.render_errors];
+        },
+        errors: camelizeKeys(data.errors),
       });
     }
+    if (renderErrors.length) {
+      await showPrintingErrors({renderErrors: camelizeKeys(renderErrors)});
+    }
     return {receiptIds, error: null};
   } catch (error) {
     return {receiptIds: null, error: handleSubmitError(error)};
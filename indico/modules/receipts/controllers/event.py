@@ -30,9 +30,9 @@ from indico.modules.receipts.models.files import ReceiptFile
 from indico.modules.receipts.models.templates import ReceiptTemplate
 from indico.modules.receipts.schemas import ReceiptTemplateDBSchema
 from indico.modules.receipts.settings import receipt_defaults
-from indico.modules.receipts.util import (TemplateStackEntry, compile_jinja_code, create_pdf,
+from indico.modules.receipts.util import (PDFRenderer, TemplateStackEntry, compile_jinja_code, create_pdf,
                                           get_event_attachment_images, get_inherited_templates,
-                                          get_safe_template_context)
+                                          get_safe_template_context, logger)
 from indico.util.caching import memoize_redis
 from indico.util.fs import secure_filename
 from indico.util.i18n import _
@@ -228,11 +228,22 @@ class RHGenerateReceipts(RenderReceiptsBase):
         ]
         del g.template_stack
         if errors and not force:
-            return jsonify(receipt_ids=[], errors=errors)
+            return jsonify(receipt_ids=[], errors=errors, render_errors=[])
 
         receipt_ids = []
+        render_errors = []
+        renderer = PDFRenderer(self.event, self.template.css)
         for registration in self.registrations:
-            pdf_content = create_pdf(self.event, [html_sources[registration]], self.template.css)
+            try:
+                pdf_content = renderer.render([html_sources[registration]])
+            except Exception:
+                # don't let a single broken document prevent generating the others
+                logger.exception('Could not render document for %r', registration)
+                render_errors.append({
+                    'registration': {'full_name': registration.display_full_name, 'id': registration.id},
+                    'error': _('The document could not be generated')
+                })
+                continue
             timestamp = datetime.now().strftime('%Y%m%d-%H%M')
             full_filename = slugify(filename, timestamp)
             n = (ReceiptFile.query
@@ -268,7 +279,7 @@ class RHGenerateReceipts(RenderReceiptsBase):
                 f'custom_fields:{self.template.id}': self.custom_fields_raw,
                 f'filename:{self.template.id}': filename,
             })
-        return jsonify(receipt_ids=receipt_ids, errors=errors)
+        return jsonify(receipt_ids=receipt_ids, errors=errors, render_errors=render_errors)
 
 
 class RHExportReceipts(ZipGeneratorMixin, RHManageRegFormsBase):
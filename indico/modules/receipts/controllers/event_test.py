@@ -0,0 +1,41 @@
+# This file is part of Indico.
+# Copyright (C) 2002 - 2025 CERN
+#
+# Indico is free software; you can redistribute it and/or
+# modify it under the terms of the MIT License; see the
+# LICENSE file for more details.
+
+from io import BytesIO
+
+import pytest
+
+from indico.modules.receipts.models.files import ReceiptFile
+
+
+pytest_plugins = 'indico.modules.events.registration.testing.fixtures'
+
+
+@pytest.mark.usefixtures('no_csrf_check')
+def test_generate_receipts_render_error(db, mocker, test_client, dummy_user, create_user, dummy_event, dummy_regform,
+                                        dummy_reg, create_registration, dummy_event_template):
+    other_reg = create_registration(create_user(123, email='user@example.test'), dummy_regform)
+    db.session.flush()
+    render = mocker.patch('indico.modules.receipts.controllers.event.PDFRenderer.render')
+    render.side_effect = [BytesIO(b'%PDF-1.7'), Exception('broken')]
+    dummy_user.is_admin = True
+    with test_client.session_transaction() as sess:
+        sess.set_session_user(dummy_user)
+    url = f'/event/{dummy_event.id}/manage/receipts/{dummy_event_template.id}/generate'
+    resp = test_client.post(url, json={'registration_ids': [dummy_reg.id, other_reg.id], 'filename': 'document'})
+    assert resp.status_code == 200
+    assert render.call_count == 2
+    # the document which could be rendered is still saved
+    receipt_files = ReceiptFile.query.all()
+    assert len(receipt_files) == 1
+    assert resp.json['receipt_ids'] == [receipt_files[0].file_id]
+    assert resp.json['errors'] == []
+    failed_reg = next(reg for reg in (dummy_reg, other_reg) if reg != receipt_files[0].registration)
+    assert resp.json['render_errors'] == [{
+        'registration': {'full_name': failed_reg.display_full_name, 'id': failed_reg.id},
+        'error': 'The document could not be generated',
+    }]
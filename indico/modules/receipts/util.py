@@ -172,48 +172,65 @@ def compile_jinja_code(code: str, template_context: dict, *, use_stack: bool = F
 def sandboxed_url_fetcher(event: Event, allow_event_images: bool = False) -> t.Callable[[str], dict]:
     """Fetch also "event-local" URLs.
 
+    Event-local images are only loaded once per fetcher, so a fetcher
+    used for multiple documents does not load the same image again.
+
     More info on fetchers: https://doc.courtbouillon.org/weasyprint/stable/first_steps.html#url-fetchers
     """
     allow_external_urls = receipts_settings.get('allow_external_urls')
+    event_attachment_images = None
+    event_images = {}
+
+    def _get_event_attachment_image(attachment_id: int) -> Attachment | None:
+        nonlocal event_attachment_images
+        if event_attachment_images is None:
+            event_attachment_images = get_event_attachment_images(event)
+        return event_attachment_images.get(attachment_id)
+
+    def _fetch_event_image(url_data) -> dict:
+        if url_data.netloc == 'logo':
+            if not event.has_logo:
+                raise ValueError('Event has no logo')
+            return {
+                'mime_type': event.logo_metadata['content_type'],
+                'string': event.logo
+            }
+        if url_data.netloc == 'placeholder':
+            placeholder_image = Path(current_app.root_path) / 'web' / 'static' / 'images' / 'placeholder_image.svg'
+            return {
+                'mime_type': 'image/svg+xml',
+                'string': placeholder_image.read_text()
+            }
+        try:
+            img_id = int(url_data.path[1:])
+        except ValueError:
+            raise ValueError('Invalid event-local image reference')
+        image = None
+        if url_data.netloc == 'images':
+            image = event.layout_images.filter_by(id=img_id).first()
+        elif url_data.netloc == 'attachments' and (attachment := _get_event_attachment_image(img_id)):
+            image = attachment.file
+        if not image:
+            raise ValueError('Invalid event-local image reference')
+        try:
+            with image.open() as f, Image.open(f) as pic:
+                if pic.format.lower() not in {'jpeg', 'png', 'gif', 'webp'}:
+                    raise ValueError('Unsupported image format')
+                f.seek(0)
+                return {
+                    'mime_type': image.content_type,
+                    'string': f.read()
+                }
+        except OSError:
+            raise ValueError('Invalid image file')
 
     def _fetcher(url: str) -> dict:
         url_data = urlparse(url)
         if allow_event_images and url_data.scheme == 'event':
-            if url_data.netloc == 'logo':
-                if not event.has_logo:
-                    raise ValueError('Event has no logo')
-                return {
-                    'mime_type': event.logo_metadata['content_type'],
-                    'string': event.logo
-                }
-            if url_data.netloc == 'placeholder':
-                placeholder_image = Path(current_app.root_path) / 'web' / 'static' / 'images' / 'placeholder_image.svg'
-                return {
-                    'mime_type': 'image/svg+xml',
-                    'string': placeholder_image.read_text()
-                }
-            try:
-                img_id = int(url_data.path[1:])
-            except ValueError:
-                raise ValueError('Invalid event-local image reference')
-            image = None
-            if url_data.netloc == 'images':
-                image = event.layout_images.filter_by(id=img_id).first()
-            elif url_data.netloc == 'attachments' and (attachment := get_event_attachment_images(event).get(img_id)):
-                image = attachment.file
-            if not image:
-                raise ValueError('Invalid event-local image reference')
-            try:
-                with image.open() as f, Image.open(f) as pic:
-                    if pic.format.lower() not in {'jpeg', 'png', 'gif', 'webp'}:
-                        raise ValueError('Unsupported image format')
-                    f.seek(0)
-                    return {
-                        'mime_type': image.content_type,
-                        'string': f.read()
-                    }
-            except OSError:
-                raise ValueError('Invalid image file')
+            # the same image is usually used in every document rendered with this fetcher
+            if url not in event_images:
+                event_images[url] = _fetch_event_image(url_data)
+            return dict(event_images[url])
 
         # Make sure people don't do anything funny...
         if url_data.scheme not in {'http', 'https'}:
@@ -229,6 +246,43 @@ def sandboxed_url_fetcher(event: Event, allow_event_images: bool = False) -> t.C
     return _fetcher
 
 
+class PDFRenderer:
+    """Render PDFs from HTML sources sharing the same stylesheet.
+
+    The stylesheet is parsed only once and images from the event are
+    only loaded once, no matter how many PDFs are rendered, so a single
+    renderer should be used when generating documents in bulk.
+
+    :param event: The `Event` the PDFs relate to
+    :param css: CSS stylesheet to include
+    """
+
+    def __init__(self, event: Event, css: str):
+        self.html_url_fetcher = sandboxed_url_fetcher(event, allow_event_images=True)
+        try:
+            self.css = CSS(string=f'{css}{DEFAULT_CSS}', url_fetcher=sandboxed_url_fetcher(event))
+        except IndexError:
+            # error happens when parsing `flex: ;` in the stylesheet
+            # https://github.com/Kozea/WeasyPrint/issues/2012
+            abort(422, messages={'css': [_('Could not parse stylesheet')]})
+
+    def render(self, html_sources: list[str]) -> BytesIO:
+        """Create a PDF based on the given HTML sources.
+
+        :param html_sources: list of HTML pages (source) which will be rendered into the final document
+        :return: the rendered PDF blob
+        """
+        documents = [
+            HTML(string=source, url_fetcher=self.html_url_fetcher).render(stylesheets=(self.css,))
+            for source in html_sources
+        ]
+        all_pages = [p for doc in documents for p in doc.pages]
+        f = BytesIO()
+        documents[0].copy(all_pages).write_pdf(f)
+        f.seek(0)
+        return f
+
+
 def create_pdf(event: Event, html_sources: list[str], css: str) -> BytesIO:
     """Create a PDF based on the given HTML sources.
 
@@ -237,23 +291,7 @@ def create_pdf(event: Event, html_sources: list[str], css: str) -> BytesIO:
     :param css: CSS stylesheet to include
     :return: a the rendered PDF blob
     """
-    css_url_fetcher = sandboxed_url_fetcher(event)
-    html_url_fetcher = sandboxed_url_fetcher(event, allow_event_images=True)
-    try:
-        css = CSS(string=f'{css}{DEFAULT_CSS}', url_fetcher=css_url_fetcher)
-    except IndexError:
-        # error happens when parsing `flex: ;` in the stylesheet
-        # https://github.com/Kozea/WeasyPrint/issues/2012
-        abort(422, messages={'css': [_('Could not parse stylesheet')]})
-    documents = [
-        HTML(string=source, url_fetcher=html_url_fetcher).render(stylesheets=(css,))
-        for source in html_sources
-    ]
-    all_pages = [p for doc in documents for p in doc.pages]
-    f = BytesIO()
-    documents[0].copy(all_pages).write_pdf(f)
-    f.seek(0)
-    return f
+    return PDFRenderer(event, css).render(html_sources)
 
 
 def get_safe_template_context(event: Event, registration: Registration, custom_fields: dict) -> dict:
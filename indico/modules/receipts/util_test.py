@@ -0,0 +1,31 @@
+# This file is part of Indico.
+# Copyright (C) 2002 - 2025 CERN
+#
+# Indico is free software; you can redistribute it and/or
+# modify it under the terms of the MIT License; see the
+# LICENSE file for more details.
+
+import pytest
+
+from indico.modules.receipts.util import sandboxed_url_fetcher
+
+
+def test_sandboxed_url_fetcher_event_images(mocker, dummy_event):
+    get_images = mocker.patch('indico.modules.receipts.util.get_event_attachment_images', return_value={})
+    fetcher = sandboxed_url_fetcher(dummy_event, allow_event_images=True)
+    placeholder = fetcher('event://placeholder/')
+    assert placeholder['mime_type'] == 'image/svg+xml'
+    assert fetcher('event://placeholder/') == placeholder
+    assert fetcher('event://placeholder/') is not placeholder
+    with pytest.raises(ValueError):
+        fetcher('event://attachments/1')
+    with pytest.raises(ValueError):
+        fetcher('event://attachments/2')
+    # the attachments of the event are only loaded once per fetcher
+    get_images.assert_called_once_with(dummy_event)
+
+
+def test_sandboxed_url_fetcher_no_event_images(dummy_event):
+    fetcher = sandboxed_url_fetcher(dummy_event)
+    with pytest.raises(ValueError):
+        fetcher('event://placeholder/')
@@ -10,14 +10,19 @@ import itertools
 from sqlalchemy.orm import contains_eager, joinedload, load_only, raiseload, selectinload, subqueryload, undefer
 from werkzeug.exceptions import BadRequest
 
+from indico.core.config import config
 from indico.core.db import db
 from indico.core.db.sqlalchemy.links import LinkType
 from indico.core.db.sqlalchemy.protection import ProtectionMode
+from indico.core.db.sqlalchemy.searchable import fts_rank
 from indico.core.db.sqlalchemy.util.queries import get_n_matching
 from indico.modules.attachments.models.attachments import Attachment
 from indico.modules.attachments.models.folders import AttachmentFolder
 from indico.modules.attachments.models.principals import AttachmentFolderPrincipal, AttachmentPrincipal
 from indico.modules.categories import Category
+from indico.modules.categories.models.effective_readers import (CategoryEffectiveReader, get_category_access_prefilter,
+                                                                get_event_access_prefilter, get_principal_user_filter,
+                                                                has_access_override)
 from indico.modules.categories.models.principals import CategoryPrincipal
 from indico.modules.events import Event
 from indico.modules.events.contributions.models.contributions import Contribution
@@ -61,6 +66,39 @@ def _apply_contrib_access_strategy(rel):
     return rel
 
 
+def _get_category_access_filter(user):
+    """Get a filter excluding categories the user cannot access.
+
+    Categories matching the filter still need to be checked in Python.
+    """
+    readers = (db.select([1])
+               .where(CategoryEffectiveReader.category_id == Category.id,
+                      get_principal_user_filter(CategoryEffectiveReader, user))
+               .correlate(Category))
+    return (Category.effective_protection_mode == ProtectionMode.public) | readers.exists()
+
+
+def _get_event_access_filter(user):
+    """Get a filter excluding events the user cannot access.
+
+    Events matching the filter still need to be checked in Python.
+    """
+    readers = (db.select([1])
+               .where(CategoryEffectiveReader.category_id == Event.category_id,
+                      CategoryEffectiveReader.is_manager | (Event.protection_mode == ProtectionMode.inheriting),
+                      get_principal_user_filter(CategoryEffectiveReader, user))
+               .correlate(Event))
+    event_acl = (db.select([1])
+                 .where(EventPrincipal.event_id == Event.id,
+                        get_principal_user_filter(EventPrincipal, user))
+                 .correlate(Event))
+    return db.or_(Event.effective_protection_mode == ProtectionMode.public,
+                  # access keys are stored in the session, so we cannot check them in SQL
+                  Event.access_key != '',  # noqa: PLC1901
+                  event_acl.exists(),
+                  readers.exists())
+
+
 class InternalSearch(IndicoSearchProvider):
     def search(self, query, user=None, page=None, object_types=(), *, admin_override_enabled=False,
                **params):
@@ -150,41 +188,100 @@ class InternalSearch(IndicoSearchProvider):
         return (protection_mode == ProtectionMode.public or
                 obj.can_access(user, allow_admin=admin_override_enabled))
 
-    def _paginate(self, query, page, column, user, admin_override_enabled):
+    def _filter_accessible(self, query, cls, get_filter, user, admin_override_enabled):
+        if (admin_override_enabled and user and user.is_admin) or has_access_override(cls):
+            return query
+        return query.filter(get_filter(user))
+
+    def _paginate(self, query, page, column, user, admin_override_enabled, rank=None, prefilter=None):
+        """Get a page of accessible results.
+
+        :param rank: A function returning the relevance of a search result
+                     when called with the model (or an alias of it).  If set
+                     and ranking is enabled, results are ordered by relevance
+                     instead of by ID.
+        :param prefilter: A SQL criterion matching results which are known
+                          to be accessible without checking them in Python.
+        """
+        if rank is None or not config.INTERNAL_SEARCH_RANKING:
+            return self._paginate_by_id(query, page, column, user, admin_override_enabled, prefilter)
+
+        # keyset pagination on (rank, id); the page still contains only the id of
+        # the last/first result of the previous/next page so we need to recompute
+        # its rank
+        model = column.class_
+        cursor = db.aliased(model)
+        sort_key = db.tuple_(rank(model), column)
+
+        def _cursor_key(id_):
+            cursor_rank = db.select([rank(cursor)]).where(cursor.id == id_).scalar_subquery()
+            return db.tuple_(cursor_rank, id_)
+
+        reverse = False
+        pagenav = {'prev': None, 'next': None}
+        order_by = (rank(model).desc(), column.desc())
+        if page and page > 0:  # next page
+            query = query.filter(sort_key < _cursor_key(page))
+        elif page and page < 0:  # prev page
+            query = query.filter(sort_key > _cursor_key(-page))
+            order_by = (rank(model), column)
+            reverse = True
+
+        res, has_more = self._get_accessible(query, order_by, user, admin_override_enabled, prefilter)
+        if reverse:
+            res.reverse()
+        if res:
+            # unlike with plain IDs we cannot compute an inclusive cursor, so we
+            # use the first/last result on the current page
+            if (page and page > 0) or (has_more and reverse):
+                pagenav['prev'] = -res[0].id
+            if (page and page < 0) or (has_more and not reverse):
+                pagenav['next'] = res[-1].id
+        return res, pagenav
+
+    def _paginate_by_id(self, query, page, column, user, admin_override_enabled, prefilter=None):
         reverse = False
         pagenav = {'prev': None, 'next': None}
-        if not page:
-            query = query.order_by(column.desc())
-        elif page > 0:  # next page
-            query = query.filter(column < page).order_by(column.desc())
+        order_by = (column.desc(),)
+        if page and page > 0:  # next page
+            query = query.filter(column < page)
             # since we asked for a next page we know that a previous page exists
             pagenav['prev'] = -(page - 1)
-        elif page < 0:  # prev page
-            query = query.filter(column > -page).order_by(column)
+        elif page and page < 0:  # prev page
+            query = query.filter(column > -page)
+            order_by = (column,)
             # since we asked for a previous page we know that a next page exists
             pagenav['next'] = -(page - 1)
             reverse = True
 
+        res, has_more = self._get_accessible(query, order_by, user, admin_override_enabled, prefilter)
+        if has_more:
+            if reverse:
+                pagenav['prev'] = -res[-1].id
+            else:
+                pagenav['next'] = res[-1].id
+
+        if reverse:
+            res.reverse()
+
+        return res, pagenav
+
+    def _get_accessible(self, query, order_by, user, admin_override_enabled, prefilter=None):
         preloaded_categories = set()
         res = get_n_matching(
             query, self.RESULTS_PER_PAGE + 1,
             lambda obj: self._can_access(user, obj, admin_override_enabled=admin_override_enabled),
             prefetch_factor=20,
-            preload_bulk=lambda objs: self._preload_categories(objs, preloaded_categories)
+            preload_bulk=lambda objs: self._preload_categories(objs, preloaded_categories),
+            order_by=order_by,
+            prefilter=prefilter
         )
 
         if len(res) > self.RESULTS_PER_PAGE:
             # we queried 1 more so we can see if there are more results available
             del res[self.RESULTS_PER_PAGE:]
-            if reverse:
-                pagenav['prev'] = -res[-1].id
-            else:
-                pagenav['next'] = res[-1].id
-
-        if reverse:
-            res.reverse()
-
-        return res, pagenav
+            return res, True
+        return res, False
 
     def search_categories(self, q, user, page, category_id, admin_override_enabled):
         if not category_id:
@@ -201,8 +298,11 @@ class InternalSearch(IndicoSearchProvider):
                  .options(undefer('chain'),
                           undefer(Category.effective_protection_mode),
                           subqueryload(Category.acl_entries)))
+        query = self._filter_accessible(query, Category, _get_category_access_filter, user, admin_override_enabled)
 
-        objs, pagenav = self._paginate(query, page, Category.id, user, admin_override_enabled)
+        objs, pagenav = self._paginate(query, page, Category.id, user, admin_override_enabled,
+                                       rank=lambda model: fts_rank(model.title, q),
+                                       prefilter=get_category_access_prefilter(user))
         res = DetailedCategorySchema(many=True).dump(objs)
         return pagenav, CategoryResultSchema(many=True).load(res)
 
@@ -225,7 +325,12 @@ class InternalSearch(IndicoSearchProvider):
                 _apply_acl_entry_strategy(selectinload(Event.acl_entries), EventPrincipal)
             )
         )
-        objs, pagenav = self._paginate(query, page, Event.id, user, admin_override_enabled)
+        query = self._filter_accessible(query, Event, _get_event_access_filter, user, admin_override_enabled)
+        if (prefilter := get_event_access_prefilter(user)) is not None:
+            # events hidden in the category are only shown to their managers
+            prefilter &= Event.visibility.is_(None) | (Event.visibility != 0)
+        objs, pagenav = self._paginate(query, page, Event.id, user, admin_override_enabled,
+                                       rank=lambda model: fts_rank(model.title, q), prefilter=prefilter)
 
         query = (
             Event.query
@@ -277,7 +382,8 @@ class InternalSearch(IndicoSearchProvider):
             )
         )
 
-        objs, pagenav = self._paginate(query, page, Contribution.id, user, admin_override_enabled)
+        objs, pagenav = self._paginate(query, page, Contribution.id, user, admin_override_enabled,
+                                       rank=lambda model: fts_rank([model.title, model._description], q))
 
         event_strategy = joinedload(Contribution.event)
         event_strategy.joinedload(Event.own_venue)
@@ -420,7 +526,8 @@ class InternalSearch(IndicoSearchProvider):
             .outerjoin(Session.event.of_type(session_event))
         )
 
-        objs, pagenav = self._paginate(query, page, Attachment.id, user, admin_override_enabled)
+        objs, pagenav = self._paginate(query, page, Attachment.id, user, admin_override_enabled,
+                                       rank=lambda model: fts_rank(model.title, q))
 
         query = (
             Attachment.query
@@ -539,7 +646,8 @@ class InternalSearch(IndicoSearchProvider):
             .outerjoin(Session.event.of_type(session_event))
         )
 
-        objs, pagenav = self._paginate(query, page, EventNote.id, user, admin_override_enabled)
+        objs, pagenav = self._paginate(query, page, EventNote.id, user, admin_override_enabled,
+                                       rank=lambda model: fts_rank(model.html, q))
 
         query = (
             EventNote.query
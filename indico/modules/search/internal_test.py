@@ -0,0 +1,56 @@
+# This file is part of Indico.
+# Copyright (C) 2002 - 2025 CERN
+#
+# Indico is free software; you can redistribute it and/or
+# modify it under the terms of the MIT License; see the
+# LICENSE file for more details.
+
+import pytest
+
+from indico.core.db.sqlalchemy.searchable import fts_rank
+from indico.modules.categories import Category
+
+
+@pytest.fixture
+def ranked_categories(db, create_category):
+    titles = ['physics', 'nuclear physics', 'physics of particles and the universe', 'chemistry',
+              'experimental physics', 'physics physics']
+    return [create_category(id_, title=title) for id_, title in enumerate(titles, 1)]
+
+
+def _paginate(page, ranked=True):
+    from indico.modules.search.internal import InternalSearch
+    query = Category.query.filter(Category.title_matches('physics'))
+    rank = (lambda model: fts_rank(model.title, 'physics')) if ranked else None
+    objs, pagenav = InternalSearch()._paginate(query, page, Category.id, None, False, rank=rank)
+    return [cat.id for cat in objs], pagenav
+
+
+@pytest.mark.usefixtures('ranked_categories')
+def test_paginate_by_id(mocker):
+    mocker.patch('indico.modules.search.internal.InternalSearch.RESULTS_PER_PAGE', 2)
+    assert _paginate(None, ranked=False) == ([6, 5], {'prev': None, 'next': 5})
+    assert _paginate(5, ranked=False) == ([3, 2], {'prev': -4, 'next': 2})
+    assert _paginate(2, ranked=False) == ([1], {'prev': -1, 'next': None})
+
+
+@pytest.mark.usefixtures('ranked_categories')
+def test_paginate_ranked(mocker, patch_indico_config):
+    mocker.patch('indico.modules.search.internal.InternalSearch.RESULTS_PER_PAGE', 2)
+    # ranking is disabled by default
+    assert _paginate(None)[0] == [6, 5]
+    patch_indico_config('INTERNAL_SEARCH_RANKING', True)
+    ids = [cat_id for cat_id, in Category.query
+           .filter(Category.title_matches('physics'))
+           .order_by(fts_rank(Category.title, 'physics').desc(), Category.id.desc())
+           .with_entities(Category.id)]
+    assert len(ids) == 5
+    # the shortest exact match is the most relevant one
+    assert ids[0] in (1, 6)
+    assert ids[-1] == 3
+    # go through all pages and back
+    assert _paginate(None) == (ids[0:2], {'prev': None, 'next': ids[1]})
+    assert _paginate(ids[1]) == (ids[2:4], {'prev': -ids[2], 'next': ids[3]})
+    assert _paginate(ids[3]) == (ids[4:], {'prev': -ids[4], 'next': None})
+    assert _paginate(-ids[4]) == (ids[2:4], {'prev': -ids[2], 'next': ids[3]})
+    assert _paginate(-ids[2]) == (ids[0:2], {'prev': None, 'next': ids[1]})
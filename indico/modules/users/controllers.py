@@ -36,6 +36,7 @@ from indico.modules.auth import Identity
 from indico.modules.auth.models.registration_requests import RegistrationRequest
 from indico.modules.auth.util import register_user
 from indico.modules.categories import Category
+from indico.modules.categories.models.effective_readers import get_event_access_prefilter
 from indico.modules.core.settings import social_settings
 from indico.modules.events import Event
 from indico.modules.events.contributions.models.contributions import Contribution
@@ -106,9 +107,9 @@ def get_events_in_categories(category_ids, user, from_, limit=10):
                       load_only('id', 'category_id', 'start_dt', 'end_dt', 'title', 'access_key',
                                 'protection_mode', 'series_id', 'series_pos', 'series_count',
                                 'label_id', 'label_message', 'description', 'own_room_id', 'own_venue_id',
-                                'own_room_name', 'own_venue_name'))
-             .order_by(absolute_time_delta, Event.id))
-    return get_n_matching(query, limit, lambda x: x.can_access(user))
+                                'own_room_name', 'own_venue_name')))
+    return get_n_matching(query, limit, lambda x: x.can_access(user), order_by=(absolute_time_delta, Event.id),
+                          prefilter=get_event_access_prefilter(user))
 
 
 class RHUserBase(RHProtected):
@@ -0,0 +1,172 @@
+# This file is part of Indico.
+# Copyright (C) 2002 - 2025 CERN
+#
+# Indico is free software; you can redistribute it and/or
+# modify it under the terms of the MIT License; see the
+# LICENSE file for more details.
+
+import uuid
+from dataclasses import dataclass
+
+from flask import g
+from sqlalchemy.event import listens_for
+from sqlalchemy.orm import mapper
+
+from indico.core import signals
+from indico.core.cache import make_scoped_cache
+from indico.core.db import db
+from indico.core.db.sqlalchemy.principals import PrincipalType
+
+
+#: How long the principal memberships of a user are cached
+PRINCIPAL_MEMBERSHIP_CACHE_TTL = 300
+
+principal_membership_cache = make_scoped_cache('principal-memberships')
+
+
+@dataclass(frozen=True)
+class PrincipalMemberships:
+    """The IDs of all principals containing a user.
+
+    Multipass groups are not included since they cannot be enumerated
+    (their membership is cached separately), and neither are IP network
+    groups since they do not depend on the user.
+    """
+
+    local_groups: frozenset[int] = frozenset()
+    event_roles: frozenset[int] = frozenset()
+    category_roles: frozenset[int] = frozenset()
+    registration_forms: frozenset[int] = frozenset()
+
+
+def _query_principal_memberships(user_id):
+    from indico.modules.categories.models.roles import CategoryRole
+    from indico.modules.events.models.roles import EventRole
+    from indico.modules.events.registration.models.forms import RegistrationForm
+    from indico.modules.events.registration.models.registrations import Registration, RegistrationState
+    from indico.modules.groups.models.groups import LocalGroup
+    from indico.modules.users.models.users import User
+
+    def _query(type_, id_col):
+        return db.session.query(db.literal(type_.value).label('type'), id_col.label('id'))
+
+    local_groups = _query(PrincipalType.local_group, LocalGroup.id).join(LocalGroup.members).filter(User.id == user_id)
+    event_roles = _query(PrincipalType.event_role, EventRole.id).join(EventRole.members).filter(User.id == user_id)
+    category_roles = (_query(PrincipalType.category_role, CategoryRole.id)
+                      .join(CategoryRole.members)
+                      .filter(User.id == user_id))
+    registration_forms = (_query(PrincipalType.registration_form, RegistrationForm.id)
+                          .join(RegistrationForm.registrations)
+                          .filter(Registration.user_id == user_id,
+                                  Registration.state.in_([RegistrationState.unpaid, RegistrationState.complete]),
+                                  ~Registration.is_deleted,
+                                  ~RegistrationForm.is_deleted))
+    ids = {type_: set() for type_ in (PrincipalType.local_group, PrincipalType.event_role,
+                                      PrincipalType.category_role, PrincipalType.registration_form)}
+    for type_, id_ in local_groups.union_all(event_roles, category_roles, registration_forms):
+        ids[PrincipalType(type_)].add(id_)
+    return PrincipalMemberships(local_groups=frozenset(ids[PrincipalType.local_group]),
+                                event_roles=frozenset(ids[PrincipalType.event_role]),
+                                category_roles=frozenset(ids[PrincipalType.category_role]),
+                                registration_forms=frozenset(ids[PrincipalType.registration_form]))
+
+
+def get_principal_memberships(user):
+    """Get the local groups, roles and registration forms of a user.
+
+    The memberships are cached for a few minutes and whenever the
+    members of a group/role or the registrations of a user change, the
+    cached memberships of the affected users are discarded.  Within a
+    request they are cached on `g` as well, so checking many ACLs only
+    needs lookups in a set.
+
+    :param user: A :class:`.User`
+    :return: A :class:`PrincipalMemberships` instance
+    """
+    if user.id is None:
+        # not flushed yet, so it cannot be a member of anything in the database
+        return PrincipalMemberships()
+    cache = g.setdefault('principal_memberships', {})
+    if (rv := cache.get(user.id)) is not None:
+        return rv
+    key = _make_key(user.id)
+    rv = principal_membership_cache.get(key)
+    if rv is None:
+        rv = _query_principal_memberships(user.id)
+        principal_membership_cache.set(key, rv, timeout=PRINCIPAL_MEMBERSHIP_CACHE_TTL)
+    cache[user.id] = rv
+    return rv
+
+
+def invalidate_principal_memberships(user_id=None):
+    """Discard the cached principal memberships.
+
+    The cache entry is deleted immediately and once more after the
+    current transaction has been committed, since a concurrent request
+    may have cached the old memberships in the meantime.
+
+    :param user_id: The ID of the user whose memberships changed, or
+                    ``None`` to discard the memberships of all users.
+    """
+    _invalidate(user_id)
+    db.session.info.setdefault('principal_memberships_invalidate', set()).add(user_id)
+
+
+def _make_key(user_id):
+    version = principal_membership_cache.get('version', '')
+    return f'{user_id}-{version}'
+
+
+def _invalidate(user_id):
+    if user_id is None:
+        principal_membership_cache.set('version', uuid.uuid4().hex)
+        g.pop('principal_memberships', None)
+    else:
+        principal_membership_cache.delete(_make_key(user_id))
+        g.get('principal_memberships', {}).pop(user_id, None)
+
+
+@signals.core.after_commit.connect
+def _invalidate_after_commit(sender, **kwargs):
+    for user_id in db.session.info.pop('principal_memberships_invalidate', ()):
+        _invalidate(user_id)
+
+
+@listens_for(mapper, 'after_configured', once=True)
+def _mapper_configured():
+    from indico.modules.categories.models.roles import CategoryRole
+    from indico.modules.events.models.roles import EventRole
+    from indico.modules.events.registration.models.forms import RegistrationForm
+    from indico.modules.events.registration.models.registrations import Registration
+    from indico.modules.groups.models.groups import LocalGroup
+
+    @listens_for(LocalGroup.members, 'append')
+    @listens_for(LocalGroup.members, 'remove')
+    @listens_for(EventRole.members, 'append')
+    @listens_for(EventRole.members, 'remove')
+    @listens_for(CategoryRole.members, 'append')
+    @listens_for(CategoryRole.members, 'remove')
+    def _members_changed(target, value, *unused):
+        if value.id is not None:
+            invalidate_principal_memberships(value.id)
+
+    @listens_for(Registration.state, 'set')
+    @listens_for(Registration.is_deleted, 'set')
+    def _registration_changed(target, value, oldvalue, *unused):
+        if value == oldvalue:
+            return
+        user_id = target.user_id if target.user_id is not None else getattr(target.user, 'id', None)
+        if user_id is not None:
+            invalidate_principal_memberships(user_id)
+
+    @listens_for(Registration.user, 'set')
+    def _registration_user_changed(target, value, oldvalue, *unused):
+        # the old user is usually not loaded, but the foreign key is only updated on flush
+        user_ids = {target.user_id, getattr(value, 'id', None), getattr(oldvalue, 'id', None)}
+        for user_id in user_ids - {None}:
+            invalidate_principal_memberships(user_id)
+
+    @listens_for(RegistrationForm.is_deleted, 'set')
+    def _registration_form_deleted(target, value, oldvalue, *unused):
+        if value != oldvalue:
+            invalidate_principal_memberships()
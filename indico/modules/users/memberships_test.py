@@ -0,0 +1,72 @@
+# This file is part of Indico.
+# Copyright (C) 2002 - 2025 CERN
+#
+# Indico is free software; you can redistribute it and/or
+# modify it under the terms of the MIT License; see the
+# LICENSE file for more details.
+
+from indico.modules.categories.models.roles import CategoryRole
+from indico.modules.events.models.roles import EventRole
+from indico.modules.events.registration.models.registrations import RegistrationState
+from indico.modules.users.memberships import (PrincipalMemberships, _invalidate_after_commit, get_principal_memberships,
+                                              principal_membership_cache)
+
+
+pytest_plugins = 'indico.modules.events.registration.testing.fixtures'
+
+
+def test_principal_memberships(db, dummy_user, dummy_event, dummy_category, dummy_regform, create_group,
+                               create_registration):
+    group = create_group(1)
+    event_role = EventRole(event=dummy_event, name='Role', code='ROLE', color='005272')
+    category_role = CategoryRole(category=dummy_category, name='Role', code='ROLE', color='005272')
+    db.session.flush()
+    assert get_principal_memberships(dummy_user) == PrincipalMemberships()
+    assert dummy_user not in group
+    assert dummy_user not in event_role
+    assert dummy_user not in category_role
+    assert dummy_user not in dummy_regform
+
+    group.group.members.add(dummy_user)
+    event_role.members.add(dummy_user)
+    category_role.members.add(dummy_user)
+    registration = create_registration(dummy_user, dummy_regform)
+    db.session.flush()
+    assert get_principal_memberships(dummy_user) == PrincipalMemberships(
+        local_groups={group.id}, event_roles={event_role.id}, category_roles={category_role.id},
+        registration_forms={dummy_regform.id}
+    )
+    assert dummy_user in group
+    assert dummy_user in event_role
+    assert dummy_user in category_role
+    assert dummy_user in dummy_regform
+
+    registration.state = RegistrationState.rejected
+    event_role.members.discard(dummy_user)
+    assert dummy_user in group
+    assert dummy_user not in event_role
+    assert dummy_user in category_role
+    assert dummy_user not in dummy_regform
+    assert db.session.info['principal_memberships_invalidate'] == {dummy_user.id}
+    # this is triggered on commit, which is not possible in tests
+    _invalidate_after_commit(None)
+    assert 'principal_memberships_invalidate' not in db.session.info
+
+    dummy_regform.is_deleted = True
+    assert db.session.info['principal_memberships_invalidate'] == {None}
+
+
+def test_principal_memberships_cached(db, mocker, dummy_user, create_group):
+    group = create_group(1)
+    group.group.members.add(dummy_user)
+    db.session.flush()
+    query = mocker.patch('indico.modules.users.memberships._query_principal_memberships',
+                         return_value=PrincipalMemberships(local_groups=frozenset({group.id})))
+    assert dummy_user in group
+    assert dummy_user in group
+    query.assert_called_once()
+    # in a new request the memberships are taken from the cache
+    mocker.patch('indico.modules.users.memberships.g', {})
+    assert dummy_user in group
+    query.assert_called_once()
+    assert principal_membership_cache.get(f'{dummy_user.id}-') is not None
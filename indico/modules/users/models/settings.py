@@ -103,7 +103,7 @@ class UserSettingsProxy(SettingsProxyBase):
         """
         self._check_name(name)
         UserSetting.set(self.module, name, self._convert_from_python(name, value), **user)
-        self._flush_cache()
+        self._flush_cache(**user)
 
     @user_or_id
     def set_multi(self, user, items):
@@ -116,7 +116,7 @@ class UserSettingsProxy(SettingsProxyBase):
             self._check_name(name)
         items = {k: self._convert_from_python(k, v) for k, v in items.items()}
         UserSetting.set_multi(self.module, items, **user)
-        self._flush_cache()
+        self._flush_cache(**user)
 
     @user_or_id
     def delete(self, user, *names):
@@ -128,7 +128,7 @@ class UserSettingsProxy(SettingsProxyBase):
         for name in names:
             self._check_name(name)
         UserSetting.delete(self.module, *names, **user)
-        self._flush_cache()
+        self._flush_cache(**user)
 
     @user_or_id
     def delete_all(self, user):
@@ -137,4 +137,4 @@ class UserSettingsProxy(SettingsProxyBase):
         :param user: ``{'user': user}`` or ``{'user_id': id}``
         """
         UserSetting.delete_all(self.module, **user)
-        self._flush_cache()
+        self._flush_cache(**user)
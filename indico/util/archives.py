@@ -0,0 +1,112 @@
+# This file is part of Indico.
+# Copyright (C) 2002 - 2025 CERN
+#
+# Indico is free software; you can redistribute it and/or
+# modify it under the terms of the MIT License; see the
+# LICENSE file for more details.
+
+import io
+import time
+from collections.abc import Callable
+from dataclasses import dataclass
+from zipfile import ZIP_DEFLATED, ZIP_STORED, ZipFile, ZipInfo
+
+from indico.util.mimetypes import is_compressed_mimetype
+
+
+#: The amount of data read from a file at once when adding it to an archive
+CHUNK_SIZE = 1024 * 1024
+
+
+@dataclass(frozen=True)
+class ZipEntry:
+    """A file to add to a ZIP archive."""
+
+    #: The path of the file inside the archive
+    name: str
+    #: A callable returning a file-like object with the file's content
+    open: Callable
+    #: The size of the file if it is known
+    size: int | None = None
+    #: The MIME type of the file, used to skip compressing files which are
+    #: already compressed
+    content_type: str | None = None
+
+
+class _ChunkCollector:
+    """A write-only file-like object collecting the written data."""
+
+    def __init__(self):
+        self.chunks = []
+
+    def write(self, data):
+        if data:
+            self.chunks.append(bytes(data))
+        return len(data)
+
+    def flush(self):
+        pass
+
+    def pop(self):
+        data = b''.join(self.chunks)
+        self.chunks.clear()
+        return data
+
+
+def iter_zip(entries, *, chunk_size=CHUNK_SIZE):
+    """Generate a ZIP archive in chunks.
+
+    The archive is never kept in memory or written to disk as a whole,
+    so it can be sent to the client or saved in a storage backend while
+    it is being generated.  Files whose MIME type indicates that they
+    are already compressed are stored as they are, all other files are
+    compressed.
+
+    :param entries: An iterable of :class:`ZipEntry` objects.
+    :param chunk_size: The amount of data to read from a file at once.
+    :return: An iterator yielding the archive data as bytes.
+    """
+    output = _ChunkCollector()
+    with ZipFile(output, 'w', allowZip64=True) as zip_file:
+        for entry in entries:
+            info = ZipInfo(entry.name, date_time=time.localtime()[:6])
+            info.compress_type = ZIP_STORED if is_compressed_mimetype(entry.content_type) else ZIP_DEFLATED
+            if entry.size is not None:
+                info.file_size = entry.size
+            with entry.open() as src, zip_file.open(info, 'w', force_zip64=(entry.size is None)) as dest:
+                while chunk := src.read(chunk_size):
+                    dest.write(chunk)
+                    if output.chunks:
+                        yield output.pop()
+            if output.chunks:
+                yield output.pop()
+    if output.chunks:
+        yield output.pop()
+
+
+class IterableReader(io.RawIOBase):
+    """A readable file-like object returning the data from an iterable.
+
+    This is useful to save data in a storage backend while it is still
+    being generated, e.g. the data returned by :func:`iter_zip`.
+
+    :param chunks: An iterable yielding bytes.
+    """
+
+    def __init__(self, chunks):
+        self._chunks = iter(chunks)
+        self._buffer = memoryview(b'')
+
+    def readable(self):
+        return True
+
+    def readinto(self, buffer):
+        while not self._buffer:
+            try:
+                self._buffer = memoryview(next(self._chunks))
+            except StopIteration:
+                return 0
+        size = min(len(buffer), len(self._buffer))
+        buffer[:size] = self._buffer[:size]
+        self._buffer = self._buffer[size:]
+        return size
@@ -0,0 +1,46 @@
+# This file is part of Indico.
+# Copyright (C) 2002 - 2025 CERN
+#
+# Indico is free software; you can redistribute it and/or
+# modify it under the terms of the MIT License; see the
+# LICENSE file for more details.
+
+from io import BytesIO
+from zipfile import ZIP_DEFLATED, ZIP_STORED, ZipFile
+
+import pytest
+
+from indico.util.archives import IterableReader, ZipEntry, iter_zip
+
+
+def _entry(name, data, content_type, with_size=True):
+    return ZipEntry(name, lambda: BytesIO(data), len(data) if with_size else None, content_type)
+
+
+@pytest.mark.parametrize('with_size', (True, False))
+def test_iter_zip(with_size):
+    text = b'Indico is an event management system. ' * 10000
+    pdf = bytes(range(256)) * 1000
+    entries = [_entry('text.txt', text, 'text/plain', with_size),
+               _entry('foo/paper.pdf', pdf, 'application/pdf', with_size),
+               _entry('empty.txt', b'', None, with_size)]
+    chunks = list(iter_zip(entries, chunk_size=4096))
+    assert len(chunks) > 1
+    assert all(chunks)
+    with ZipFile(BytesIO(b''.join(chunks))) as zip_file:
+        assert zip_file.testzip() is None
+        assert zip_file.namelist() == ['text.txt', 'foo/paper.pdf', 'empty.txt']
+        assert zip_file.getinfo('text.txt').compress_type == ZIP_DEFLATED
+        assert zip_file.getinfo('foo/paper.pdf').compress_type == ZIP_STORED
+        assert zip_file.read('text.txt') == text
+        assert zip_file.read('foo/paper.pdf') == pdf
+        assert zip_file.read('empty.txt') == b''
+
+
+def test_iterable_reader():
+    reader = IterableReader(iter([b'foo', b'', b'barbaz', b'x']))
+    assert reader.read(2) == b'fo'
+    assert reader.read(100) == b'o'
+    assert reader.read(4) == b'barb'
+    assert reader.read() == b'azx'
+    assert reader.read() == b''
@@ -5,8 +5,10 @@
 # modify it under the terms of the MIT License; see the
 # LICENSE file for more details.
 
+from datetime import timedelta
 from functools import wraps
 from inspect import getcallargs
+from time import monotonic, sleep, time
 
 from flask import current_app, g, has_request_context
 
@@ -57,7 +59,12 @@ def memoize_request(f):
     return memoizer
 
 
-def memoize_redis(ttl, *, versioned=False):
+def _to_seconds(value):
+    return int(value.total_seconds()) if isinstance(value, timedelta) else value
+
+
+def memoize_redis(ttl, *, versioned=False, lock=False, lock_timeout=60, lock_wait=5, stale_ttl=None,
+                  refresh_ahead=None, background_refresh=False):
     """Memoize a function in redis.
 
     The cached value can be cleared by calling the method
@@ -66,19 +73,79 @@ def memoize_redis(ttl, *, versioned=False):
     whether a value has been cached call ``is_cached()`` in the
     same way.
 
+    To get the results for many different arguments at once (e.g. in a
+    loop over many objects), use ``get_many()`` with an iterable where
+    each item is a tuple of positional arguments, a dict of keyword
+    arguments or a single argument.  It returns a list of results and
+    only needs one roundtrip to retrieve all cached values and one to
+    store any newly computed ones.
+
+    For expensive functions, it is possible to avoid a cache stampede
+    (many requests recomputing the same value at the same time once it
+    expired) by using a lock so only one process computes the value while
+    the others wait for it.  Using `stale_ttl` or `refresh_ahead`, the
+    others do not even have to wait but rather get the previous value
+    while it is being recomputed.
+
     :param ttl: How long the result should be cached.  May be a
                 timedelta or a number (seconds).
+    :param versioned: Whether to include a version in the cache key which
+                      can be incremented using ``bump_version()`` on the
+                      decorated function to invalidate all cached values.
+    :param lock: Whether to use a lock to ensure only one process computes
+                 a missing value.  Always enabled when using `stale_ttl` or
+                 `refresh_ahead`.
+    :param lock_timeout: How long the lock may be held, i.e. the maximum
+                         time the function is expected to take.
+    :param lock_wait: How long to wait for a value that is being computed
+                      by another process before computing it anyway.
+    :param stale_ttl: How long to keep serving an expired value while a
+                      new one is being computed by another process.
+    :param refresh_ahead: How long before expiry a value should already
+                          be recomputed by the next caller.  Other callers
+                          keep getting the current value in the meantime.
+    :param background_refresh: Whether values that need to be refreshed
+                               (due to `stale_ttl` or `refresh_ahead`) are
+                               recomputed in a Celery task instead of the
+                               calling request.  This is only possible for
+                               module-level functions.
     """
     from indico.core.cache import make_scoped_cache
     cache = make_scoped_cache('memoize')
+    ttl = _to_seconds(ttl)
+    lock_timeout = _to_seconds(lock_timeout)
+    stale_ttl = _to_seconds(stale_ttl) or 0
+    refresh_ahead = _to_seconds(refresh_ahead) or 0
+    # if we refresh values before they expire, we need to store the time
+    # when a refresh is needed along with the value
+    soft_expiry = bool(stale_ttl or refresh_ahead)
+    lock = lock or soft_expiry
+    if background_refresh and not soft_expiry:
+        raise ValueError('background_refresh requires stale_ttl or refresh_ahead')
 
     def decorator(f):
         version_key = '_version_', f.__module__, f.__name__
+        if background_refresh and f.__qualname__ != f.__name__:
+            raise ValueError('background_refresh is only supported for module-level functions')
+
+        def _get_version():
+            # the version is read only once per request, which is especially
+            # useful when calling the function many times during a request
+            if not has_request_context():
+                return cache.get(version_key, 0)
+            versions = g.setdefault('memoize_redis_versions', {})
+            if version_key not in versions:
+                versions[version_key] = cache.get(version_key, 0)
+            return versions[version_key]
 
-        def _get_key(args, kwargs):
+        def _get_key(args, kwargs, version=None):
             version_parts = ()
             if versioned:
-                version_parts = (cache.get(version_key, 0),)
+                version_parts = (_get_version() if version is None else version,)
+            if soft_expiry:
+                # soft-expiring values are stored differently so they must never
+                # share a key with the ones from a regular memoized function
+                version_parts = ('_soft_', *version_parts)
             return *version_parts, f.__module__, f.__name__, make_hashable(getcallargs(f, *args, **kwargs))
 
         def _clear_cached(*args, **kwargs):
@@ -91,6 +158,46 @@ def memoize_redis(ttl, *, versioned=False):
             if new_version is None:
                 new_version = cache.get(version_key, 0) + 1
             cache.set(version_key, new_version)
+            if has_request_context():
+                g.setdefault('memoize_redis_versions', {})[version_key] = new_version
+
+        def _wrap(value):
+            return (value, time() + ttl - refresh_ahead) if soft_expiry else value
+
+        def _compute(key, args, kwargs):
+            value = f(*args, **kwargs)
+            cache.set(key, _wrap(value), timeout=(ttl + stale_ttl))
+            return value
+
+        def _compute_locked(key, args, kwargs):
+            lock_key = ('_lock_', *key)
+            try:
+                return _compute(key, args, kwargs)
+            finally:
+                cache.delete(lock_key)
+
+        def _refresh(*args, **kwargs):
+            return _compute_locked(_get_key(args, kwargs), args, kwargs)
+
+        def _wait_for_value(key):
+            deadline = monotonic() + lock_wait
+            while monotonic() < deadline:
+                sleep(0.1)
+                value = cache.get(key, _notset)
+                if value is not _notset:
+                    return value
+            return _notset
+
+        def _get_or_refresh(key, entry, args, kwargs):
+            value, refresh_at = entry
+            if time() < refresh_at or not cache.add(('_lock_', *key), True, timeout=lock_timeout):
+                # still fresh or someone else is already refreshing it
+                return value
+            if background_refresh:
+                from indico.util.tasks import refresh_memoized_redis
+                refresh_memoized_redis.delay(f.__module__, f.__name__, args, kwargs)
+                return value
+            return _compute_locked(key, args, kwargs)
 
         @wraps(f)
         def memoizer(*args, **kwargs):
@@ -100,13 +207,57 @@ def memoize_redis(ttl, *, versioned=False):
 
             key = _get_key(args, kwargs)
             value = cache.get(key, _notset)
+            if value is not _notset:
+                return _get_or_refresh(key, value, args, kwargs) if soft_expiry else value
+            elif not lock:
+                return _compute(key, args, kwargs)
+            return _compute_with_lock(key, args, kwargs)
+
+        def _compute_with_lock(key, args, kwargs):
+            if cache.add(('_lock_', *key), True, timeout=lock_timeout):
+                return _compute_locked(key, args, kwargs)
+            # someone else is computing the value; if it does not show up
+            # in time we compute it ourselves
+            value = _wait_for_value(key)
             if value is _notset:
-                value = f(*args, **kwargs)
-                cache.set(key, value, timeout=ttl)
-            return value
+                return _compute(key, args, kwargs)
+            return value[0] if soft_expiry else value
+
+        def _get_many(calls):
+            calls = [((), call) if isinstance(call, dict) else (call if isinstance(call, tuple) else (call,), {})
+                     for call in calls]
+            if current_app.config['TESTING'] or current_app.config.get('REPL'):
+                return [f(*args, **kwargs) for args, kwargs in calls]
+
+            version = _get_version() if versioned else None
+            keys = [_get_key(args, kwargs, version) for args, kwargs in calls]
+            cached = cache.get_many(*keys, default=_notset) if keys else []
+            results = []
+            resolved = {}
+            computed = {}
+            for key, entry, (args, kwargs) in zip(keys, cached, calls, strict=True):
+                if key in resolved:
+                    results.append(resolved[key])
+                elif entry is _notset and lock:
+                    # this stores the value on its own, just like when calling the function
+                    resolved[key] = value = _compute_with_lock(key, args, kwargs)
+                    results.append(value)
+                elif entry is _notset:
+                    resolved[key] = computed[key] = value = f(*args, **kwargs)
+                    results.append(value)
+                elif soft_expiry:
+                    results.append(_get_or_refresh(key, entry, args, kwargs))
+                else:
+                    results.append(entry)
+            if computed:
+                cache.set_many({key: _wrap(value) for key, value in computed.items()}, timeout=(ttl + stale_ttl))
+            return results
 
         memoizer.clear_cached = _clear_cached
+        memoizer.get_many = _get_many
         memoizer.is_cached = _is_cached
+        if soft_expiry:
+            memoizer.refresh = _refresh
         if versioned:
             memoizer.bump_version = _bump_version
         return memoizer
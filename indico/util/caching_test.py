@@ -7,7 +7,8 @@
 
 import pytest
 
-from indico.util.caching import memoize_request
+from indico.core.cache import make_scoped_cache
+from indico.util.caching import memoize_redis, memoize_request
 
 
 @pytest.fixture
@@ -46,3 +47,186 @@ def test_memoize_request_args():
     assert calls[0] == 3
     fn(a=2, b=2, foo='bar')
     assert calls[0] == 3
+
+
+@pytest.mark.usefixtures('not_testing')
+def test_memoize_redis():
+    calls = []
+
+    @memoize_redis(60)
+    def fn(a):
+        calls.append(a)
+        return a * 2
+
+    assert fn(1) == 2
+    assert fn(1) == 2
+    assert fn(2) == 4
+    assert calls == [1, 2]
+    assert fn.is_cached(1)
+    fn.clear_cached(1)
+    assert not fn.is_cached(1)
+    assert fn(1) == 2
+    assert calls == [1, 2, 1]
+
+
+@pytest.mark.usefixtures('not_testing')
+def test_memoize_redis_lock_wait(mocker):
+    mocker.patch('indico.util.caching.sleep')
+    calls = []
+
+    @memoize_redis(60, lock=True, lock_wait=1)
+    def fn(a):
+        calls.append(a)
+        return a * 2
+
+    # simulate another process holding the lock
+    memoize_cache = make_scoped_cache('memoize')
+    key = ('indico.util.caching_test', 'fn', frozenset({('a', 1)}))
+    memoize_cache.set(('_lock_', *key), True)
+    monotonic = mocker.patch('indico.util.caching.monotonic', side_effect=[0, 0.5, 2])
+    assert fn(1) == 2
+    # nobody computed the value in time, so we did it ourselves
+    assert calls == [1]
+    assert monotonic.call_count == 3
+    assert fn(1) == 2
+    assert calls == [1]
+
+
+@pytest.mark.usefixtures('not_testing')
+def test_memoize_redis_stale(mocker):
+    calls = []
+    now = mocker.patch('indico.util.caching.time', return_value=1000)
+
+    @memoize_redis(60, stale_ttl=600)
+    def fn(a):
+        calls.append(a)
+        return len(calls)
+
+    assert fn(1) == 1
+    assert fn(1) == 1
+    now.return_value = 1061
+    # another process is refreshing the value, so we get the stale one
+    memoize_cache = make_scoped_cache('memoize')
+    lock_key = ('_lock_', '_soft_', 'indico.util.caching_test', 'fn', frozenset({('a', 1)}))
+    memoize_cache.set(lock_key, True)
+    assert fn(1) == 1
+    assert calls == [1]
+    memoize_cache.delete(lock_key)
+    # now we refresh it ourselves
+    assert fn(1) == 2
+    assert fn(1) == 2
+    assert calls == [1, 1]
+    assert not memoize_cache.get(lock_key)
+
+
+_background_refresh_calls = []
+
+
+@memoize_redis(60, refresh_ahead=10, background_refresh=True)
+def _background_refreshed(a):
+    _background_refresh_calls.append(a)
+    return len(_background_refresh_calls)
+
+
+@pytest.mark.usefixtures('not_testing')
+def test_memoize_redis_background_refresh(mocker):
+    delay = mocker.patch('indico.util.tasks.refresh_memoized_redis.delay')
+    now = mocker.patch('indico.util.caching.time', return_value=1000)
+    _background_refresh_calls.clear()
+
+    assert _background_refreshed(1) == 1
+    now.return_value = 1055
+    assert _background_refreshed(1) == 1
+    assert _background_refreshed(1) == 1
+    # only one refresh is scheduled
+    delay.assert_called_once_with('indico.util.caching_test', '_background_refreshed', (1,), {})
+    _background_refreshed.refresh(1)
+    assert _background_refreshed(1) == 2
+
+
+@pytest.mark.usefixtures('not_testing')
+def test_memoize_redis_versioned_lock():
+    calls = []
+
+    @memoize_redis(60, versioned=True, lock=True)
+    def fn(a):
+        calls.append(a)
+        return len(calls)
+
+    assert fn(1) == 1
+    assert fn(1) == 1
+    fn.bump_version()
+    assert fn(1) == 2
+    assert calls == [1, 1]
+
+
+def test_memoize_redis_background_refresh_invalid():
+    with pytest.raises(ValueError):
+        memoize_redis(60, background_refresh=True)
+
+    with pytest.raises(ValueError):
+        @memoize_redis(60, stale_ttl=60, background_refresh=True)
+        def fn():
+            pass
+
+
+@pytest.mark.usefixtures('not_testing')
+def test_memoize_redis_get_many():
+    calls = []
+
+    @memoize_redis(60, versioned=True)
+    def fn(a, b=0):
+        calls.append((a, b))
+        return a + b
+
+    assert fn(1) == 1
+    assert fn.get_many([1, 2, (3, 4), {'a': 5, 'b': 6}, (2,)]) == [1, 2, 7, 11, 2]
+    assert calls == [(1, 0), (2, 0), (3, 4), (5, 6)]
+    assert fn.get_many([1, 2, (3, 4), {'a': 5, 'b': 6}]) == [1, 2, 7, 11]
+    assert fn(3, b=4) == 7
+    assert len(calls) == 4
+    fn.bump_version()
+    assert fn.get_many([1]) == [1]
+    assert len(calls) == 5
+    assert fn.get_many([]) == []
+
+
+@pytest.mark.usefixtures('not_testing')
+def test_memoize_redis_get_many_lock(mocker):
+    mocker.patch('indico.util.caching.sleep')
+    calls = []
+
+    @memoize_redis(60, lock=True, lock_wait=1)
+    def fn(a):
+        calls.append(a)
+        return a * 2
+
+    # simulate another process computing the value for 1
+    memoize_cache = make_scoped_cache('memoize')
+    key = ('indico.util.caching_test', 'fn', frozenset({('a', 1)}))
+    memoize_cache.set(('_lock_', *key), True)
+    mocker.patch('indico.util.caching.monotonic', side_effect=[0, 0.5, 2])
+    get = mocker.spy(memoize_cache.cache, 'get')
+    assert fn.get_many([1, 2]) == [2, 4]
+    # we waited for the other process before computing it ourselves
+    assert sum(1 for call in get.call_args_list if call.args[0] == f'memoize/{key}') == 1
+    assert calls == [1, 2]
+    # the lock taken for 2 has been released
+    assert not memoize_cache.get(('_lock_', 'indico.util.caching_test', 'fn', frozenset({('a', 2)})))
+    assert fn.get_many([1, 2]) == [2, 4]
+    assert calls == [1, 2]
+
+
+@pytest.mark.usefixtures('request_context', 'not_testing')
+def test_memoize_redis_version_per_request(mocker):
+    @memoize_redis(60, versioned=True)
+    def fn(a):
+        return a
+
+    memoize_cache = make_scoped_cache('memoize')
+    get = mocker.spy(memoize_cache.cache, 'get')
+    fn(1)
+    fn(2)
+    fn.get_many([3, 4])
+    version_key = ('_version_', 'indico.util.caching_test', 'fn')
+    assert sum(1 for call in get.call_args_list if call.args[0] == f'memoize/{version_key}') == 1
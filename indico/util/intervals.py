@@ -0,0 +1,72 @@
+# This file is part of Indico.
+# Copyright (C) 2002 - 2025 CERN
+#
+# Indico is free software; you can redistribute it and/or
+# modify it under the terms of the MIT License; see the
+# LICENSE file for more details.
+
+from bisect import bisect_left
+from operator import attrgetter
+
+
+class IntervalIndex:
+    """Index to efficiently find intervals overlapping a given range.
+
+    The intervals are treated as half-open, i.e. intervals which only
+    touch each other do not overlap (like :func:`~indico.util.date_time.overlaps`).
+
+    Looking up the overlapping intervals of a range takes ``O(log n)`` time
+    plus ``O(log n)`` for each result, regardless of how long the intervals
+    are or how much they overlap each other.
+
+    :param items: The objects to index
+    :param start: A callable returning the start of an object's interval
+    :param end: A callable returning the end of an object's interval
+    """
+
+    def __init__(self, items, *, start=attrgetter('start_dt'), end=attrgetter('end_dt')):
+        self._items = sorted(items, key=start)
+        self._starts = [start(item) for item in self._items]
+        self._size = size = 1 << max(0, len(self._items) - 1).bit_length()
+        if not self._items:
+            self._tree = []
+            return
+        # the leaves of this tree are the interval ends (sorted by start), and each
+        # node contains the latest end of its children. this allows skipping all
+        # intervals in a subtree if none of them ends after the start of the range.
+        # the padding leaves are never visited since they are beyond the last start
+        ends = [end(item) for item in self._items]
+        tree = [None] * size + ends + [ends[0]] * (size - len(ends))
+        for i in range(size - 1, 0, -1):
+            tree[i] = max(tree[2 * i], tree[2 * i + 1])
+        self._tree = tree
+
+    def __len__(self):
+        return len(self._items)
+
+    def _iter_overlapping(self, start, end):
+        # only intervals starting before the end of the range can overlap
+        stop = bisect_left(self._starts, end)
+        tree = self._tree
+        stack = [(1, 0, self._size)] if stop else []
+        while stack:
+            node, lo, hi = stack.pop()
+            if lo >= stop or tree[node] <= start:
+                continue
+            if hi - lo == 1:
+                yield self._items[lo]
+                continue
+            mid = (lo + hi) // 2
+            stack.append((2 * node + 1, mid, hi))
+            stack.append((2 * node, lo, mid))
+
+    def overlapping(self, start, end):
+        """Get all intervals overlapping with a range.
+
+        :return: A list of the overlapping objects, sorted by their start
+        """
+        return list(self._iter_overlapping(start, end))
+
+    def overlaps(self, start, end):
+        """Check whether any interval overlaps with a range."""
+        return next(self._iter_overlapping(start, end), None) is not None
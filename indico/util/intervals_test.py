@@ -0,0 +1,56 @@
+# This file is part of Indico.
+# Copyright (C) 2002 - 2025 CERN
+#
+# Indico is free software; you can redistribute it and/or
+# modify it under the terms of the MIT License; see the
+# LICENSE file for more details.
+
+import random
+from collections import namedtuple
+
+import pytest
+
+from indico.util.date_time import overlaps
+from indico.util.intervals import IntervalIndex
+
+
+Interval = namedtuple('Interval', ('start_dt', 'end_dt'))
+
+
+@pytest.mark.parametrize(('start', 'end', 'expected'), (
+    (0, 1, []),
+    (0, 2, []),
+    (0, 3, [(2, 4)]),
+    (4, 5, [(3, 10)]),
+    (4, 6, [(3, 10), (5, 6)]),
+    (10, 20, [(11, 12)]),
+    (12, 20, []),
+    (-100, 100, [(2, 4), (3, 10), (5, 6), (11, 12)]),
+))
+def test_interval_index(start, end, expected):
+    index = IntervalIndex([Interval(11, 12), Interval(2, 4), Interval(5, 6), Interval(3, 10)])
+    assert index.overlapping(start, end) == [Interval(*x) for x in expected]
+    assert index.overlaps(start, end) == bool(expected)
+
+
+def test_interval_index_empty():
+    index = IntervalIndex([])
+    assert not index
+    assert index.overlapping(0, 10) == []
+    assert not index.overlaps(0, 10)
+
+
+@pytest.mark.parametrize('count', (1, 2, 7, 64, 100))
+def test_interval_index_random(count):
+    rnd = random.Random(count)
+    intervals = []
+    for __ in range(count):
+        start = rnd.randint(0, 1000)
+        intervals.append(Interval(start, start + rnd.choice((1, 5, 20, 500))))
+    index = IntervalIndex(intervals, start=lambda x: x.start_dt, end=lambda x: x.end_dt)
+    assert len(index) == count
+    for __ in range(200):
+        start = rnd.randint(-10, 1100)
+        end = start + rnd.randint(1, 50)
+        expected = [x for x in intervals if overlaps((start, end), x)]
+        assert sorted(index.overlapping(start, end)) == sorted(expected)
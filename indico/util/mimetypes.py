@@ -61,6 +61,22 @@ _regex_mapping = [
 ]
 _regex_mapping = [(re.compile(regex), icon) for regex, icon in _regex_mapping]
 
+# MIME types of files whose content is already compressed
+_compressed_regex = re.compile('|'.join([
+    # Audio, images, video
+    '^(audio|image|video)/',
+    # PDF
+    '^application/pdf$',
+    # Archives
+    '^application/(zip|gzip|x-gzip|x-7z-compressed|x-ace-compressed|x-rar-compressed|vnd\\.rar|x-bzip2?|x-xz|zstd)$',
+    # Office documents which are zip files
+    r'^application/vnd\.openxmlformats-officedocument\.',
+    r'^application/vnd\.oasis\.opendocument\.',
+    r'^application/epub\+zip$',
+]))
+# Images which are usually not compressed
+_uncompressed_images = {'image/bmp', 'image/x-ms-bmp', 'image/svg+xml', 'image/tiff', 'image/x-portable-pixmap'}
+
 
 def icon_from_mimetype(mimetype, default_icon='icon-file-filled'):
     """Get the most suitable icon for a MIME type."""
@@ -74,6 +90,18 @@ def icon_from_mimetype(mimetype, default_icon='icon-file-filled'):
         return default_icon
 
 
+def is_compressed_mimetype(mimetype):
+    """Check whether files with a MIME type are already compressed.
+
+    Compressing such files again, e.g. when adding them to a ZIP file,
+    is usually a waste of time since their size barely changes.
+    """
+    if not mimetype:
+        return False
+    mimetype = mimetype.lower()
+    return mimetype not in _uncompressed_images and _compressed_regex.search(mimetype) is not None
+
+
 def register_custom_mimetypes():
     """Register additional extension/mimetype mappings.
 
@@ -7,7 +7,7 @@
 
 import pytest
 
-from indico.util.mimetypes import icon_from_mimetype
+from indico.util.mimetypes import icon_from_mimetype, is_compressed_mimetype
 
 
 @pytest.mark.parametrize(('mimetype', 'expected_icon'), (
@@ -175,3 +175,25 @@ def test_icon_from_mimetype(mimetype, expected_icon):
 
 def test_icon_from_mimetype_case_insensitive():
     assert icon_from_mimetype('IMAGE/gif', default_icon='default_icon') == 'icon-file-image'
+
+
+@pytest.mark.parametrize(('mimetype', 'expected'), (
+    ('application/pdf', True),
+    ('application/zip', True),
+    ('application/x-bzip2', True),
+    ('application/vnd.openxmlformats-officedocument.presentationml.presentation', True),
+    ('application/vnd.oasis.opendocument.text', True),
+    ('image/png', True),
+    ('IMAGE/JPEG', True),
+    ('video/mp4', True),
+    ('image/svg+xml', False),
+    ('image/bmp', False),
+    ('application/msword', False),
+    ('application/vnd.ms-powerpoint', False),
+    ('application/pdfx', False),
+    ('text/plain', False),
+    ('', False),
+    (None, False),
+))
+def test_is_compressed_mimetype(mimetype, expected):
+    assert is_compressed_mimetype(mimetype) == expected
@@ -10,16 +10,18 @@ import re
 from contextlib import contextmanager
 from datetime import date, datetime
 from enum import auto
-from io import BytesIO, TextIOWrapper
+from io import BytesIO, StringIO, TextIOWrapper
+from tempfile import TemporaryFile
 
 from markupsafe import Markup
 from speaklater import is_lazy_string
 from xlsxwriter import Workbook
 
+from indico.core.config import config
 from indico.core.errors import UserValueError
 from indico.util.enum import RichStrEnum
 from indico.util.i18n import _
-from indico.web.flask.util import send_file
+from indico.web.flask.util import send_file, send_stream
 
 
 class CSVFieldDelimiter(RichStrEnum):
@@ -65,6 +67,21 @@ def _prepare_header(header):
     return header
 
 
+def _make_row_getter(headers):
+    """Get a function converting a row dict to a list of values.
+
+    The values are in the same order as the `headers`, and every row
+    must contain exactly the keys from `headers`.
+    """
+    num_headers = len(headers)
+
+    def _get_values(row):
+        assert len(row) == num_headers
+        return [row[header] for header in headers]
+
+    return _get_values
+
+
 def _prepare_csv_data(data, _linebreak_re=re.compile(r'(\r?\n)+'), _dangerous_chars_re=re.compile(r'^[=+@-]+')):
     if isinstance(data, (list, tuple)):
         data = '; '.join(data)
@@ -93,6 +110,36 @@ def csv_text_io_wrapper(buf):
         w.detach()
 
 
+def iter_csv(headers, rows, *, include_header=True, chunk_size=100):
+    """Generate a CSV file from a list of headers and rows in chunks.
+
+    This is the streaming version of :func:`generate_csv`; the rows are
+    only consumed while iterating over the result, so they can be a
+    generator which only loads the data of the rows as needed.
+
+    :param headers: a list of cell captions
+    :param rows: an iterable of dicts mapping captions to values
+    :param include_header: whether to include a header in the data
+    :param chunk_size: the number of rows to write per chunk
+    :return: an iterator yielding the CSV data as bytes
+    """
+    buf = StringIO()
+    # same as writing with the 'utf-8-sig' codec
+    buf.write('\ufeff')
+    writer = csv.writer(buf)
+    if include_header:
+        writer.writerow(map(_prepare_header, headers))
+    get_values = _make_row_getter(headers)
+    for i, row in enumerate(rows, 1):
+        writer.writerow([_prepare_csv_data(v) for v in get_values(row)])
+        if i % chunk_size == 0:
+            yield buf.getvalue().encode()
+            buf.seek(0)
+            buf.truncate()
+    if data := buf.getvalue():
+        yield data.encode()
+
+
 def generate_csv(headers, rows, *, include_header=True):
     """Generate a CSV file from a list of headers and rows.
 
@@ -105,18 +152,7 @@ def generate_csv(headers, rows, *, include_header=True):
     :param include_header: whether to include a header in the data
     :return: an `io.BytesIO` containing the CSV data
     """
-    buf = BytesIO()
-    with csv_text_io_wrapper(buf) as csvbuf:
-        writer = csv.writer(csvbuf)
-        if include_header:
-            writer.writerow(map(_prepare_header, headers))
-        header_positions = {name: i for i, name in enumerate(headers)}
-        assert all(len(row) == len(headers) for row in rows)
-        for row in rows:
-            row = sorted(row.items(), key=lambda x: header_positions[x[0]])
-            writer.writerow([_prepare_csv_data(v) for k, v in row])
-    buf.seek(0)
-    return buf
+    return BytesIO(b''.join(iter_csv(headers, rows, include_header=include_header)))
 
 
 def _prepare_excel_data(data):
@@ -145,25 +181,17 @@ def _strftime_to_excel_number_format(fmt):
     return result
 
 
-def generate_xlsx(headers, rows, *, tz=None, column_formats=None):
-    """Generate an XLSX file from a list of headers and rows.
-
-    :param headers: a list of cell captions
-    :param rows: a list of dicts mapping captions to values
-    :param tz: the timezone for the values that are datetime objects
-    :param column_formats: optional mapping of header keys to Excel number formats
-    :return: an `io.BytesIO` containing the XLSX data
-    """
+def _write_xlsx(fileobj, headers, rows, *, tz, column_formats, constant_memory):
     if column_formats is None:
         column_formats = {}
-    workbook_options = {'in_memory': True, 'strings_to_formulas': False, 'strings_to_numbers': False,
-                        'strings_to_urls': False}
-    buf = BytesIO()
-    header_positions = {name: i for i, name in enumerate(headers)}
-    # convert row dicts to lists
-    rows = [[x[1] for x in sorted(row.items(), key=lambda x: header_positions[x[0]])] for row in rows]
-    assert all(len(row) == len(headers) for row in rows)
-    with Workbook(buf, workbook_options) as workbook:
+    workbook_options = {'strings_to_formulas': False, 'strings_to_numbers': False, 'strings_to_urls': False}
+    if constant_memory:
+        # each row is flushed to a temporary file as soon as the next one is written
+        workbook_options.update(constant_memory=True, tmpdir=config.TEMP_DIR)
+    else:
+        workbook_options['in_memory'] = True
+    get_values = _make_row_getter(headers)
+    with Workbook(fileobj, workbook_options) as workbook:
         bold = workbook.add_format({'bold': True})
         wb_formats = {
             fmt: workbook.add_format({'num_format': _strftime_to_excel_number_format(fmt)})
@@ -178,8 +206,8 @@ def generate_xlsx(headers, rows, *, tz=None, column_formats=None):
         sheet = workbook.add_worksheet()
         for col, name in enumerate(map(_prepare_header, headers)):
             sheet.write(0, col, name, bold)
-        for row, values in enumerate(rows, 1):
-            for col, data in enumerate(values):
+        for row, row_data in enumerate(rows, 1):
+            for col, data in enumerate(get_values(row_data)):
                 cell_format = column_formats_list[col]
                 if isinstance(data, datetime):
                     sheet.write_datetime(row, col, data.astimezone(tz).replace(tzinfo=None),
@@ -188,24 +216,68 @@ def generate_xlsx(headers, rows, *, tz=None, column_formats=None):
                     sheet.write_datetime(row, col, data, cell_format or date_format)
                 else:
                     sheet.write(row, col, _prepare_excel_data(data), cell_format)
+
+
+def generate_xlsx(headers, rows, *, tz=None, column_formats=None):
+    """Generate an XLSX file from a list of headers and rows.
+
+    :param headers: a list of cell captions
+    :param rows: a list of dicts mapping captions to values
+    :param tz: the timezone for the values that are datetime objects
+    :param column_formats: optional mapping of header keys to Excel number formats
+    :return: an `io.BytesIO` containing the XLSX data
+    """
+    buf = BytesIO()
+    _write_xlsx(buf, headers, rows, tz=tz, column_formats=column_formats, constant_memory=False)
     buf.seek(0)
     return buf
 
 
-def send_csv(filename, headers, rows, *, include_header=True):
+def generate_xlsx_file(headers, rows, *, tz=None, column_formats=None):
+    """Generate an XLSX file from a list of headers and rows on disk.
+
+    Unlike :func:`generate_xlsx`, this uses the constant memory mode
+    of xlsxwriter, so the rows can be a generator and only one row is
+    kept in memory at any time.
+
+    :param headers: a list of cell captions
+    :param rows: an iterable of dicts mapping captions to values
+    :param tz: the timezone for the values that are datetime objects
+    :param column_formats: optional mapping of header keys to Excel number formats
+    :return: a temporary file containing the XLSX data, which is
+             deleted once it is closed
+    """
+    temp_file = TemporaryFile(dir=config.TEMP_DIR)  # noqa: SIM115
+    try:
+        _write_xlsx(temp_file, headers, rows, tz=tz, column_formats=column_formats, constant_memory=True)
+    except Exception:
+        temp_file.close()
+        raise
+    temp_file.seek(0)
+    return temp_file
+
+
+def send_csv(filename, headers, rows, *, include_header=True, stream=False):
     """Send a CSV file to the client.
 
     :param filename: The name of the CSV file
     :param headers: a list of cell captions
     :param rows: a list of dicts mapping captions to values
     :param include_header: whether to include a header in the data
+    :param stream: whether to send the data while it's being generated
+                   instead of building the whole file in memory first.
+                   In this case `rows` may be any iterable (e.g. a
+                   generator), but errors while generating the rows can
+                   no longer be shown to the user.
     :return: a flask response containing the CSV data
     """
+    if stream:
+        return send_stream(filename, iter_csv(headers, rows, include_header=include_header), 'text/csv')
     buf = generate_csv(headers, rows, include_header=include_header)
     return send_file(filename, buf, 'text/csv', inline=False)
 
 
-def send_xlsx(filename, headers, rows, *, tz=None, column_formats=None):
+def send_xlsx(filename, headers, rows, *, tz=None, column_formats=None, stream=False):
     """Send an XLSX file to the client.
 
     :param filename: The name of the CSV file
@@ -213,7 +285,13 @@ def send_xlsx(filename, headers, rows, *, tz=None, column_formats=None):
     :param rows: a list of dicts mapping captions to values
     :param tz: the timezone for the values that are datetime objects
     :param column_formats: optional mapping of header keys to Excel number formats
+    :param stream: whether to write the file to disk row by row instead
+                   of building it in memory (see :func:`generate_xlsx_file`).
+                   In this case `rows` may be any iterable.
     :return: a flask response containing the XLSX data
     """
-    buf = generate_xlsx(headers, rows, tz=tz, column_formats=column_formats)
+    if stream:
+        buf = generate_xlsx_file(headers, rows, tz=tz, column_formats=column_formats)
+    else:
+        buf = generate_xlsx(headers, rows, tz=tz, column_formats=column_formats)
     return send_file(filename, buf, 'application/vnd.openxmlformats-officedocument.spreadsheetml.sheet', inline=False)
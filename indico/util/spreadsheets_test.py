@@ -6,10 +6,11 @@
 # LICENSE file for more details.
 
 import textwrap
+from zipfile import ZipFile
 
 import pytest
 
-from indico.util.spreadsheets import generate_csv
+from indico.util.spreadsheets import generate_csv, generate_xlsx, generate_xlsx_file, iter_csv
 
 
 def test_generate_csv():
@@ -51,3 +52,33 @@ def test_generate_csv_malicious(value, expected):
     rows = [{'foo': value, 'bar': ''}]
     csv = generate_csv(headers, rows).read().decode('utf-8-sig').strip().splitlines()
     assert csv == ['foo,bar', f'{expected},']
+
+
+@pytest.mark.parametrize('chunk_size', (1, 2, 100))
+def test_iter_csv(chunk_size):
+    headers = ['foo', ('bar', 1)]
+    rows = [{('bar', 1): str(i), 'foo': 'hello'} for i in range(5)]
+    chunks = list(iter_csv(headers, (row for row in rows), chunk_size=chunk_size))
+    assert len(chunks) == -(-5 // chunk_size)
+    assert chunks[0].startswith(b'\xef\xbb\xbffoo,bar\r\n')
+    assert b''.join(chunks) == generate_csv(headers, rows).read()
+
+
+def test_iter_csv_invalid_row():
+    with pytest.raises(AssertionError):
+        list(iter_csv(['foo', 'bar'], [{'foo': 'hello'}]))
+    with pytest.raises(KeyError):
+        list(iter_csv(['foo', 'bar'], [{'foo': 'hello', 'baz': ''}]))
+
+
+def test_generate_xlsx_file(tmp_path, patch_indico_config):
+    patch_indico_config('TEMP_DIR', str(tmp_path))
+    headers = ['foo', 'bar']
+    rows = [{'bar': i, 'foo': f'row {i}'} for i in range(10)]
+    with generate_xlsx_file(headers, (row for row in rows)) as f:
+        with ZipFile(f) as zf:
+            sheet = zf.read('xl/worksheets/sheet1.xml').decode()
+    # constant memory mode uses inline strings instead of a shared string table
+    assert '<t>row 9</t>' in sheet
+    with ZipFile(generate_xlsx(headers, rows)) as zf:
+        assert 'xl/sharedStrings.xml' in zf.namelist()
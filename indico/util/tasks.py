@@ -15,6 +15,7 @@ in here but in your module instead.
 
 
 from datetime import timedelta
+from importlib import import_module
 
 from celery.schedules import crontab
 
@@ -37,3 +38,10 @@ def temp_cleanup():
     _log_deleted(logger, 'Deleted from cache: %s', deleted)
     deleted = cleanup_dir(config.TEMP_DIR, timedelta(days=1))
     _log_deleted(logger, 'Deleted from temp: %s', deleted)
+
+
+@celery.task(name='refresh_memoized_redis')
+def refresh_memoized_redis(module, name, args, kwargs):
+    """Recompute the cached value of a :func:`~indico.util.caching.memoize_redis` function."""
+    func = getattr(import_module(module), name)
+    func.refresh(*args, **kwargs)
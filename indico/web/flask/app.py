@@ -103,6 +103,8 @@ def configure_cache(app, config):
         # order to fail properly if redis is not configured.
         app.config['CACHE_TYPE'] = 'indico.core.cache.IndicoRedisCache'
         app.config['CACHE_REDIS_URL'] = config.REDIS_CACHE_URL
+        app.config['CACHE_LOCAL_SIZE'] = config.LOCAL_CACHE_SIZE
+        app.config['CACHE_LOCAL_TTL'] = config.LOCAL_CACHE_TTL
     else:
         app.config['CACHE_TYPE'] = 'flask_caching.backends.nullcache.NullCache'
         app.config['CACHE_NO_NULL_WARNING'] = True
@@ -18,6 +18,7 @@ def request_stats_request_started():
     g.request_stats_initialized = True
     g.query_count = 0
     g.query_duration = 0
+    g.access_cache_hits = 0
     g.req_start_ts = time.time()
 
 
@@ -46,5 +47,6 @@ def get_request_stats():
     return {
         'query_count': g.query_count if initialized else 0,
         'query_duration': g.query_duration if initialized else 0,
+        'access_cache_hits': g.access_cache_hits if initialized else 0,
         'req_duration': (time.time() - g.req_start_ts) if initialized else 0
     }
@@ -13,6 +13,7 @@ from urllib.parse import urlsplit
 
 from flask import Blueprint, current_app, g, redirect, request
 from flask import send_file as _send_file
+from flask import stream_with_context
 from flask import url_for as _url_for
 from flask.helpers import get_root_path
 from flask_cors import cross_origin
@@ -303,6 +304,20 @@ def send_file(name, path_or_fd, mimetype, *, last_modified=None, no_cache=True,
     return rv
 
 
+def send_stream(name, chunks, mimetype):
+    """Send data to the user while it is still being generated.
+
+    This works like `send_file` with ``inline=False``, but instead of a
+    file it takes an iterable yielding the data of the file in chunks.
+    """
+    rv = current_app.response_class(stream_with_context(chunks), mimetype=mimetype)
+    rv.headers.set('Content-Disposition', 'attachment', filename=name)
+    rv.headers.add('Content-Security-Policy', "script-src 'self'; object-src 'self'")
+    rv.cache_control.private = True
+    rv.cache_control.no_cache = True
+    return rv
+
+
 def endpoint_for_url(url, base_url=None):
     if base_url is None:
         base_url = config.BASE_URL
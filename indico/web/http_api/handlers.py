@@ -21,6 +21,7 @@ from flask import current_app, g, request, session
 from werkzeug.exceptions import BadRequest, NotFound
 
 from indico.core.cache import make_scoped_cache
+from indico.core.config import config
 from indico.core.db import db
 from indico.core.logger import Logger
 from indico.core.oauth import require_oauth
@@ -37,6 +38,7 @@ from indico.web.http_api.util import get_query_parameter
 RE_REMOVE_EXTENSION = re.compile(r'\.(\w+)(?:$|(?=\?))')
 
 API_CACHE = make_scoped_cache('legacy-http-api')
+API_RESPONSE_CACHE = make_scoped_cache('legacy-http-api-response')
 
 
 def normalizeQuery(path, query, remove=('signature',), separate=False):
@@ -99,6 +101,18 @@ def checkAK(apiKey, signature, timestamp, path, query):
     return ak, onlyPublic
 
 
+def _make_response(data, content_type=None, status_code=None, etag=None):
+    response = current_app.make_response(data)
+    if content_type:
+        response.content_type = content_type
+    if status_code:
+        response.status_code = status_code
+    if etag:
+        response.set_etag(etag)
+        response.make_conditional(request)
+    return response
+
+
 @make_interceptable
 def handler(prefix, path):
     path = posixpath.join('/', prefix, path)
@@ -143,7 +157,7 @@ def handler(prefix, path):
     if request.method == 'POST' or hook.NO_CACHE:
         noCache = True
 
-    ak = error = result = None
+    ak = error = result = responseCacheKey = cachedResponse = None
     ts = int(time.time())
     typeMap = {}
     status_code = None
@@ -212,12 +226,18 @@ def handler(prefix, path):
 
         addToCache = not hook.NO_CACHE
         cacheKey = RE_REMOVE_EXTENSION.sub('', cacheKey)
-        if not noCache:
+        if not noCache and config.HTTP_API_RESPONSE_CACHE:
+            # the serialized response contains the full request url (including e.g. the api key
+            # and signature), so it may only be reused for exactly the same request
+            fullQueryHash = hashlib.sha1(f'{path}?{query}'.encode()).hexdigest()
+            responseCacheKey = f'{cacheKey}.{dformat}.{fullQueryHash}'
+            cachedResponse = API_RESPONSE_CACHE.get(responseCacheKey)
+        if not noCache and cachedResponse is None:
             obj = API_CACHE.get(cacheKey)
             if obj is not None:
                 result, extra, ts, complete, typeMap = obj
                 addToCache = False
-        if result is None:
+        if result is None and cachedResponse is None:
             g.current_api_user = user
             # Perform the actual exporting
             res = hook(user)
@@ -238,7 +258,7 @@ def handler(prefix, path):
         if e.code:
             status_code = e.code
 
-    if result is None and error is None:
+    if result is None and cachedResponse is None and error is None:
         raise NotFound
     else:
         if ak and error is None:
@@ -257,6 +277,9 @@ def handler(prefix, path):
             logger.info('API request: %s?%s', path, query)
         if is_response:
             return result
+        if cachedResponse is not None:
+            data, content_type, etag = cachedResponse
+            return _make_response(data, content_type, etag=etag)
         serializer = Serializer.create(dformat, query_params=queryParams, pretty=pretty, typeMap=typeMap,
                                        **hook.serializer_args)
         if error:
@@ -271,13 +294,12 @@ def handler(prefix, path):
 
         try:
             data = serializer(result)
-            response = current_app.make_response(data)
             content_type = serializer.get_response_content_type()
-            if content_type:
-                response.content_type = content_type
-            if status_code:
-                response.status_code = status_code
-            return response
+            etag = None
+            if responseCacheKey and error is None and (ttl := api_settings.get('cache_ttl')) > 0:
+                etag = hashlib.sha1(data if isinstance(data, bytes) else data.encode()).hexdigest()
+                API_RESPONSE_CACHE.set(responseCacheKey, (data, content_type, etag), ttl)
+            return _make_response(data, content_type, status_code, etag)
         except Exception:
             logger.exception('Serialization error in request %s?%s', path, query)
             raise